@@ -0,0 +1,213 @@
+"""
+Accuracy-vs-speed report for local embedding backends.
+
+Each backend embeds the chunks of the PDFs in data/ and the labelled HR
+questions in benchmarks/hr_questions.json, in a fresh interpreter so load
+time and peak memory are measured per backend. The report gives:
+
+- retrieval hit rate: share of questions whose top-k chunks include one from
+  the expected policy, and the mean reciprocal rank of the first such chunk
+- embedding throughput (chunks/s), query latency, model load time and peak RSS
+- agreement with the first (reference) backend: cosine similarity between
+  the two backends' chunk vectors, and whether the backend could serve an
+  index built with the reference (see EMBEDDING_PROBE_MIN_SIMILARITY)
+
+Backends are given as EMBEDDING_TYPE[:EMBEDDING_ONNX_QUANTIZATION], e.g.
+huggingface, onnx or onnx:avx2. The remaining EMBEDDING_* settings come
+from the environment.
+
+Usage:
+    python benchmarks/embedding_backends.py [--backends huggingface,onnx,onnx:avx2]
+        [--top-k 4] [--json results.json]
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+QUESTIONS_PATH = Path(__file__).resolve().parent / 'hr_questions.json'
+
+
+def parse_backend(spec: str) -> Dict[str, str]:
+    """Split a backend spec into embedding type and ONNX quantization."""
+    embedding_type, _, quantization = spec.partition(':')
+    return {'type': embedding_type, 'onnx_quantization': quantization}
+
+
+def hit_rate(
+        chunk_vectors: np.ndarray,
+        chunk_sources: List[str],
+        question_vectors: np.ndarray,
+        expected_sources: List[str],
+        top_k: int
+) -> Dict[str, float]:
+    """
+    Score retrieval by cosine similarity against the expected policies.
+
+    Args:
+        chunk_vectors: One row per chunk
+        chunk_sources: Source file name of each chunk
+        question_vectors: One row per question
+        expected_sources: Source file name each question should retrieve
+        top_k: Chunks retrieved per question
+
+    Returns:
+        Hit rate at top_k and mean reciprocal rank
+    """
+    chunks = chunk_vectors / np.maximum(np.linalg.norm(chunk_vectors, axis=1, keepdims=True), 1e-12)
+    questions = question_vectors / np.maximum(np.linalg.norm(question_vectors, axis=1, keepdims=True), 1e-12)
+    rankings = np.argsort(-(questions @ chunks.T), axis=1)[:, :top_k]
+
+    hits = 0
+    reciprocal_ranks = 0.0
+    for ranking, expected in zip(rankings, expected_sources):
+        for rank, index in enumerate(ranking, start=1):
+            if chunk_sources[index] == expected:
+                hits += 1
+                reciprocal_ranks += 1.0 / rank
+                break
+
+    return {'hit_rate': hits / len(expected_sources), 'mrr': reciprocal_ranks / len(expected_sources)}
+
+
+def run_worker(spec: str, vectors_path: str, top_k: int) -> None:
+    """
+    Benchmark one backend and print its metrics as JSON.
+
+    Args:
+        spec: Backend spec
+        vectors_path: File to save the chunk vectors to (.npy)
+        top_k: Chunks retrieved per question
+    """
+    from dotenv import load_dotenv
+
+    from components.document_loader import DocumentLoader
+    from components.text_splitter import TextSplitter
+    from factories.embedding_factory import EmbeddingFactory
+    from utils.config_loader import ConfigLoader
+
+    load_dotenv()
+    config_loader = ConfigLoader()
+    config = dict(config_loader.get_embedding_config(), cache_enabled=False, **parse_backend(spec))
+
+    splitter = TextSplitter(config_loader.get_document_processing_config())
+    chunks = splitter.split_documents(DocumentLoader.load_directory(str(ROOT / 'data')))
+    with open(QUESTIONS_PATH, 'r', encoding='utf-8') as f:
+        questions = json.load(f)
+
+    start = time.perf_counter()
+    embedding = EmbeddingFactory().create(config)
+    embedding.embed_documents(["warm up"])
+    load_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    chunk_vectors = np.asarray(embedding.embed_documents([chunk.page_content for chunk in chunks]), dtype=np.float32)
+    index_seconds = time.perf_counter() - start
+
+    question_vectors = []
+    latencies = []
+    for entry in questions:
+        start = time.perf_counter()
+        question_vectors.append(embedding.embed_query(entry['question']))
+        latencies.append(time.perf_counter() - start)
+
+    np.save(vectors_path, chunk_vectors)
+    scores = hit_rate(
+        chunk_vectors,
+        [Path(chunk.metadata.get('source', '')).name for chunk in chunks],
+        np.asarray(question_vectors, dtype=np.float32),
+        [entry['source'] for entry in questions],
+        top_k
+    )
+
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_rss_mb = peak_rss / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+    print(json.dumps(dict(
+        scores,
+        chunks=len(chunks),
+        questions=len(questions),
+        load_seconds=load_seconds,
+        chunks_per_second=len(chunks) / index_seconds if index_seconds else 0.0,
+        query_ms=1000 * float(np.median(latencies)),
+        peak_rss_mb=peak_rss_mb
+    )))
+
+
+def agreement(reference: np.ndarray, vectors: np.ndarray) -> Dict[str, Any]:
+    """Cosine similarity between two backends' vectors for the same chunks."""
+    if reference.shape != vectors.shape:
+        return {'mean_cosine': None, 'min_cosine': None}
+    norms = np.linalg.norm(reference, axis=1) * np.linalg.norm(vectors, axis=1)
+    similarities = np.sum(reference * vectors, axis=1) / np.maximum(norms, 1e-12)
+    return {'mean_cosine': float(similarities.mean()), 'min_cosine': float(similarities.min())}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare local embedding backends on the HR corpus")
+    parser.add_argument('--backends', type=str, default='huggingface,onnx,onnx:avx2',
+                        help='Comma-separated backends; the first is the reference (default: huggingface,onnx,onnx:avx2)')
+    parser.add_argument('--top-k', type=int, default=4, help='Chunks retrieved per question (default: 4)')
+    parser.add_argument('--json', type=str, default=None, help='Write results to this JSON file')
+    parser.add_argument('--worker', type=str, default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--vectors', type=str, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args.vectors, args.top_k)
+        return
+
+    min_similarity = float(os.getenv('EMBEDDING_PROBE_MIN_SIMILARITY', '0.98'))
+    results = {}
+    reference = None
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for spec in [spec.strip() for spec in args.backends.split(',') if spec.strip()]:
+            vectors_path = os.path.join(tmp_dir, f"{spec.replace(':', '_')}.npy")
+            completed = subprocess.run(
+                [sys.executable, __file__, '--worker', spec, '--vectors', vectors_path, '--top-k', str(args.top_k)],
+                cwd=ROOT, capture_output=True, text=True
+            )
+            if completed.returncode != 0:
+                error = completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else 'unknown error'
+                print(f"{spec}: failed: {error}")
+                results[spec] = {'error': error}
+                continue
+
+            result = json.loads(completed.stdout.strip().splitlines()[-1])
+            vectors = np.load(vectors_path)
+            if reference is None:
+                reference = vectors
+            result.update(agreement(reference, vectors))
+            result['index_compatible'] = result['min_cosine'] is not None and result['min_cosine'] >= min_similarity
+            results[spec] = result
+
+            mean_cosine = f"{result['mean_cosine']:.4f}" if result['mean_cosine'] is not None else 'n/a'
+            print(
+                f"{spec:<20} hit@{args.top_k} {result['hit_rate']:.3f}  MRR {result['mrr']:.3f}  "
+                f"{result['chunks_per_second']:7.1f} chunks/s  query {result['query_ms']:6.1f}ms  "
+                f"load {result['load_seconds']:5.1f}s  peak {result['peak_rss_mb']:6.0f}MB  "
+                f"cosine vs reference {mean_cosine}  "
+                f"{'compatible' if result['index_compatible'] else 'NOT compatible'}"
+            )
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'top_k': args.top_k, 'results': results}, f, indent=2)
+        print(f"\nWrote {args.json}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+"""
+Embedding throughput benchmark.
+
+Loads and splits the PDFs in data/ the way 'main.py index' does, then embeds
+the chunks with the configured embedding model for every combination of the
+given batch sizes, thread counts and request concurrencies, and reports
+chunks embedded per second. The embedding cache is disabled so every run
+measures the model itself.
+
+Thread counts apply to HuggingFace models and concurrency to OpenAI models;
+the other setting is left at its default.
+
+Usage:
+    python benchmarks/embedding_throughput.py [--batch-sizes 16,32,64]
+        [--threads 0,4] [--concurrency 1,4] [--limit 500] [--json results.json]
+"""
+import argparse
+import itertools
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from dotenv import load_dotenv  # noqa: E402
+
+from components.document_loader import DocumentLoader  # noqa: E402
+from components.text_splitter import TextSplitter  # noqa: E402
+from factories.embedding_factory import EmbeddingFactory  # noqa: E402
+from utils.config_loader import ConfigLoader  # noqa: E402
+from utils.config_types import EmbeddingModelType  # noqa: E402
+
+
+def int_list(value: str) -> List[int]:
+    """Parse a comma-separated list of integers."""
+    return [int(item) for item in value.split(',') if item.strip()]
+
+
+def load_chunks(config_loader: ConfigLoader, data_dir: str, limit: int) -> List[str]:
+    """
+    Load and split the benchmark corpus.
+
+    Args:
+        config_loader: Configuration loader
+        data_dir: Directory of PDFs
+        limit: Maximum chunks to keep (0 for all)
+
+    Returns:
+        Chunk texts
+    """
+    splitter = TextSplitter(config_loader.get_document_processing_config())
+    chunks = splitter.split_documents(DocumentLoader.load_directory(data_dir))
+    texts = [chunk.page_content for chunk in chunks]
+    return texts[:limit] if limit else texts
+
+
+def run_setting(base_config: Dict[str, Any], texts: List[str], runs: int, **overrides) -> Dict[str, Any]:
+    """
+    Embed the corpus with one setting.
+
+    Args:
+        base_config: Embedding configuration from the environment
+        texts: Chunk texts
+        runs: Timed runs; the best is reported
+        **overrides: Embedding configuration values to change
+
+    Returns:
+        The setting, seconds of the best run and chunks per second
+    """
+    config = dict(base_config, cache_enabled=False, **overrides)
+    embedding = EmbeddingFactory().create(config)
+
+    # Warm up: loads the model weights and opens connections
+    embedding.embed_documents(texts[:8])
+
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        embedding.embed_documents(texts)
+        times.append(time.perf_counter() - start)
+
+    best = min(times)
+    return dict(overrides, seconds=best, chunks_per_second=len(texts) / best if best else 0.0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure embedding throughput over the PDFs in data/")
+    parser.add_argument('--data-dir', type=str, default=str(ROOT / 'data'), help='Directory of PDFs')
+    parser.add_argument('--batch-sizes', type=int_list, default=[16, 32, 64, 128],
+                        help='Comma-separated batch sizes (default: 16,32,64,128)')
+    parser.add_argument('--threads', type=int_list, default=[0],
+                        help='Comma-separated HuggingFace torch thread counts, 0 for default (default: 0)')
+    parser.add_argument('--concurrency', type=int_list, default=[1],
+                        help='Comma-separated OpenAI request concurrencies (default: 1)')
+    parser.add_argument('--limit', type=int, default=0, help='Embed at most this many chunks (default: all)')
+    parser.add_argument('--runs', type=int, default=1, help='Timed runs per setting (default: 1)')
+    parser.add_argument('--json', type=str, default=None, help='Write results to this JSON file')
+    args = parser.parse_args()
+
+    load_dotenv()
+    config_loader = ConfigLoader()
+    base_config = config_loader.get_embedding_config()
+    is_openai = base_config.get('type', '').lower() == EmbeddingModelType.OPENAI
+
+    texts = load_chunks(config_loader, args.data_dir, args.limit)
+    print(f"Embedding {len(texts)} chunks with {base_config.get('type')}:{base_config.get('model_name')}")
+
+    threads = [0] if is_openai else args.threads
+    concurrency = args.concurrency if is_openai else [1]
+
+    results = []
+    for batch_size, num_threads, max_concurrency in itertools.product(args.batch_sizes, threads, concurrency):
+        result = run_setting(
+            base_config, texts, args.runs,
+            batch_size=batch_size, num_threads=num_threads, max_concurrency=max_concurrency
+        )
+        results.append(result)
+        print(f"  batch_size={batch_size:<5} threads={num_threads:<3} concurrency={max_concurrency:<3} "
+              f"{result['seconds']:8.2f}s  {result['chunks_per_second']:8.1f} chunks/s")
+
+    best = max(results, key=lambda result: result['chunks_per_second'])
+    print(f"\nFastest: EMBEDDING_BATCH_SIZE={best['batch_size']} EMBEDDING_NUM_THREADS={best['num_threads']} "
+          f"EMBEDDING_MAX_CONCURRENCY={best['max_concurrency']}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'chunks': len(texts), 'config': base_config, 'results': results}, f, indent=2)
+        print(f"\nWrote {args.json}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,233 @@
+"""
+Local load test for the HTTP query service.
+
+Builds a throwaway index of the PDFs in data/ with a deterministic fake
+embedding model, serves it in-process with a stub LLM that answers after a
+fixed delay, and sends requests from concurrent clients. Reports latency
+percentiles, throughput and how many requests were coalesced. No API keys
+or model downloads are needed, so the numbers measure the service itself:
+queueing, coalescing, retrieval and prompt building.
+
+Usage:
+    python benchmarks/load_test.py [--requests 400] [--clients 16] [--workers 4]
+        [--endpoint query|stream] [--distinct 40] [--llm-latency 0.2] [--metrics] [--json results.json]
+"""
+import argparse
+import http.client
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from langchain_core.callbacks import CallbackManagerForLLMRun  # noqa: E402
+from langchain_core.embeddings import DeterministicFakeEmbedding  # noqa: E402
+from langchain_core.language_models import SimpleChatModel  # noqa: E402
+from langchain_core.messages import AIMessageChunk, BaseMessage  # noqa: E402
+from langchain_core.outputs import ChatGenerationChunk  # noqa: E402
+
+QUESTIONS_PATH = Path(__file__).resolve().parent / 'hr_questions.json'
+
+
+class StubChatModel(SimpleChatModel):
+    """Chat model that answers after a fixed delay, streaming word by word."""
+
+    latency: float = 0.2
+    answer: str = "According to the policy, employees should contact HR for details on this matter."
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub"
+
+    def _call(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+              run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> str:
+        time.sleep(self.latency)
+        return self.answer
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager: Optional[CallbackManagerForLLMRun] = None,
+                **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        time.sleep(self.latency)
+        for word in self.answer.split(' '):
+            yield ChatGenerationChunk(message=AIMessageChunk(content=word + ' '))
+
+
+def build_pipeline(data_dir: str, persist_directory: str, llm_latency: float, metrics: bool):
+    """
+    Index the corpus with stub models and return the ready pipeline.
+
+    Args:
+        data_dir: Directory of PDFs
+        persist_directory: Where to write the throwaway index
+        llm_latency: Seconds the stub LLM takes per answer
+        metrics: Whether to record metrics, to measure their overhead
+
+    Returns:
+        Warmed-up RAGPipeline
+    """
+    # Providers are constructed but never called; the models are replaced below
+    os.environ.update({
+        'LLM_TYPE': 'openai', 'OPENAI_API_KEY': 'load-test',
+        'EMBEDDING_TYPE': 'openai', 'EMBEDDING_CACHE_ENABLED': 'false',
+        'VECTORSTORE_TYPE': 'numpy', 'VECTORSTORE_PERSIST_DIRECTORY': persist_directory,
+        'RETRIEVAL_SEARCH_TYPE': 'similarity', 'RERANK_ENABLED': 'false',
+        'ANSWER_CACHE_ENABLED': 'false', 'METRICS_ENABLED': str(metrics).lower(), 'METRICS_LOG_FILE': '',
+    })
+    os.environ.setdefault('SYSTEM_PROMPT', 'You are an HR assistant. Answer from the context.')
+
+    from rag.rag_pipeline import RAGPipeline
+
+    pipeline = RAGPipeline()
+    pipeline.embedding = DeterministicFakeEmbedding(size=384)
+    pipeline.llm = StubChatModel(latency=llm_latency)
+    pipeline.index_documents(data_dir)
+    pipeline.load_vectorstore()
+    pipeline.warmup()
+    return pipeline
+
+
+def send(port: int, endpoint: str, question: str) -> Dict[str, Any]:
+    """
+    Send one request and time it.
+
+    Args:
+        port: Server port
+        endpoint: 'query' or 'stream'
+        question: Question to ask
+
+    Returns:
+        Status, latency, time to first token (stream only) and whether the
+        request was coalesced
+    """
+    start = time.perf_counter()
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=300)
+    try:
+        connection.request('POST', f'/{endpoint}', body=json.dumps({'question': question}),
+                           headers={'Content-Type': 'application/json'})
+        response = connection.getresponse()
+        first_token = None
+        coalesced = None
+
+        if endpoint == 'stream' and response.status == 200:
+            for line in response:
+                event = json.loads(line)
+                if event['type'] == 'token' and first_token is None:
+                    first_token = time.perf_counter() - start
+                elif event['type'] == 'done':
+                    coalesced = event.get('coalesced')
+        else:
+            body = json.loads(response.read() or b'{}')
+            coalesced = body.get('coalesced')
+
+        return {
+            'status': response.status,
+            'seconds': time.perf_counter() - start,
+            'first_token_seconds': first_token,
+            'coalesced': coalesced
+        }
+    except (OSError, http.client.HTTPException, ValueError) as e:
+        return {'status': 0, 'seconds': time.perf_counter() - start, 'error': str(e)}
+    finally:
+        connection.close()
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    """Get p50, p95 and p99 of a list of latencies in milliseconds."""
+    if not values:
+        return {}
+    if len(values) == 1:
+        return {name: 1000 * values[0] for name in ('p50', 'p95', 'p99')}
+    cuts = statistics.quantiles(values, n=100, method='inclusive')
+    return {'p50': 1000 * cuts[49], 'p95': 1000 * cuts[94], 'p99': 1000 * cuts[98]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the HTTP query service with a stub LLM")
+    parser.add_argument('--requests', type=int, default=400, help='Total requests (default: 400)')
+    parser.add_argument('--clients', type=int, default=16, help='Concurrent clients (default: 16)')
+    parser.add_argument('--workers', type=int, default=4, help='Service worker pool size (default: 4)')
+    parser.add_argument('--max-pending', type=int, default=64, help='Service pending limit (default: 64)')
+    parser.add_argument('--endpoint', choices=['query', 'stream'], default='query', help='Endpoint to load')
+    parser.add_argument('--distinct', type=int, default=40,
+                        help='Distinct questions to cycle through; fewer means more coalescing (default: 40)')
+    parser.add_argument('--llm-latency', type=float, default=0.2, help='Stub LLM seconds per answer (default: 0.2)')
+    parser.add_argument('--metrics', action='store_true', help='Record metrics (compare runs to see their overhead)')
+    parser.add_argument('--data-dir', type=str, default=str(ROOT / 'data'), help='Directory of PDFs')
+    parser.add_argument('--json', type=str, default=None, help='Write results to this JSON file')
+    args = parser.parse_args()
+
+    from rag.http_server import QueryHTTPServer
+    from rag.query_service import QueryService
+
+    with open(QUESTIONS_PATH, 'r', encoding='utf-8') as f:
+        questions = [entry['question'] for entry in json.load(f)][:max(args.distinct, 1)]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pipeline = build_pipeline(args.data_dir, tmp_dir, args.llm_latency, args.metrics)
+        service = QueryService(lambda: pipeline, max_workers=args.workers, max_pending=args.max_pending)
+        server = QueryHTTPServer(('127.0.0.1', 0), service, log_requests=False)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        port = server.server_address[1]
+
+        print(f"\nSending {args.requests} /{args.endpoint} requests from {args.clients} client(s) "
+              f"to {args.workers} worker(s), {len(questions)} distinct question(s)...")
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.clients) as executor:
+            results = list(executor.map(
+                lambda i: send(port, args.endpoint, questions[i % len(questions)]), range(args.requests)
+            ))
+        elapsed = time.perf_counter() - start
+
+        stats = service.stats()
+        server.shutdown()
+        server.server_close()
+        service.shutdown()
+
+    ok = [result for result in results if result['status'] == 200]
+    statuses: Dict[str, int] = {}
+    for result in results:
+        statuses[str(result['status'])] = statuses.get(str(result['status']), 0) + 1
+
+    report = {
+        'requests': args.requests,
+        'clients': args.clients,
+        'workers': args.workers,
+        'endpoint': args.endpoint,
+        'distinct_questions': len(questions),
+        'llm_latency_seconds': args.llm_latency,
+        'metrics_enabled': args.metrics,
+        'seconds': elapsed,
+        'qps': len(ok) / elapsed if elapsed else 0.0,
+        'latency_ms': percentiles([result['seconds'] for result in ok]),
+        'first_token_ms': percentiles([r['first_token_seconds'] for r in ok if r.get('first_token_seconds')]),
+        'statuses': statuses,
+        'coalesced_responses': sum(1 for result in ok if result.get('coalesced')),
+        'service': stats
+    }
+
+    latency = report['latency_ms']
+    print(f"\n{len(ok)}/{args.requests} succeeded in {elapsed:.2f}s: {report['qps']:.1f} QPS")
+    if latency:
+        print(f"Latency   p50 {latency['p50']:8.1f}ms  p95 {latency['p95']:8.1f}ms  p99 {latency['p99']:8.1f}ms")
+    if report['first_token_ms']:
+        first = report['first_token_ms']
+        print(f"First tok p50 {first['p50']:8.1f}ms  p95 {first['p95']:8.1f}ms  p99 {first['p99']:8.1f}ms")
+    print(f"Pipeline executions: {stats['executed']}, coalesced: {stats['coalesced']}, "
+          f"rejected: {stats['rejected']}; statuses: {statuses}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.json}")
+
+
+if __name__ == '__main__':
+    main()
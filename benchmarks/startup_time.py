@@ -0,0 +1,131 @@
+"""
+Cold-start benchmark for the CLI and the Streamlit app.
+
+Each scenario runs in a fresh interpreter under ``python -X importtime``.
+The script reports the median wall time over several runs and the modules
+with the largest cumulative import time, so regressions in startup cost can
+be traced to the import that caused them.
+
+Usage:
+    python benchmarks/startup_time.py [--runs 5] [--top 10] [--json results.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Constructing the pipeline needs credentials to exist, not to be valid
+DUMMY_KEYS = {'OPENAI_API_KEY': 'benchmark', 'ANTHROPIC_API_KEY': 'benchmark'}
+
+QUERY_STARTUP = """
+from dotenv import load_dotenv
+load_dotenv()
+import os
+os.environ.setdefault('SYSTEM_PROMPT', 'benchmark')
+from rag.rag_pipeline import RAGPipeline
+RAGPipeline()
+"""
+
+SCENARIOS = {
+    # Argument parsing only
+    'main.py --help': [sys.executable, '-X', 'importtime', 'main.py', '--help'],
+    # Everything 'main.py query' loads before the first question:
+    # the pipeline module and the configured LLM and embedding providers
+    'main.py query': [sys.executable, '-X', 'importtime', '-c', QUERY_STARTUP],
+    # Module imports of streamlit_app.py, without starting a Streamlit server
+    'streamlit app': [sys.executable, '-X', 'importtime', '-c',
+                      'import streamlit, PIL.Image, dotenv, rag.pipeline_registry'],
+}
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int]]:
+    """
+    Parse ``-X importtime`` output.
+
+    Args:
+        stderr: Standard error of the benchmarked process
+
+    Returns:
+        (module, cumulative microseconds) for every top-level import
+    """
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Top-level imports have exactly one space of indentation
+        if name.startswith(' ') and not name.startswith('  '):
+            modules.append((name.strip(), int(cumulative)))
+    return modules
+
+
+def run_scenario(command: List[str], runs: int) -> Dict:
+    """
+    Run one scenario several times.
+
+    Args:
+        command: Command line to run
+        runs: Number of runs
+
+    Returns:
+        Wall times, their median, the slowest imports of the last run and
+        the exit code
+    """
+    env = dict(DUMMY_KEYS, **os.environ)
+    times = []
+    stderr = ''
+    returncode = 0
+
+    for _ in range(runs):
+        start = time.perf_counter()
+        completed = subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True)
+        times.append(time.perf_counter() - start)
+        stderr = completed.stderr
+        returncode = completed.returncode
+
+    imports = sorted(parse_importtime(stderr), key=lambda item: item[1], reverse=True)
+    errors = [line for line in stderr.splitlines() if line and not line.startswith('import time:')]
+
+    return {
+        'seconds': times,
+        'median_seconds': statistics.median(times),
+        'top_imports': [{'module': name, 'seconds': us / 1e6} for name, us in imports],
+        'returncode': returncode,
+        'error': errors[-1] if returncode not in (0, 1) and errors else None
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold-start time of the CLI and Streamlit app")
+    parser.add_argument('--runs', type=int, default=5, help='Runs per scenario (default: 5)')
+    parser.add_argument('--top', type=int, default=10, help='Slowest imports to show (default: 10)')
+    parser.add_argument('--json', type=str, default=None, help='Write results to this JSON file')
+    args = parser.parse_args()
+
+    results = {}
+    for name, command in SCENARIOS.items():
+        result = run_scenario(command, args.runs)
+        result['top_imports'] = result['top_imports'][:args.top]
+        results[name] = result
+
+        print(f"\n{name}: median {result['median_seconds']:.2f}s over {args.runs} run(s)")
+        if result['error']:
+            print(f"  failed: {result['error']}")
+        for entry in result['top_imports']:
+            print(f"  {entry['seconds']:7.3f}s  {entry['module']}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nWrote {args.json}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,465 @@
+"""
+Reproducible indexing and query benchmark suite.
+
+Runs offline against the PDFs in data/ and against synthetic corpora that
+scale them up (10x and 100x by default: every PDF repeated under new
+names, so the parser, splitter and vector store see proportionally more
+files, pages and chunks). Embedding uses a deterministic fake model and
+answers come from a fixed fake LLM, so the numbers measure the pipeline
+itself and are comparable between runs.
+
+Each scale runs in --repeats fresh interpreters, and every metric is the
+median across them. Each run reports:
+
+- PDF load (pages/s), split, embed and upsert throughput (chunks/s); the
+  in-memory stages report the best of --runs runs
+- startup import time: the one-off cost of importing the provider SDKs and
+  the rest of the pipeline when the first pipeline is built
+- cold query latency: the median of --cold-runs runs of loading the index
+  into a new pipeline and answering the first question
+- warm query latency (p50/p95) over the labelled HR questions, with the
+  answer cache disabled
+- peak RSS
+
+Results are compared with a stored baseline (benchmarks/baseline.json):
+throughput that drops, or latency and memory that grow, by more than the
+tolerance is flagged as a regression and the exit status is 1. The split,
+embed and upsert stages and the import time are noisier and get wider
+tolerances (METRIC_TOLERANCES).
+A baseline recorded with different --repeats, --runs, --cold-runs or
+--query-repeats is not compared (exit status 2). Baselines are machine-specific; record one
+on the machine that runs the comparison.
+
+Usage:
+    python benchmarks/suite.py [--scales 1,10,100] [--baseline benchmarks/baseline.json]
+        [--repeats 3] [--runs 5] [--cold-runs 5] [--tolerance 0.25] [--update-baseline] [--json results.json]
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from langchain_core.embeddings import Embeddings  # noqa: E402
+
+QUESTIONS_PATH = Path(__file__).resolve().parent / 'hr_questions.json'
+BASELINE_PATH = Path(__file__).resolve().parent / 'baseline.json'
+
+EMBEDDING_SIZE = 384
+FAKE_ANSWER = "According to the policy, employees should contact HR for details on this matter."
+
+# Metrics compared against the baseline, and whether higher values are better
+COMPARED_METRICS = {
+    'load_pages_per_second': True,
+    'split_chunks_per_second': True,
+    'embed_chunks_per_second': True,
+    'upsert_chunks_per_second': True,
+    'startup_import_ms': False,
+    'cold_query_ms': False,
+    'warm_query_p50_ms': False,
+    'warm_query_p95_ms': False,
+    'peak_rss_mb': False,
+}
+
+# Latency changes smaller than this are timer noise, whatever their relative size
+MIN_LATENCY_CHANGE_MS = 1.0
+
+# Metrics noisier than the rest, with the smallest tolerance they are compared
+# at. The in-memory stages take milliseconds at small scales and move by up to
+# 40% with the load on a shared machine; import time depends on the OS file cache.
+METRIC_TOLERANCES = {
+    'split_chunks_per_second': 0.5,
+    'embed_chunks_per_second': 0.5,
+    'upsert_chunks_per_second': 0.5,
+    'startup_import_ms': 1.0,
+}
+
+# Command-line settings that must match the baseline for a fair comparison
+SETTINGS = ('repeats', 'runs', 'cold_runs', 'query_repeats')
+
+
+def build_corpus(data_dir: str, scale: int, target_dir: str) -> str:
+    """
+    Build a corpus of the PDFs in data_dir repeated scale times.
+
+    Copies are hard links where possible, so large scales cost no disk space.
+
+    Args:
+        data_dir: Directory of PDFs
+        scale: Number of copies of each PDF
+        target_dir: Directory to create the corpus in
+
+    Returns:
+        Directory of the corpus (data_dir itself for scale 1)
+    """
+    if scale <= 1:
+        return data_dir
+
+    corpus_dir = Path(target_dir) / f'corpus_{scale}x'
+    corpus_dir.mkdir(parents=True, exist_ok=True)
+    for pdf in sorted(Path(data_dir).glob('*.pdf')):
+        for copy in range(scale):
+            target = corpus_dir / f"{pdf.stem} ({copy + 1}).pdf"
+            try:
+                os.link(pdf, target)
+            except OSError:
+                shutil.copyfile(pdf, target)
+    return str(corpus_dir)
+
+
+def percentile_ms(values: List[float], percentile: int) -> float:
+    """Get a percentile of a list of durations in milliseconds."""
+    if len(values) == 1:
+        return 1000 * values[0]
+    return 1000 * statistics.quantiles(values, n=100, method='inclusive')[percentile - 1]
+
+
+class PrecomputedEmbeddings(Embeddings):
+    """Embeddings that return vectors computed earlier, falling back to a model."""
+
+    def __init__(self, vectors: Dict[str, List[float]], fallback: Embeddings):
+        self.vectors = vectors
+        self.fallback = fallback
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        missing = [text for text in texts if text not in self.vectors]
+        if missing:
+            self.vectors.update(zip(missing, self.fallback.embed_documents(missing)))
+        return [self.vectors[text] for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.fallback.embed_query(text)
+
+
+def best_time(function: Callable[[], Any], runs: int, min_seconds: float = 0.5) -> Tuple[float, Any]:
+    """
+    Time a function and return the fastest run and the last result.
+
+    Fast functions are run more often than runs, until min_seconds have
+    passed in total, so small corpora still give stable numbers.
+    """
+    best, result, total, count = float('inf'), None, 0.0, 0
+    while count < max(runs, 1) or total < min_seconds:
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best, total, count = min(best, elapsed), total + elapsed, count + 1
+    return best, result
+
+
+def run_worker(corpus_dir: str, persist_directory: str, runs: int, cold_runs: int, query_repeats: int) -> None:
+    """
+    Benchmark one corpus and print the results as JSON.
+
+    Args:
+        corpus_dir: Directory of PDFs
+        persist_directory: Empty directory for the index
+        runs: Timed runs of the split, embed and upsert stages
+        cold_runs: Timed cold queries, after the one that pays for imports
+        query_repeats: Times each HR question is asked for the warm latency
+    """
+    # Providers are constructed but never called; the models are replaced below
+    os.environ.update({
+        'LLM_TYPE': 'openai', 'OPENAI_API_KEY': 'benchmark',
+        'EMBEDDING_TYPE': 'openai', 'EMBEDDING_CACHE_ENABLED': 'false',
+        'VECTORSTORE_TYPE': 'numpy', 'VECTORSTORE_PERSIST_DIRECTORY': persist_directory,
+        'RETRIEVAL_SEARCH_TYPE': 'similarity', 'RETRIEVAL_ROUTING_ENABLED': 'false',
+        'RERANK_ENABLED': 'false', 'ANSWER_CACHE_ENABLED': 'false', 'METRICS_ENABLED': 'false',
+    })
+    os.environ.setdefault('SYSTEM_PROMPT', 'You are an HR assistant. Answer from the context.')
+
+    from langchain_core.embeddings import DeterministicFakeEmbedding
+    from langchain_core.language_models import FakeListChatModel
+
+    from components.document_loader import DocumentLoader, LoadReport
+    from components.text_splitter import TextSplitter
+    from factories.vectorstore_factory import VectorStoreFactory
+    from rag.rag_pipeline import RAGPipeline
+    from utils.config_loader import ConfigLoader
+
+    config_loader = ConfigLoader()
+    processing_config = config_loader.get_document_processing_config()
+    vectorstore_config = config_loader.get_vectorstore_config()
+    embedding = DeterministicFakeEmbedding(size=EMBEDDING_SIZE)
+
+    pdf_files = [str(pdf) for pdf in sorted(Path(corpus_dir).glob('*.pdf'))]
+    report = LoadReport()
+    start = time.perf_counter()
+    pages = []
+    for _, documents, _ in DocumentLoader.iter_pdfs(pdf_files, processing_config.get('loader_workers', 1), report):
+        pages.extend(documents)
+    load_seconds = time.perf_counter() - start
+
+    splitter = TextSplitter(processing_config)
+    split_seconds, chunks = best_time(lambda: splitter.split_documents(pages), runs)
+
+    texts = [chunk.page_content for chunk in chunks]
+    embed_seconds, vectors = best_time(lambda: embedding.embed_documents(texts), runs)
+
+    # Upsert the vectors just computed so the stage excludes embedding time
+    precomputed = PrecomputedEmbeddings(dict(zip(texts, vectors)), embedding)
+    factory = VectorStoreFactory()
+    batch_size = max(processing_config.get('ingest_batch_size', 64), 1)
+
+    def upsert() -> None:
+        vectorstore = factory.reset(vectorstore_config, precomputed)
+        for offset in range(0, len(chunks), batch_size):
+            batch = chunks[offset:offset + batch_size]
+            vectorstore.add_documents(batch, ids=[f'chunk-{offset + i}' for i in range(len(batch))])
+        factory.persist(vectorstore_config, vectorstore)
+
+    upsert_seconds, _ = best_time(upsert, runs)
+    del pages, chunks, texts, vectors, precomputed
+
+    with open(QUESTIONS_PATH, 'r', encoding='utf-8') as f:
+        questions = [entry['question'] for entry in json.load(f)]
+
+    def cold_query() -> RAGPipeline:
+        pipeline = RAGPipeline()
+        pipeline.embedding = embedding
+        pipeline.llm = FakeListChatModel(responses=[FAKE_ANSWER])
+        pipeline.load_vectorstore()
+        pipeline.query(questions[0])
+        return pipeline
+
+    # The first pipeline also imports the provider SDKs and the lazily
+    # imported parts of the pipeline; that one-off cost is reported apart
+    # from the cold query latency, which is the median of the later runs
+    start = time.perf_counter()
+    cold_query()
+    first_seconds = time.perf_counter() - start
+    cold_times = []
+    for _ in range(max(cold_runs, 1)):
+        start = time.perf_counter()
+        pipeline = cold_query()
+        cold_times.append(time.perf_counter() - start)
+    cold_query_seconds = statistics.median(cold_times)
+
+    latencies = []
+    for question in questions * max(query_repeats, 1):
+        start = time.perf_counter()
+        pipeline.query(question)
+        latencies.append(time.perf_counter() - start)
+
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    chunk_count = len(pipeline.vectorstore)
+
+    print(json.dumps({
+        'files': len(pdf_files),
+        'pages': report.pages,
+        'chunks': chunk_count,
+        'load_pages_per_second': report.pages / load_seconds if load_seconds else 0.0,
+        'split_chunks_per_second': chunk_count / split_seconds if split_seconds else 0.0,
+        'embed_chunks_per_second': chunk_count / embed_seconds if embed_seconds else 0.0,
+        'upsert_chunks_per_second': chunk_count / upsert_seconds if upsert_seconds else 0.0,
+        'startup_import_ms': 1000 * max(first_seconds - cold_query_seconds, 0.0),
+        'cold_query_ms': 1000 * cold_query_seconds,
+        'warm_query_p50_ms': percentile_ms(latencies, 50),
+        'warm_query_p95_ms': percentile_ms(latencies, 95),
+        'peak_rss_mb': peak_rss / (1024 * 1024 if sys.platform == 'darwin' else 1024),
+    }))
+
+
+def median_result(worker_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Combine the results of repeated worker processes.
+
+    Machine load shifts whole runs at once, which best-of timings within one
+    process cannot filter out, so each metric is the median across processes.
+
+    Args:
+        worker_results: Results printed by run_worker for the same corpus
+
+    Returns:
+        Result with the corpus counts of the first run and the median of
+        every metric
+    """
+    combined = dict(worker_results[0])
+    for metric in COMPARED_METRICS:
+        values = [result[metric] for result in worker_results if metric in result]
+        if values:
+            combined[metric] = statistics.median(values)
+    return combined
+
+
+def compare(
+        results: Dict[str, Dict[str, Any]],
+        baseline: Dict[str, Dict[str, Any]],
+        tolerance: float
+) -> List[Dict[str, Any]]:
+    """
+    Compare results with a baseline.
+
+    Args:
+        results: Results by scale
+        baseline: Baseline results by scale
+        tolerance: Allowed relative change in the worse direction (0.25 = 25%);
+            metrics in METRIC_TOLERANCES are allowed at least their own
+
+    Returns:
+        One row per scale and metric present in both, with the baseline and
+        current values, the relative change and whether it is a regression.
+        Scales whose corpus size differs from the baseline are not compared.
+    """
+    rows = []
+    for scale, result in results.items():
+        reference = baseline.get(scale)
+        if not reference or 'error' in result or 'error' in reference:
+            continue
+        if any(result.get(key) != reference.get(key) for key in ('files', 'pages', 'chunks')):
+            print(f"{scale}: corpus differs from the baseline, not compared")
+            continue
+
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            current, previous = result.get(metric), reference.get(metric)
+            if current is None or not previous:
+                continue
+            change = (current - previous) / previous
+            worse = -change if higher_is_better else change
+            if metric.endswith('_ms') and abs(current - previous) < MIN_LATENCY_CHANGE_MS:
+                worse = 0.0
+            rows.append({
+                'scale': scale,
+                'metric': metric,
+                'baseline': previous,
+                'current': current,
+                'change': change,
+                'regression': worse > max(tolerance, METRIC_TOLERANCES.get(metric, 0.0))
+            })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark indexing and query latency on scaled corpora")
+    parser.add_argument('--scales', type=str, default='1,10,100',
+                        help='Comma-separated corpus scales; 1 is data/ itself (default: 1,10,100)')
+    parser.add_argument('--data-dir', type=str, default=str(ROOT / 'data'), help='Directory of PDFs')
+    parser.add_argument('--runs', type=int, default=5,
+                        help='Timed runs of the split, embed and upsert stages; the best is kept (default: 5)')
+    parser.add_argument('--cold-runs', type=int, default=5,
+                        help='Timed cold queries; the median is kept (default: 5)')
+    parser.add_argument('--repeats', type=int, default=3,
+                        help='Worker processes per scale; each metric is their median (default: 3)')
+    parser.add_argument('--query-repeats', type=int, default=5,
+                        help='Times each HR question is asked for the warm latency (default: 5)')
+    parser.add_argument('--baseline', type=str, default=str(BASELINE_PATH),
+                        help='Baseline to compare with (default: benchmarks/baseline.json)')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Relative change that counts as a regression (default: 0.25)')
+    parser.add_argument('--update-baseline', action='store_true', help='Write the results as the new baseline')
+    parser.add_argument('--json', type=str, default=None, help='Write results to this JSON file')
+    parser.add_argument('--worker', type=str, default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--persist-directory', type=str, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args.persist_directory, args.runs, args.cold_runs, args.query_repeats)
+        return
+
+    results: Dict[str, Dict[str, Any]] = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for scale in [int(scale) for scale in args.scales.split(',') if scale.strip()]:
+            corpus_dir = build_corpus(args.data_dir, scale, tmp_dir)
+            name = f'{scale}x'
+            worker_results, error = [], None
+            for _ in range(max(args.repeats, 1)):
+                persist_directory = tempfile.mkdtemp(dir=tmp_dir)
+                completed = subprocess.run(
+                    [sys.executable, __file__, '--worker', corpus_dir, '--persist-directory', persist_directory,
+                     '--runs', str(args.runs), '--cold-runs', str(args.cold_runs),
+                     '--query-repeats', str(args.query_repeats)],
+                    cwd=ROOT, capture_output=True, text=True
+                )
+                shutil.rmtree(persist_directory, ignore_errors=True)
+                if completed.returncode != 0:
+                    error = completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else 'unknown error'
+                    break
+                worker_results.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+            if error is not None:
+                print(f"{name}: failed: {error}")
+                results[name] = {'error': error}
+                continue
+
+            result = results[name] = median_result(worker_results)
+            print(
+                f"{name:>5} {result['files']:5d} files {result['chunks']:7d} chunks  "
+                f"load {result['load_pages_per_second']:7.1f} pages/s  "
+                f"split {result['split_chunks_per_second']:9.0f}  embed {result['embed_chunks_per_second']:8.0f}  "
+                f"upsert {result['upsert_chunks_per_second']:8.0f} chunks/s  "
+                f"imports {result['startup_import_ms']:7.1f}ms  cold {result['cold_query_ms']:7.1f}ms  "
+                f"warm p50 {result['warm_query_p50_ms']:6.1f}ms "
+                f"p95 {result['warm_query_p95_ms']:6.1f}ms  peak {result['peak_rss_mb']:6.0f}MB"
+            )
+            if corpus_dir != args.data_dir:
+                shutil.rmtree(corpus_dir, ignore_errors=True)
+
+    report = {
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count()
+        },
+        'settings': {setting: getattr(args, setting) for setting in SETTINGS},
+        'results': results
+    }
+
+    regressions: List[Dict[str, Any]] = []
+    mismatched: List[str] = []
+    if os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        recorded = baseline.get('settings', {})
+        mismatched = [
+            f"--{setting.replace('_', '-')} {recorded[setting]}"
+            for setting in SETTINGS if setting in recorded and recorded[setting] != getattr(args, setting)
+        ]
+
+        if mismatched:
+            # Fewer runs are noisier, so the numbers are not comparable
+            print(f"\nBaseline {args.baseline} was recorded with {', '.join(mismatched)}; "
+                  "rerun with the same settings or --update-baseline")
+        else:
+            rows = compare(results, baseline.get('results', {}), args.tolerance)
+            regressions = [row for row in rows if row['regression']]
+            report['comparison'] = rows
+
+            print(f"\nCompared with {args.baseline} (tolerance {args.tolerance:.0%}):")
+            for row in rows:
+                flag = 'REGRESSION' if row['regression'] else ''
+                print(f"  {row['scale']:>5} {row['metric']:<26} {row['baseline']:12.2f} -> {row['current']:12.2f} "
+                      f"({row['change']:+7.1%}) {flag}")
+            if not rows:
+                print("  nothing comparable")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.json}")
+
+    if args.update_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote baseline {args.baseline}")
+
+    if mismatched:
+        sys.exit(2)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""
+Text splitter benchmark.
+
+Splits the pages of the PDFs in data/ (repeated --scale times) with the
+LangChain recursive splitter and with the offset splitter at each worker
+count, checks that every mode produces the same chunks, and reports chunks
+per second. Exits with status 1 if the outputs differ.
+
+Usage:
+    python benchmarks/text_splitter.py [--scale 20] [--chunk-size 1000]
+        [--chunk-overlap 200] [--workers 1,2] [--runs 5] [--json results.json]
+"""
+import argparse
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from langchain_core.documents import Document  # noqa: E402
+
+from components.document_loader import DocumentLoader  # noqa: E402
+from components.text_splitter import TextSplitter  # noqa: E402
+
+# Metadata only the offset splitter records
+OFFSET_METADATA = ('start_index', 'end_index', 'document_id')
+
+
+def int_list(value: str) -> List[int]:
+    """Parse a comma-separated list of integers."""
+    return [int(item) for item in value.split(',') if item.strip()]
+
+
+def comparable(chunks: List[Document]) -> List[Any]:
+    """Reduce chunks to their text and the metadata both splitters record."""
+    return [
+        (chunk.page_content, {key: value for key, value in chunk.metadata.items() if key not in OFFSET_METADATA})
+        for chunk in chunks
+    ]
+
+
+def run_mode(config: Dict[str, Any], pages: List[Document], runs: int) -> Dict[str, Any]:
+    """
+    Split the pages with one splitter configuration.
+
+    Args:
+        config: Document processing configuration
+        pages: Pages to split
+        runs: Timed runs; the best is reported
+
+    Returns:
+        Seconds of the best run, chunks per second and the chunks
+    """
+    splitter = TextSplitter(config)
+    # Warm up: starts the worker pool, if any
+    chunks = splitter.split_documents(pages)
+
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        chunks = splitter.split_documents(pages)
+        times.append(time.perf_counter() - start)
+
+    if hasattr(splitter.splitter, 'close'):
+        splitter.splitter.close()
+    best = min(times)
+    return {'seconds': best, 'chunks_per_second': len(chunks) / best if best else 0.0, 'chunks': chunks}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the recursive and offset text splitters")
+    parser.add_argument('--data-dir', type=str, default=str(ROOT / 'data'), help='Directory of PDFs')
+    parser.add_argument('--scale', type=int, default=20, help='Times the pages are repeated (default: 20)')
+    parser.add_argument('--chunk-size', type=int, default=1000, help='Chunk size (default: 1000)')
+    parser.add_argument('--chunk-overlap', type=int, default=200, help='Chunk overlap (default: 200)')
+    parser.add_argument('--workers', type=int_list, default=[1, 2],
+                        help='Comma-separated offset splitter worker counts (default: 1,2)')
+    parser.add_argument('--runs', type=int, default=5, help='Timed runs per mode (default: 5)')
+    parser.add_argument('--json', type=str, default=None, help='Write results to this JSON file')
+    args = parser.parse_args()
+
+    # Chunks longer than chunk_size are logged by the recursive splitter
+    logging.getLogger('langchain_text_splitters').setLevel(logging.ERROR)
+
+    pages = list(DocumentLoader.load_directory(args.data_dir)) * max(args.scale, 1)
+    base_config = {'chunk_size': args.chunk_size, 'chunk_overlap': args.chunk_overlap}
+    print(f"Splitting {len(pages)} pages (chunk_size={args.chunk_size}, chunk_overlap={args.chunk_overlap})")
+
+    modes = {'recursive': dict(base_config, splitter_mode='recursive')}
+    for workers in args.workers:
+        modes[f'offset x{workers}'] = dict(base_config, splitter_mode='offset', split_workers=workers)
+
+    results = {}
+    reference = None
+    for name, config in modes.items():
+        result = run_mode(config, pages, args.runs)
+        chunks = comparable(result.pop('chunks'))
+        if reference is None:
+            reference = chunks
+        result['equivalent'] = chunks == reference
+        result['chunk_count'] = len(chunks)
+        result['speedup'] = result['chunks_per_second'] / results['recursive']['chunks_per_second'] \
+            if results else 1.0
+        results[name] = result
+        print(f"  {name:<12} {result['seconds'] * 1000:8.1f}ms  {result['chunks_per_second']:9.0f} chunks/s  "
+              f"x{result['speedup']:.2f}  {'same chunks' if result['equivalent'] else 'DIFFERENT chunks'}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'pages': len(pages), 'config': base_config, 'results': results}, f, indent=2)
+        print(f"\nWrote {args.json}")
+
+    if not all(result['equivalent'] for result in results.values()):
+        print("\nThe splitters produced different chunks")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
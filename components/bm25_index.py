@@ -0,0 +1,189 @@
+"""BM25 lexical index component."""
+import json
+import math
+import os
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+
+
+class BM25Index:
+    """
+    Inverted-index BM25 over the same chunks as the vector store.
+
+    Each chunk's term frequencies are stored with its text and metadata, so
+    chunks can be added and removed as files change and the postings are
+    rebuilt from the stored counts without re-tokenizing. Scoring gathers
+    only the postings of the query terms into numpy arrays, so a search
+    costs well under a millisecond for an HR-policy-sized corpus.
+    """
+
+    FILENAME = 'bm25_index.json'
+    VERSION = 1
+    TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+    STOPWORDS = frozenset(
+        "a an and are as at be by for from has have how i if in is it its me my of on or "
+        "our that the their there these this to was we what when where which who will with "
+        "you your do does can".split()
+    )
+
+    def __init__(self, directory: str, k1: float = 1.5, b: float = 0.75):
+        """
+        Initialize the index.
+
+        Args:
+            directory: Directory the index file is stored in (normally the
+                vector store persist directory)
+            k1: Term frequency saturation
+            b: Document length normalization
+        """
+        self.path = Path(directory) / self.FILENAME
+        self.k1 = k1
+        self.b = b
+        self.documents: Dict[str, Dict[str, Any]] = {}
+        self.exists = False
+        self._compiled = None
+
+    @classmethod
+    def tokenize(cls, text: str) -> List[str]:
+        """
+        Split text into lowercase alphanumeric terms, dropping stopwords.
+
+        Args:
+            text: Text to tokenize
+
+        Returns:
+            List of terms
+        """
+        return [term for term in cls.TOKEN_PATTERN.findall(text.lower()) if term not in cls.STOPWORDS]
+
+    def load(self) -> 'BM25Index':
+        """
+        Load the index from disk if present.
+
+        Returns:
+            The index itself
+        """
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == self.VERSION:
+                self.documents = data.get('documents', {})
+                self.exists = True
+                self._compiled = None
+        return self
+
+    def save(self) -> None:
+        """Atomically write the index to disk."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': self.VERSION, 'documents': self.documents}, f)
+        os.replace(tmp_path, self.path)
+        self.exists = True
+
+    def clear(self) -> None:
+        """Remove every chunk."""
+        self.documents = {}
+        self._compiled = None
+
+    def add(self, documents: List[Document], ids: List[str]) -> None:
+        """
+        Add or replace chunks.
+
+        Args:
+            documents: Chunk documents
+            ids: Chunk IDs, matching the vector store
+        """
+        for document, chunk_id in zip(documents, ids):
+            self.documents[chunk_id] = {
+                'text': document.page_content,
+                'metadata': document.metadata,
+                'terms': dict(Counter(self.tokenize(document.page_content)))
+            }
+        self._compiled = None
+
+    def remove(self, ids: List[str]) -> None:
+        """
+        Remove chunks by ID. Unknown IDs are ignored.
+
+        Args:
+            ids: Chunk IDs to remove
+        """
+        for chunk_id in ids:
+            self.documents.pop(chunk_id, None)
+        self._compiled = None
+
+    def __len__(self) -> int:
+        """Number of indexed chunks."""
+        return len(self.documents)
+
+    def _compile(self) -> Tuple[List[str], np.ndarray, np.ndarray, Dict[str, Tuple[np.ndarray, np.ndarray]]]:
+        """Build the postings arrays, per-chunk length normalization and sources used for scoring."""
+        if self._compiled is None:
+            ids = list(self.documents)
+            sources = np.asarray([str(self.documents[i]['metadata'].get('source')) for i in ids], dtype=object)
+            lengths = np.zeros(len(ids), dtype=np.float32)
+            postings: Dict[str, Tuple[List[int], List[int]]] = {}
+
+            for position, chunk_id in enumerate(ids):
+                terms = self.documents[chunk_id]['terms']
+                lengths[position] = sum(terms.values())
+                for term, count in terms.items():
+                    positions, counts = postings.setdefault(term, ([], []))
+                    positions.append(position)
+                    counts.append(count)
+
+            arrays = {
+                term: (np.asarray(positions, dtype=np.int64), np.asarray(counts, dtype=np.float32))
+                for term, (positions, counts) in postings.items()
+            }
+            average = max(float(lengths.mean()), 1.0) if len(ids) else 1.0
+            norms = self.k1 * (1 - self.b + self.b * lengths / average)
+            self._compiled = (ids, norms, sources, arrays)
+        return self._compiled
+
+    def search(self, query: str, k: int = 4, sources: Optional[List[str]] = None) -> List[Tuple[Document, float]]:
+        """
+        Rank chunks against a query with BM25.
+
+        Args:
+            query: Query string
+            k: Number of results to return
+            sources: Only return chunks whose 'source' metadata is one of these
+
+        Returns:
+            Up to k (document, score) pairs in descending score order,
+            excluding chunks that share no term with the query
+        """
+        ids, norms, chunk_sources, postings = self._compile()
+        terms = [term for term in set(self.tokenize(query)) if term in postings]
+        if not ids or not terms or k <= 0:
+            return []
+
+        n = len(ids)
+        scores = np.zeros(n, dtype=np.float32)
+
+        for term in terms:
+            positions, counts = postings[term]
+            idf = math.log(1 + (n - len(positions) + 0.5) / (len(positions) + 0.5))
+            scores[positions] += idf * counts * (self.k1 + 1) / (counts + norms[positions])
+
+        if sources is not None:
+            scores[~np.isin(chunk_sources, list(sources))] = 0
+
+        matched = np.flatnonzero(scores > 0)
+        if len(matched) > k:
+            matched = matched[np.argpartition(-scores[matched], k - 1)[:k]]
+        matched = matched[np.argsort(-scores[matched], kind='stable')]
+
+        results = []
+        for position in matched:
+            entry = self.documents[ids[position]]
+            document = Document(page_content=entry['text'], metadata=entry['metadata'], id=ids[position])
+            results.append((document, float(scores[position])))
+        return results
@@ -0,0 +1,262 @@
+"""Cache-backed embeddings component."""
+import hashlib
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from langchain_core.embeddings import Embeddings
+
+# Models whose embed_query is embed_documents on a single text, so a batch of
+# queries can be embedded in one embed_documents call (the ONNX backend is a
+# HuggingFaceEmbeddings too). Matched by name to avoid importing the SDKs.
+SYMMETRIC_MODELS = ('HuggingFaceEmbeddings', 'OpenAIEmbeddings')
+
+
+def embed_queries(embedding: Embeddings, texts: List[str]) -> List[List[float]]:
+    """
+    Embed many queries with as few model calls as the model allows.
+
+    Wrappers with an embed_queries method (the cache, the concurrency and
+    metrics wrappers) are asked for the whole batch. Models that embed
+    queries like documents take one embed_documents call; any other model
+    gets one embed_query call per text.
+
+    Args:
+        embedding: Embedding model or wrapper
+        texts: Query texts
+
+    Returns:
+        List of embedding vectors, identical to calling embed_query on each
+    """
+    if not texts:
+        return []
+    if hasattr(embedding, 'embed_queries'):
+        return embedding.embed_queries(texts)
+    if type(embedding).__name__ in SYMMETRIC_MODELS:
+        return embedding.embed_documents(texts)
+    return [embedding.embed_query(text) for text in texts]
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Wraps an embedding model with a persistent cache.
+
+    Vectors are stored on disk in SQLite keyed by (model name, SHA-256 of the
+    text), with a bounded in-memory LRU in front. Re-embedding unchanged
+    chunks or repeated questions is served from the cache instead of running
+    the model again.
+    """
+
+    FILENAME = 'embeddings.sqlite3'
+
+    # SQLite limits the number of bound parameters per statement
+    _LOOKUP_BATCH = 500
+
+    def __init__(self, underlying: Embeddings, model_name: str, cache_dir: str, memory_size: int = 10000):
+        """
+        Initialize the cache.
+
+        Args:
+            underlying: Embedding model used on cache misses
+            model_name: Model name used to namespace cached vectors
+            cache_dir: Directory the SQLite cache file is stored in
+            memory_size: Maximum number of vectors kept in memory
+        """
+        self.underlying = underlying
+        self.model_name = model_name
+        self.memory_size = memory_size
+
+        Path(cache_dir).mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(Path(cache_dir) / self.FILENAME), check_same_thread=False)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS embeddings ('
+            'model TEXT NOT NULL, text_hash TEXT NOT NULL, vector BLOB NOT NULL, '
+            'PRIMARY KEY (model, text_hash))'
+        )
+        self._connection.commit()
+
+        self._memory: 'OrderedDict[str, List[float]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _hash(text: str) -> str:
+        """Hash a text for use as a cache key."""
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _encode(vector: List[float]) -> bytes:
+        """Serialize a vector as float32 bytes."""
+        return array('f', vector).tobytes()
+
+    @staticmethod
+    def _decode(blob: bytes) -> List[float]:
+        """Deserialize float32 bytes into a vector."""
+        vector = array('f')
+        vector.frombytes(blob)
+        return vector.tolist()
+
+    def _remember(self, key: str, vector: List[float]) -> None:
+        """Insert a vector into the in-memory LRU, evicting the oldest."""
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _lookup(self, model: str, hashes: List[str]) -> Dict[str, List[float]]:
+        """
+        Look up cached vectors, memory first and then disk.
+
+        Args:
+            model: Cache namespace
+            hashes: Text hashes to look up
+
+        Returns:
+            Mapping of found hashes to vectors
+        """
+        found = {}
+        missing = []
+
+        with self._lock:
+            for text_hash in hashes:
+                vector = self._memory.get(f"{model}:{text_hash}")
+                if vector is not None:
+                    self._memory.move_to_end(f"{model}:{text_hash}")
+                    found[text_hash] = vector
+                else:
+                    missing.append(text_hash)
+            self.memory_hits += len(found)
+
+            for i in range(0, len(missing), self._LOOKUP_BATCH):
+                batch = missing[i:i + self._LOOKUP_BATCH]
+                placeholders = ','.join('?' * len(batch))
+                rows = self._connection.execute(
+                    f'SELECT text_hash, vector FROM embeddings '
+                    f'WHERE model = ? AND text_hash IN ({placeholders})',
+                    [model, *batch]
+                ).fetchall()
+                for text_hash, blob in rows:
+                    vector = self._decode(blob)
+                    found[text_hash] = vector
+                    self._remember(f"{model}:{text_hash}", vector)
+                    self.disk_hits += 1
+
+        return found
+
+    def _store(self, model: str, vectors: Dict[str, List[float]]) -> None:
+        """
+        Store newly computed vectors in memory and on disk.
+
+        Args:
+            model: Cache namespace
+            vectors: Mapping of text hashes to vectors
+        """
+        with self._lock:
+            self._connection.executemany(
+                'INSERT OR REPLACE INTO embeddings (model, text_hash, vector) VALUES (?, ?, ?)',
+                [(model, text_hash, self._encode(vector)) for text_hash, vector in vectors.items()]
+            )
+            self._connection.commit()
+            for text_hash, vector in vectors.items():
+                self._remember(f"{model}:{text_hash}", vector)
+            self.misses += len(vectors)
+
+    def _embed(self, texts: List[str], is_query: bool) -> List[List[float]]:
+        """
+        Embed texts, running the model only for texts not in the cache.
+
+        Args:
+            texts: Texts to embed
+            is_query: Whether the texts are queries (cached separately because
+                some models embed queries differently from documents)
+
+        Returns:
+            List of embedding vectors
+        """
+        model = f"{self.model_name}:query" if is_query else self.model_name
+        hashes = [self._hash(text) for text in texts]
+        found = self._lookup(model, hashes)
+
+        # Embed each distinct missing text once
+        to_embed: Dict[str, str] = {}
+        for text, text_hash in zip(texts, hashes):
+            if text_hash not in found:
+                to_embed.setdefault(text_hash, text)
+
+        if to_embed:
+            if is_query:
+                computed = embed_queries(self.underlying, list(to_embed.values()))
+            else:
+                computed = self.underlying.embed_documents(list(to_embed.values()))
+            # Round-trip through float32 so hits and misses return identical values
+            new_vectors = {
+                text_hash: self._decode(self._encode(vector))
+                for text_hash, vector in zip(to_embed, computed)
+            }
+            self._store(model, new_vectors)
+            found.update(new_vectors)
+
+        return [found[text_hash] for text_hash in hashes]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed search documents.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            List of embedding vectors
+        """
+        return self._embed(texts, is_query=False)
+
+    def embed_query(self, text: str) -> List[float]:
+        """
+        Embed a query.
+
+        Args:
+            text: Query text
+
+        Returns:
+            Embedding vector
+        """
+        return self._embed([text], is_query=True)[0]
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed many queries with one cache lookup and one model call for the misses.
+
+        Args:
+            texts: Query texts
+
+        Returns:
+            List of embedding vectors, identical to calling embed_query on each
+        """
+        return self._embed(texts, is_query=True)
+
+    @property
+    def hits(self) -> int:
+        """Total cache hits from memory and disk."""
+        return self.memory_hits + self.disk_hits
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        """
+        Get cache hit/miss counters.
+
+        Returns:
+            Dictionary of memory hits, disk hits, misses and hit rate
+        """
+        total = self.hits + self.misses
+        return {
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else None
+        }
@@ -0,0 +1,61 @@
+"""Concurrent embeddings component."""
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from langchain_core.embeddings import Embeddings
+
+from components.cached_embeddings import embed_queries
+
+
+class ConcurrentEmbeddings(Embeddings):
+    """
+    Embeds large document lists as concurrent fixed-size requests.
+
+    API embedders send one request per batch and wait for it before sending
+    the next. This wrapper splits a call into batches and keeps up to
+    max_concurrency of them in flight, which overlaps network latency when
+    indexing. Vectors are returned in input order.
+    """
+
+    def __init__(self, underlying: Embeddings, batch_size: int, max_concurrency: int):
+        """
+        Initialize the wrapper.
+
+        Args:
+            underlying: Embedding model that does the work
+            batch_size: Texts per request
+            max_concurrency: Maximum requests in flight
+        """
+        self.underlying = underlying
+        self.batch_size = max(batch_size, 1)
+        self.max_concurrency = max(max_concurrency, 1)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed documents, running batches concurrently.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            One vector per text, in input order
+        """
+        batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        if len(batches) <= 1:
+            return self.underlying.embed_documents(texts)
+
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(batches))) as executor:
+            results = executor.map(self.underlying.embed_documents, batches)
+            return [vector for batch in results for vector in batch]
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query with the underlying model."""
+        return self.underlying.embed_query(text)
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Embed many queries with the underlying model, batched where it allows."""
+        return embed_queries(self.underlying, texts)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """Asynchronously embed a query with the underlying model."""
+        return await self.underlying.aembed_query(text)
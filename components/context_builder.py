@@ -0,0 +1,206 @@
+"""Context builder component."""
+import re
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from langchain_core.documents import Document
+
+from utils.config_types import LLMType
+
+
+class ContextBuilder:
+    """
+    Packs retrieved chunks into the prompt context.
+
+    Chunks are taken in retrieval order. Near-duplicates of a chunk already
+    taken are dropped, text that a chunk shares with an adjacent chunk from
+    the same page (the splitter's chunk overlap) is sent only once, and the
+    result is cut to a token budget counted with the target model's
+    tokenizer. Where token counts are only approximated, the budget is
+    reduced by a safety margin so the real count stays under it. Token counts before and after packing are reported so the
+    savings are visible per query.
+    """
+
+    SEPARATOR = "\n\n"
+    SHINGLE_PATTERN = re.compile(r"\w+")
+
+    # Approximate characters per token for models without a local tokenizer
+    CHARS_PER_TOKEN = 4
+
+    # Share of max_tokens used when token counts are approximated; text with
+    # numbers, clause references or names runs well under CHARS_PER_TOKEN
+    APPROXIMATE_BUDGET_SHARE = 0.75
+
+    def __init__(self, config: Dict[str, Any], llm_config: Dict[str, Any]):
+        """
+        Initialize the context builder.
+
+        Args:
+            config: Context configuration
+            llm_config: LLM configuration, used to pick the tokenizer
+        """
+        self.max_tokens = config.get('max_tokens', 3000)
+        self.dedup_threshold = config.get('dedup_threshold', 0.9)
+        self.trim_overlap = config.get('trim_overlap', True)
+        self.min_overlap = max(config.get('min_overlap_chars', 20), 1)
+        self._encode, self._decode, exact = self._tokenizer(llm_config)
+        self.approximate = not exact
+        # Budget actually packed to, leaving a margin under approximated counts
+        self.budget = self.max_tokens if exact else int(self.max_tokens * self.APPROXIMATE_BUDGET_SHARE)
+
+    @classmethod
+    def _tokenizer(
+            cls,
+            llm_config: Dict[str, Any]
+    ) -> Tuple[Callable[[str], List[Any]], Callable[[List[Any]], str], bool]:
+        """
+        Get encode/decode functions for the configured LLM.
+
+        OpenAI models use their tiktoken encoding. Other providers do not
+        ship a local tokenizer (nor does OpenAI when tiktoken cannot fetch its
+        encoding), so text is cut into CHARS_PER_TOKEN-character pieces,
+        which approximates their token counts.
+
+        Args:
+            llm_config: LLM configuration
+
+        Returns:
+            (encode, decode, exact) where exact is False if token counts are
+            only approximated
+        """
+        if llm_config.get('type', '').lower() == LLMType.OPENAI:
+            import tiktoken
+            try:
+                try:
+                    encoding = tiktoken.encoding_for_model(llm_config.get('model_name', ''))
+                except KeyError:
+                    encoding = tiktoken.get_encoding('o200k_base')
+                return encoding.encode, encoding.decode, True
+            except Exception as e:
+                # tiktoken downloads encodings on first use, which fails offline
+                print(f"Warning: Could not load tokenizer, approximating token counts: {e}")
+
+        size = cls.CHARS_PER_TOKEN
+        return (
+            lambda text: [text[i:i + size] for i in range(0, len(text), size)],
+            lambda pieces: ''.join(pieces),
+            False
+        )
+
+    def count_tokens(self, text: str) -> int:
+        """Count the tokens of a text for the target model."""
+        return len(self._encode(text))
+
+    @classmethod
+    def _shingles(cls, text: str) -> Set[Tuple[str, ...]]:
+        """Get the word 3-grams of a text."""
+        words = cls.SHINGLE_PATTERN.findall(text.lower())
+        if len(words) < 3:
+            return {tuple(words)}
+        return {tuple(words[i:i + 3]) for i in range(len(words) - 2)}
+
+    def _overlap(self, first: str, second: str) -> int:
+        """
+        Length of the longest suffix of first that is a prefix of second.
+
+        Args:
+            first: Text that comes first in the document
+            second: Text that may start with the end of first
+
+        Returns:
+            Overlap length in characters, or 0 if shorter than min_overlap
+        """
+        probe = second[:self.min_overlap]
+        if len(probe) < self.min_overlap:
+            return 0
+
+        position = first.find(probe)
+        while position != -1:
+            length = len(first) - position
+            # The earliest match is the longest overlap
+            if length <= len(second) and second.startswith(first[position:]):
+                return length
+            position = first.find(probe, position + 1)
+        return 0
+
+    def _trim(self, text: str, taken: List[Tuple[Document, str]], document: Document) -> str:
+        """Remove text shared with chunks already taken from the same page."""
+        page = (document.metadata.get('source'), document.metadata.get('page'))
+        for other, other_text in taken:
+            if (other.metadata.get('source'), other.metadata.get('page')) != page:
+                continue
+            # Either chunk may come first in the document
+            overlap = self._overlap(other_text, text)
+            if overlap:
+                text = text[overlap:].lstrip()
+                continue
+            overlap = self._overlap(text, other_text)
+            if overlap:
+                text = text[:-overlap].rstrip()
+        return text
+
+    def build(self, docs: List[Document]) -> Tuple[str, Dict[str, int]]:
+        """
+        Build the prompt context from retrieved documents.
+
+        Args:
+            docs: Retrieved documents, most relevant first
+
+        Returns:
+            Context string, and statistics with the context tokens, the
+            tokens saved against joining the chunks verbatim and the number
+            of chunks dropped
+        """
+        original_tokens = self.count_tokens(self.SEPARATOR.join(doc.page_content for doc in docs))
+
+        taken: List[Tuple[Document, str]] = []
+        shingles: List[Set[Tuple[str, ...]]] = []
+        dropped = 0
+
+        for doc in docs:
+            text = doc.page_content.strip()
+            doc_shingles = self._shingles(text)
+            if any(
+                    len(doc_shingles & other) / max(len(doc_shingles | other), 1) >= self.dedup_threshold
+                    for other in shingles
+            ):
+                dropped += 1
+                continue
+
+            if self.trim_overlap:
+                text = self._trim(text, taken, doc)
+            if not text:
+                dropped += 1
+                continue
+
+            taken.append((doc, text))
+            shingles.append(doc_shingles)
+
+        parts: List[str] = []
+        used = 0
+        separator_tokens = self.count_tokens(self.SEPARATOR)
+
+        for _, text in taken:
+            budget: Optional[int] = None
+            if self.budget:
+                budget = self.budget - used - (separator_tokens if parts else 0)
+                if budget <= 0:
+                    dropped += 1
+                    continue
+
+            tokens = self._encode(text)
+            if budget is not None and len(tokens) > budget:
+                # Keep the start of the chunk that no longer fits whole
+                text = self._decode(tokens[:budget]).rstrip()
+                tokens = tokens[:budget]
+
+            used += len(tokens) + (separator_tokens if parts else 0)
+            parts.append(text)
+
+        context = self.SEPARATOR.join(parts)
+        context_tokens = self.count_tokens(context)
+
+        return context, {
+            'tokens': context_tokens,
+            'tokens_saved': max(original_tokens - context_tokens, 0),
+            'chunks_dropped': dropped
+        }
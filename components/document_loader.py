@@ -1,9 +1,90 @@
 """Document loader component."""
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
 from pathlib import Path
-from typing import List
+from typing import Dict, Iterator, List, Optional, Tuple
 from langchain_core.documents import Document
 from langchain_community.document_loaders import DirectoryLoader, PyPDFLoader
 
+from utils.metrics import get_metrics
+
+
+def _parse_pdf(file_path: str) -> Tuple[str, List[Document], float, Optional[str]]:
+    """
+    Parse one PDF, capturing any failure instead of raising.
+
+    Defined at module level so it can be sent to worker processes.
+
+    Args:
+        file_path: Path to the PDF file
+
+    Returns:
+        Tuple of (file_path, pages, parse_seconds, error message or None)
+    """
+    start = time.perf_counter()
+    try:
+        documents = PyPDFLoader(file_path).load()
+        return file_path, documents, time.perf_counter() - start, None
+    except Exception as e:
+        return file_path, [], time.perf_counter() - start, f"{type(e).__name__}: {e}"
+
+
+class LoadReport:
+    """Collects per-file parse times and overall throughput of a load."""
+
+    def __init__(self):
+        """Initialize an empty report."""
+        self.files: Dict[str, Dict[str, object]] = {}
+        self._start = time.perf_counter()
+        self._end: Optional[float] = None
+
+    def record(self, file_path: str, pages: int, seconds: float, error: Optional[str] = None) -> None:
+        """
+        Record the result of parsing one file.
+
+        Args:
+            file_path: Path to the file
+            pages: Number of pages parsed
+            seconds: Time spent parsing the file
+            error: Error message if parsing failed
+        """
+        self.files[file_path] = {'pages': pages, 'seconds': seconds, 'error': error}
+        self._end = time.perf_counter()
+
+        metrics = get_metrics()
+        metrics.observe('rag_document_load_seconds', seconds, status='error' if error else 'ok')
+        metrics.inc('rag_document_pages_total', pages)
+
+    @property
+    def pages(self) -> int:
+        """Total number of pages parsed."""
+        return sum(f['pages'] for f in self.files.values())
+
+    @property
+    def failures(self) -> Dict[str, str]:
+        """Files that failed to parse, mapped to their error."""
+        return {path: f['error'] for path, f in self.files.items() if f['error']}
+
+    @property
+    def elapsed(self) -> float:
+        """Wall-clock seconds from report creation to the last recorded file."""
+        return (self._end or time.perf_counter()) - self._start
+
+    @property
+    def pages_per_second(self) -> float:
+        """Overall parse throughput."""
+        return self.pages / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        """Get a one-line summary of the load."""
+        return (
+            f"Parsed {self.pages} pages from {len(self.files) - len(self.failures)} file(s) "
+            f"in {self.elapsed:.2f}s ({self.pages_per_second:.1f} pages/sec), "
+            f"{len(self.failures)} failed"
+        )
+
 
 class DocumentLoader:
     """Handles loading documents from various sources."""
@@ -75,4 +156,80 @@ class DocumentLoader:
         #     except Exception as e:
         #         print(f"Warning: Failed to load {pdf_file}: {e}")
 
-        return documents
\ No newline at end of file
+        return documents
+
+    @staticmethod
+    def iter_pdfs(
+            file_paths: List[str],
+            max_workers: int = 1,
+            report: Optional[LoadReport] = None,
+            max_pending: Optional[int] = None
+    ) -> Iterator[Tuple[str, List[Document], Optional[str]]]:
+        """
+        Parse PDFs, optionally across a process pool, streaming results back.
+
+        With more than one worker, files are parsed in parallel and yielded in
+        completion order. At most max_pending files are submitted or waiting
+        to be consumed at any time, so a slow consumer holds back parsing
+        instead of letting parsed pages pile up in memory. A file that fails
+        to parse, or whose worker process crashes, is yielded with an empty
+        page list and its error instead of aborting the whole load.
+
+        Args:
+            file_paths: Paths to the PDF files
+            max_workers: Number of worker processes (1 parses in-process)
+            report: Optional report to record per-file parse times in
+            max_pending: Maximum files in flight (defaults to twice the workers)
+
+        Yields:
+            Tuples of (file_path, pages, error message or None)
+        """
+        if max_workers <= 1 or len(file_paths) <= 1:
+            results = (_parse_pdf(file_path) for file_path in file_paths)
+            for file_path, documents, seconds, error in results:
+                if report is not None:
+                    report.record(file_path, len(documents), seconds, error)
+                yield file_path, documents, error
+            return
+
+        max_pending = max(max_pending or 2 * max_workers, 1)
+        remaining = iter(file_paths)
+        executor = ProcessPoolExecutor(max_workers=max_workers)
+        in_flight = {}
+
+        def submit(file_path):
+            nonlocal executor
+            try:
+                future = executor.submit(_parse_pdf, file_path)
+            except BrokenProcessPool:
+                # A crashed worker breaks the whole pool; start a fresh one
+                # so later files are still parsed
+                executor.shutdown(wait=False)
+                executor = ProcessPoolExecutor(max_workers=max_workers)
+                future = executor.submit(_parse_pdf, file_path)
+            in_flight[future] = file_path
+
+        try:
+            for file_path in islice(remaining, max_pending):
+                submit(file_path)
+
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    file_path = in_flight.pop(future)
+                    try:
+                        _, documents, seconds, error = future.result()
+                    except BrokenProcessPool as e:
+                        # The worker died mid-parse, e.g. the PDF parser crashed
+                        # on a malformed file; fail the files it took down with it
+                        documents, seconds, error = [], 0.0, f"{type(e).__name__}: {e}"
+                    if report is not None:
+                        report.record(file_path, len(documents), seconds, error)
+                    yield file_path, documents, error
+
+                    # Refill only after the consumer has taken a result
+                    next_path = next(remaining, None)
+                    if next_path is not None:
+                        submit(next_path)
+        finally:
+            executor.shutdown()
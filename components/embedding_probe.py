@@ -0,0 +1,120 @@
+"""Embedding compatibility probe component."""
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+
+class EmbeddingProbe:
+    """
+    Detects whether an embedding model matches the one an index was built with.
+
+    When an index is built, a fixed set of probe sentences is embedded and
+    stored next to it with the embedding configuration's namespace. Another
+    model (or the same model on another backend, such as ONNX Runtime or an
+    int8-quantized export) is compatible with the index if it embeds the
+    probes to nearly the same vectors.
+    """
+
+    FILENAME = 'embedding_probe.json'
+    VERSION = 1
+
+    PROBE_TEXTS = [
+        "How many days of annual leave are employees entitled to?",
+        "Employees must report any workplace injury to their supervisor immediately.",
+        "The probation period may be extended if performance is not satisfactory.",
+        "Gratuity is payable after five years of continuous service.",
+        "Complaints of sexual harassment are handled by the internal committee.",
+        "Remote work requires prior approval from the reporting manager.",
+        "Gifts from vendors above a nominal value must be declined.",
+        "Salaries are credited on the last working day of the month."
+    ]
+
+    def __init__(self, directory: str):
+        """
+        Initialize the probe.
+
+        Args:
+            directory: Directory the probe file is stored in (normally the
+                vector store persist directory)
+        """
+        self.path = Path(directory) / self.FILENAME
+        self.namespace: Optional[str] = None
+        self.vectors: List[List[float]] = []
+
+    @property
+    def exists(self) -> bool:
+        """Whether probe vectors have been recorded."""
+        return bool(self.vectors)
+
+    def load(self) -> 'EmbeddingProbe':
+        """
+        Load the probe from disk if present.
+
+        Returns:
+            The probe itself
+        """
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == self.VERSION and data.get('texts') == self.PROBE_TEXTS:
+                self.namespace = data.get('namespace')
+                self.vectors = data.get('vectors', [])
+        return self
+
+    def save(self) -> None:
+        """Atomically write the probe to disk."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.json.tmp')
+        data: Dict[str, Any] = {
+            'version': self.VERSION,
+            'namespace': self.namespace,
+            'texts': self.PROBE_TEXTS,
+            'vectors': self.vectors
+        }
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+    def record(self, embedding: Embeddings, namespace: str) -> None:
+        """
+        Embed the probe sentences with the model an index is built with.
+
+        Args:
+            embedding: Embedding model used for the index
+            namespace: Name of the model's vector space, see
+                EmbeddingFactory.cache_namespace
+        """
+        self.namespace = namespace
+        self.vectors = [[float(x) for x in vector] for vector in embedding.embed_documents(self.PROBE_TEXTS)]
+
+    def similarity(self, embedding: Embeddings, namespace: str) -> Optional[float]:
+        """
+        Measure how closely a model reproduces the recorded probe vectors.
+
+        Args:
+            embedding: Embedding model to check
+            namespace: Name of the model's vector space; a model with the
+                recorded namespace is compatible without embedding anything
+
+        Returns:
+            Lowest cosine similarity between the model's and the recorded
+            probe vectors (0.0 if the dimensions differ), or None if no
+            probe has been recorded
+        """
+        if not self.exists:
+            return None
+        if namespace == self.namespace:
+            return 1.0
+
+        recorded = np.asarray(self.vectors, dtype=np.float32)
+        current = np.asarray(embedding.embed_documents(self.PROBE_TEXTS), dtype=np.float32)
+        if current.shape != recorded.shape:
+            return 0.0
+
+        norms = np.linalg.norm(recorded, axis=1) * np.linalg.norm(current, axis=1)
+        similarities = np.sum(recorded * current, axis=1) / np.maximum(norms, 1e-12)
+        return float(similarities.min())
@@ -0,0 +1,173 @@
+"""Tokenizer of the embedding model, for sizing chunks in tokens."""
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+from utils.config_types import EmbeddingModelType
+
+# Used when neither the model nor its tokenizer declares a sequence limit
+DEFAULT_MAX_LENGTH = 512
+
+
+class EmbeddingTokenizer:
+    """
+    Counts tokens the way the embedding model does.
+
+    Sentence-transformer models truncate their input at max_length tokens
+    (special tokens included), so anything past that in a chunk is stored
+    but never embedded.
+    """
+
+    def __init__(self, tokenizer: Any, max_length: int):
+        """
+        Initialize the tokenizer.
+
+        Args:
+            tokenizer: Fast Hugging Face tokenizer (PreTrainedTokenizerFast)
+            max_length: Tokens the embedding model reads, special tokens included
+        """
+        self.tokenizer = tokenizer
+        self.max_length = max_length
+        self.special_tokens = tokenizer.num_special_tokens_to_add(pair=False)
+
+    @property
+    def max_content_tokens(self) -> int:
+        """Text tokens that fit in one embedding input."""
+        return max(self.max_length - self.special_tokens, 1)
+
+    @classmethod
+    def from_config(cls, embedding_config: Dict[str, Any]) -> 'EmbeddingTokenizer':
+        """
+        Load the tokenizer of the configured embedding model.
+
+        Args:
+            embedding_config: Embedding configuration dictionary
+
+        Returns:
+            EmbeddingTokenizer instance
+
+        Raises:
+            ValueError: If the embedding model has no local tokenizer
+        """
+        embedding_type = embedding_config.get('type', '').lower()
+        if embedding_type not in (EmbeddingModelType.HUGGINGFACE, EmbeddingModelType.ONNX):
+            raise ValueError(
+                f"Token-based splitting needs a local embedding model (huggingface or onnx), got {embedding_type}"
+            )
+
+        from transformers import AutoTokenizer
+
+        model_name = embedding_config.get('model_name')
+        tokenizer = AutoTokenizer.from_pretrained(model_name, use_fast=True)
+        if not tokenizer.is_fast:
+            raise ValueError(f"Token-based splitting needs a fast tokenizer, {model_name} has none")
+
+        return cls(tokenizer, cls._max_length(model_name, tokenizer))
+
+    @staticmethod
+    def _max_length(model_name: str, tokenizer: Any) -> int:
+        """
+        Get the sequence length the sentence-transformer model truncates at.
+
+        It is set in sentence_bert_config.json and is often shorter than the
+        tokenizer's own limit (256 vs 512 for all-MiniLM-L6-v2).
+        """
+        try:
+            if os.path.isdir(model_name):
+                path = os.path.join(model_name, 'sentence_bert_config.json')
+            else:
+                from huggingface_hub import hf_hub_download
+                path = hf_hub_download(model_name, 'sentence_bert_config.json')
+            with open(path, 'r', encoding='utf-8') as f:
+                return int(json.load(f)['max_seq_length'])
+        except Exception:
+            pass
+
+        # Tokenizers without a limit report a huge sentinel value
+        limit = getattr(tokenizer, 'model_max_length', None)
+        return limit if isinstance(limit, int) and 0 < limit <= 100_000 else DEFAULT_MAX_LENGTH
+
+    def token_starts(self, texts: List[str]) -> List[List[int]]:
+        """
+        Tokenize texts in one batch and get where each token starts.
+
+        Args:
+            texts: Texts to tokenize
+
+        Returns:
+            Sorted character offsets of the tokens of each text, without
+            special tokens
+        """
+        if not texts:
+            return []
+        encoded = self.tokenizer(
+            texts,
+            add_special_tokens=False,
+            return_offsets_mapping=True,
+            return_attention_mask=False,
+            return_token_type_ids=False,
+            verbose=False
+        )
+        return [[start for start, _ in offsets] for offsets in encoded['offset_mapping']]
+
+    def lengths(self, texts: List[str]) -> List[int]:
+        """
+        Count the tokens the embedding model would see for each text, in one batch.
+
+        Args:
+            texts: Texts to count
+
+        Returns:
+            Token counts including special tokens, before truncation
+        """
+        if not texts:
+            return []
+        encoded = self.tokenizer(
+            texts,
+            add_special_tokens=True,
+            return_attention_mask=False,
+            return_token_type_ids=False,
+            verbose=False
+        )
+        return [len(ids) for ids in encoded['input_ids']]
+
+
+class TruncationReport:
+    """Counts chunks longer than the embedding model reads."""
+
+    def __init__(self, max_length: int):
+        """
+        Initialize the report.
+
+        Args:
+            max_length: Tokens the embedding model reads
+        """
+        self.max_length = max_length
+        self.chunks = 0
+        self.truncated = 0
+        self.longest = 0
+        self.dropped_tokens = 0
+
+    def record(self, lengths: List[int]) -> None:
+        """
+        Record the token counts of a batch of chunks.
+
+        Args:
+            lengths: Token counts, as returned by EmbeddingTokenizer.lengths
+        """
+        self.chunks += len(lengths)
+        for length in lengths:
+            if length > self.max_length:
+                self.truncated += 1
+                self.dropped_tokens += length - self.max_length
+        self.longest = max([self.longest, *lengths])
+
+    def summary(self) -> Optional[str]:
+        """One-line summary, or None if no chunks were recorded."""
+        if not self.chunks:
+            return None
+        return (
+            f"{self.truncated} of {self.chunks} chunks exceed the embedding model's "
+            f"{self.max_length}-token limit and are truncated when embedded "
+            f"({self.dropped_tokens} tokens not embedded; longest chunk {self.longest} tokens)"
+        )
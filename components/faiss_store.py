@@ -0,0 +1,281 @@
+"""FAISS vector store with a persistent, memory-mapped index."""
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import faiss
+import numpy as np
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
+from langchain_core.embeddings import Embeddings
+
+
+class MmapFAISS(FAISS):
+    """
+    FAISS vector store whose index is persisted to disk and opened with mmap.
+
+    The index type (flat, IVF or HNSW) comes from configuration. All types
+    use L2 distance, the same metric as the Chroma backend, so both rank
+    results the same way. Opened read-only, the index file is memory-mapped
+    and the vectors are paged in on demand instead of being copied into RAM
+    at startup. The document store (chunk text and metadata) is a pickle and
+    is still read fully into memory.
+    """
+
+    INDEX_TYPES = ('flat', 'ivf', 'hnsw')
+
+    # IO_FLAG_MMAP_IFC maps the vectors of every index type in place;
+    # IO_FLAG_MMAP alone still copies the codes of flat indexes into RAM.
+    # Older FAISS builds only have the latter.
+    MMAP_FLAGS = getattr(faiss, 'IO_FLAG_MMAP_IFC', faiss.IO_FLAG_MMAP) | faiss.IO_FLAG_READ_ONLY
+
+    def __init__(
+            self,
+            embedding_function: Embeddings,
+            index: Any,
+            docstore: InMemoryDocstore,
+            index_to_docstore_id: Dict[int, str],
+            config: Dict[str, Any]
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            embedding_function: Embedding model instance
+            index: FAISS index
+            docstore: Document store holding chunk text and metadata
+            index_to_docstore_id: Mapping of index positions to chunk IDs
+            config: Vector store configuration
+        """
+        super().__init__(embedding_function, index, docstore, index_to_docstore_id)
+        self.config = config
+        self.index_type = config.get('index_type', 'flat').lower()
+        # Set by load() when the index is memory-mapped; such an index aborts
+        # the process if FAISS is asked to resize it
+        self.read_only = False
+
+        if self.index_type not in self.INDEX_TYPES:
+            raise ValueError(f"Unsupported FAISS index type: {self.index_type}")
+
+        self._tune(self.index)
+
+    @staticmethod
+    def _paths(folder_path: str, index_name: str) -> Dict[str, Path]:
+        """Get the index and docstore file paths."""
+        folder = Path(folder_path)
+        return {'index': folder / f"{index_name}.faiss", 'store': folder / f"{index_name}.pkl"}
+
+    @classmethod
+    def exists(cls, folder_path: str, index_name: str) -> bool:
+        """Check whether a persisted index exists."""
+        return all(path.exists() for path in cls._paths(folder_path, index_name).values())
+
+    @classmethod
+    def remove(cls, folder_path: str, index_name: str) -> None:
+        """Delete a persisted index."""
+        for path in cls._paths(folder_path, index_name).values():
+            if path.exists():
+                path.unlink()
+
+    def _build_index(self, dimension: int, vectors: Optional[np.ndarray] = None) -> Any:
+        """
+        Build an empty index of the configured type.
+
+        IVF needs training data, so until vectors are available a flat index
+        is used for staging and converted on save.
+
+        Args:
+            dimension: Vector dimension
+            vectors: Optional training vectors for IVF
+
+        Returns:
+            FAISS index
+        """
+        if self.index_type == 'hnsw':
+            index = faiss.IndexHNSWFlat(dimension, self.config.get('hnsw_m', 32))
+            index.hnsw.efConstruction = self.config.get('hnsw_ef_construction', 200)
+            return index
+
+        if self.index_type == 'ivf' and vectors is not None and len(vectors) > 0:
+            # FAISS wants roughly 39 training points per list
+            nlist = max(1, min(self.config.get('ivf_nlist', 100), len(vectors) // 39))
+            quantizer = faiss.IndexFlatL2(dimension)
+            index = faiss.IndexIVFFlat(quantizer, dimension, nlist)
+            index.train(vectors)
+            # Allows reconstructing vectors for MMR and rebuilds
+            index.make_direct_map()
+            return index
+
+        return faiss.IndexFlatL2(dimension)
+
+    def _tune(self, index: Any) -> None:
+        """Apply search-time parameters to an index."""
+        if isinstance(index, faiss.IndexIVF):
+            index.nprobe = self.config.get('ivf_nprobe', 10)
+        elif isinstance(index, faiss.IndexHNSW):
+            index.hnsw.efSearch = self.config.get('hnsw_ef_search', 64)
+
+    def _all_vectors(self) -> np.ndarray:
+        """Reconstruct all stored vectors in index order."""
+        if self.index.ntotal == 0:
+            return np.zeros((0, self.index.d), dtype=np.float32)
+        return np.vstack([self.index.reconstruct(i) for i in range(self.index.ntotal)]).astype(np.float32)
+
+    def _rebuild(self, vectors: np.ndarray) -> None:
+        """Replace the index with a new one holding the given vectors."""
+        index = self._build_index(self.index.d, vectors)
+        if len(vectors):
+            index.add(vectors)
+        self._tune(index)
+        self.index = index
+
+    def _check_writable(self) -> None:
+        """Raise if the index is memory-mapped read-only."""
+        if self.read_only:
+            raise ValueError("This FAISS index was opened read-only; load it with read_only=False to modify it")
+
+    def add_texts(
+            self,
+            texts: Iterable[str],
+            metadatas: Optional[List[dict]] = None,
+            ids: Optional[List[str]] = None,
+            **kwargs: Any
+    ) -> List[str]:
+        """Add texts, unless the index is read-only."""
+        self._check_writable()
+        return super().add_texts(texts, metadatas=metadatas, ids=ids, **kwargs)
+
+    def add_embeddings(self, text_embeddings: Iterable[Any], *args: Any, **kwargs: Any) -> List[str]:
+        """Add precomputed embeddings, unless the index is read-only."""
+        self._check_writable()
+        return super().add_embeddings(text_embeddings, *args, **kwargs)
+
+    def merge_from(self, target: FAISS) -> None:
+        """Merge another store into this one, unless the index is read-only."""
+        self._check_writable()
+        super().merge_from(target)
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+        """
+        Delete chunks by ID.
+
+        Flat indexes support removal directly. IVF and HNSW indexes are
+        rebuilt from the remaining vectors so index positions stay contiguous.
+
+        Args:
+            ids: Chunk IDs to delete
+
+        Returns:
+            True if deletion succeeded
+
+        Raises:
+            ValueError: If the index is read-only or an ID does not exist
+        """
+        self._check_writable()
+        if isinstance(self.index, faiss.IndexFlat):
+            return super().delete(ids, **kwargs)
+
+        if ids is None:
+            raise ValueError("No ids provided to delete.")
+
+        to_delete = set(ids)
+        missing_ids = to_delete.difference(self.index_to_docstore_id.values())
+        if missing_ids:
+            raise ValueError(f"Some specified ids do not exist in the current store. Ids not found: {missing_ids}")
+
+        keep = [i for i, id_ in sorted(self.index_to_docstore_id.items()) if id_ not in to_delete]
+        vectors = self._all_vectors()[keep]
+
+        self._rebuild(vectors)
+        self.docstore.delete(list(to_delete))
+        self.index_to_docstore_id = {
+            position: self.index_to_docstore_id[i] for position, i in enumerate(keep)
+        }
+        return True
+
+    def save(self, folder_path: str, index_name: str) -> None:
+        """
+        Persist the index and document store.
+
+        A staged IVF index is trained on all stored vectors first.
+
+        Args:
+            folder_path: Directory to write to
+            index_name: Base file name
+        """
+        if self.index_type == 'ivf' and isinstance(self.index, faiss.IndexFlat) and self.index.ntotal > 0:
+            self._rebuild(self._all_vectors())
+
+        paths = self._paths(folder_path, index_name)
+        Path(folder_path).mkdir(parents=True, exist_ok=True)
+
+        # Write to temporary files first so readers never see a partial index
+        faiss.write_index(self.index, str(paths['index']) + '.tmp')
+        with open(str(paths['store']) + '.tmp', 'wb') as f:
+            pickle.dump((self.docstore, self.index_to_docstore_id), f)
+        os.replace(str(paths['index']) + '.tmp', paths['index'])
+        os.replace(str(paths['store']) + '.tmp', paths['store'])
+
+    @classmethod
+    def load(
+            cls,
+            folder_path: str,
+            index_name: str,
+            embedding: Embeddings,
+            config: Dict[str, Any],
+            read_only: bool = False
+    ) -> 'MmapFAISS':
+        """
+        Open a persisted index.
+
+        Args:
+            folder_path: Directory the index was saved to
+            index_name: Base file name
+            embedding: Embedding model instance
+            config: Vector store configuration
+            read_only: Memory-map the index instead of reading it into RAM;
+                the returned store cannot be modified
+
+        Returns:
+            MmapFAISS instance
+        """
+        paths = cls._paths(folder_path, index_name)
+
+        index = None
+        mapped = False
+        if read_only and config.get('mmap', True):
+            try:
+                index = faiss.read_index(str(paths['index']), cls.MMAP_FLAGS)
+                mapped = True
+            except RuntimeError:
+                # Older FAISS builds cannot mmap every index type
+                index = None
+        if index is None:
+            index = faiss.read_index(str(paths['index']))
+
+        # The pickle is written by save() from this application only
+        with open(paths['store'], 'rb') as f:
+            docstore, index_to_docstore_id = pickle.load(f)
+
+        store = cls(embedding, index, docstore, index_to_docstore_id, config)
+        store.read_only = mapped
+        return store
+
+    @classmethod
+    def create_empty(cls, embedding: Embeddings, config: Dict[str, Any]) -> 'MmapFAISS':
+        """
+        Create an empty store, probing the embedding model for its dimension.
+
+        Args:
+            embedding: Embedding model instance
+            config: Vector store configuration
+
+        Returns:
+            Empty MmapFAISS instance
+        """
+        dimension = len(embedding.embed_query("dimension probe"))
+        store = cls(embedding, faiss.IndexFlatL2(dimension), InMemoryDocstore(), {}, config)
+        store.index = store._build_index(dimension)
+        store._tune(store.index)
+        return store
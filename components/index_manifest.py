@@ -0,0 +1,164 @@
+"""Index manifest component."""
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+class IndexManifest:
+    """
+    Tracks which source files are indexed and the chunk IDs they produced.
+
+    Each entry records the file's size, modification time and content hash,
+    so unchanged files can be skipped from a stat call alone and changed or
+    deleted files can have exactly their chunks removed from the vector store.
+    """
+
+    FILENAME = 'index_manifest.json'
+    VERSION = 1
+
+    def __init__(self, directory: str):
+        """
+        Initialize the manifest.
+
+        Args:
+            directory: Directory the manifest file is stored in (normally the
+                vector store persist directory)
+        """
+        self.path = Path(directory) / self.FILENAME
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.exists = False
+
+    def load(self) -> 'IndexManifest':
+        """
+        Load the manifest from disk if present.
+
+        Returns:
+            The manifest itself
+        """
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == self.VERSION:
+                self.files = data.get('files', {})
+                self.exists = True
+        return self
+
+    def save(self) -> None:
+        """Atomically write the manifest to disk."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': self.VERSION, 'files': self.files}, f, indent=2)
+        os.replace(tmp_path, self.path)
+        self.exists = True
+
+    @staticmethod
+    def key(file_path: str) -> str:
+        """Get the manifest key for a file path."""
+        return str(Path(file_path).resolve())
+
+    @staticmethod
+    def file_sha256(file_path: str) -> str:
+        """
+        Hash a file's contents.
+
+        Args:
+            file_path: Path to the file
+
+        Returns:
+            Hex SHA-256 digest of the file
+        """
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @staticmethod
+    def chunk_ids(file_path: str, sha256: str, count: int) -> List[str]:
+        """
+        Build deterministic chunk IDs for a file version.
+
+        Args:
+            file_path: Path to the source file
+            sha256: Content hash of the file
+            count: Number of chunks
+
+        Returns:
+            List of chunk IDs
+        """
+        path_hash = hashlib.sha256(IndexManifest.key(file_path).encode('utf-8')).hexdigest()[:12]
+        return [f"{path_hash}-{sha256[:16]}-{i:05d}" for i in range(count)]
+
+    def get(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """Get the manifest entry for a file, if any."""
+        return self.files.get(self.key(file_path))
+
+    def is_unchanged(self, file_path: str, stat: os.stat_result) -> bool:
+        """
+        Check from file stats alone whether a file is already indexed as-is.
+
+        Args:
+            file_path: Path to the file
+            stat: Result of os.stat for the file
+
+        Returns:
+            True if size and modification time match the manifest entry
+        """
+        entry = self.get(file_path)
+        return (
+            entry is not None
+            and entry['size'] == stat.st_size
+            and entry['mtime_ns'] == stat.st_mtime_ns
+        )
+
+    def set(self, file_path: str, stat: os.stat_result, sha256: str, chunk_ids: List[str]) -> None:
+        """
+        Record an indexed file.
+
+        Args:
+            file_path: Path to the file
+            stat: Result of os.stat for the file
+            sha256: Content hash of the file
+            chunk_ids: IDs of the chunks stored for the file
+        """
+        self.files[self.key(file_path)] = {
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha256': sha256,
+            # Path as given, which is what chunk 'source' metadata holds
+            'source': file_path,
+            'chunk_ids': chunk_ids
+        }
+
+    def remove(self, file_path: str) -> List[str]:
+        """
+        Forget a file.
+
+        Args:
+            file_path: Path to the file
+
+        Returns:
+            Chunk IDs that were recorded for the file
+        """
+        entry = self.files.pop(self.key(file_path), None)
+        return entry['chunk_ids'] if entry else []
+
+    def tracked_in(self, directory_path: str) -> List[str]:
+        """
+        List tracked files that live directly in a directory.
+
+        Args:
+            directory_path: Path to the directory
+
+        Returns:
+            Manifest keys of the files
+        """
+        directory = Path(directory_path).resolve()
+        return [key for key in self.files if Path(key).parent == directory]
+
+    def clear(self) -> None:
+        """Forget all files."""
+        self.files = {}
@@ -0,0 +1,68 @@
+"""Instrumented embeddings component."""
+import time
+from typing import List
+
+from langchain_core.embeddings import Embeddings
+
+from components.cached_embeddings import embed_queries
+from utils.metrics import Metrics
+
+
+class InstrumentedEmbeddings(Embeddings):
+    """
+    Records the latency and volume of every embedding call.
+
+    Wraps the embedding model (including its cache, if any) when metrics
+    are enabled, so the recorded time is what indexing and queries wait for.
+    """
+
+    def __init__(self, underlying: Embeddings, metrics: Metrics):
+        """
+        Initialize the wrapper.
+
+        Args:
+            underlying: Embedding model that does the work
+            metrics: Metrics to record into
+        """
+        self.underlying = underlying
+        self.metrics = metrics
+
+    def _record(self, operation: str, count: int, start: float) -> None:
+        """Record one call's latency and text count."""
+        self.metrics.observe('rag_embedding_seconds', time.perf_counter() - start, operation=operation)
+        self.metrics.inc('rag_embedding_texts_total', count, operation=operation)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents with the underlying model."""
+        start = time.perf_counter()
+        vectors = self.underlying.embed_documents(texts)
+        self._record('documents', len(texts), start)
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query with the underlying model."""
+        start = time.perf_counter()
+        vector = self.underlying.embed_query(text)
+        self._record('query', 1, start)
+        return vector
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Embed many queries with the underlying model, batched where it allows."""
+        start = time.perf_counter()
+        vectors = embed_queries(self.underlying, texts)
+        self._record('query', len(texts), start)
+        return vectors
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Asynchronously embed documents with the underlying model."""
+        start = time.perf_counter()
+        vectors = await self.underlying.aembed_documents(texts)
+        self._record('documents', len(texts), start)
+        return vectors
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """Asynchronously embed a query with the underlying model."""
+        start = time.perf_counter()
+        vector = await self.underlying.aembed_query(text)
+        self._record('query', 1, start)
+        return vector
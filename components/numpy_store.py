@@ -0,0 +1,409 @@
+"""In-process NumPy vector store for small corpora."""
+import json
+import os
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+from langchain_core.vectorstores.utils import maximal_marginal_relevance
+
+
+class NumpyVectorStore(VectorStore):
+    """
+    Vector store that keeps every chunk embedding in one float32 matrix.
+
+    Vectors are L2-normalised when added, so cosine similarity is a single
+    matrix-vector product and top-k selection is an argpartition. The matrix
+    is saved as an .npy file that can be memory-mapped on load, with chunk
+    text and metadata in a JSON file next to it. Meant for corpora small
+    enough that a database adds more overhead than the search itself.
+    """
+
+    def __init__(
+            self,
+            embedding: Embeddings,
+            vectors: Optional[np.ndarray] = None,
+            texts: Optional[List[str]] = None,
+            metadatas: Optional[List[Dict[str, Any]]] = None,
+            ids: Optional[List[str]] = None
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            embedding: Embedding model instance
+            vectors: Normalised float32 matrix of shape (n, dimension)
+            texts: Chunk texts, one per row
+            metadatas: Chunk metadata, one per row
+            ids: Chunk IDs, one per row
+        """
+        self.embedding = embedding
+        self._vectors = vectors
+        self._texts = texts or []
+        self._metadatas = metadatas or []
+        self._ids = ids or []
+        self._positions = {id_: i for i, id_ in enumerate(self._ids)}
+
+    @property
+    def embeddings(self) -> Embeddings:
+        """Embedding model used by the store."""
+        return self.embedding
+
+    def __len__(self) -> int:
+        """Number of stored chunks."""
+        return len(self._ids)
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        """L2-normalise rows, leaving zero rows untouched."""
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (vectors / norms).astype(np.float32)
+
+    def add_texts(
+            self,
+            texts: Iterable[str],
+            metadatas: Optional[List[Dict[str, Any]]] = None,
+            ids: Optional[List[str]] = None,
+            **kwargs: Any
+    ) -> List[str]:
+        """
+        Embed texts and append them to the matrix.
+
+        Args:
+            texts: Texts to add
+            metadatas: Optional metadata per text
+            ids: Optional IDs per text
+
+        Returns:
+            IDs of the added texts
+        """
+        texts = list(texts)
+        if not texts:
+            return []
+
+        ids = list(ids) if ids else [str(uuid.uuid4()) for _ in texts]
+        metadatas = list(metadatas) if metadatas else [{} for _ in texts]
+
+        duplicates = set(ids).intersection(self._positions)
+        if duplicates or len(set(ids)) != len(ids):
+            raise ValueError(f"Duplicate ids: {sorted(duplicates) or ids}")
+
+        new_vectors = self._normalize(np.asarray(self.embedding.embed_documents(texts), dtype=np.float32))
+
+        # vstack copies, which also detaches the matrix from a read-only mmap
+        self._vectors = new_vectors if self._vectors is None else np.vstack([self._vectors, new_vectors])
+        for id_ in ids:
+            self._positions[id_] = len(self._ids)
+            self._ids.append(id_)
+        self._texts.extend(texts)
+        self._metadatas.extend(metadatas)
+
+        return ids
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+        """
+        Delete chunks by ID.
+
+        Args:
+            ids: Chunk IDs to delete
+
+        Returns:
+            True if deletion succeeded
+        """
+        if ids is None:
+            raise ValueError("No ids provided to delete.")
+
+        to_delete = set(ids)
+        keep = [i for i, id_ in enumerate(self._ids) if id_ not in to_delete]
+
+        self._vectors = self._vectors[keep] if self._vectors is not None else None
+        self._texts = [self._texts[i] for i in keep]
+        self._metadatas = [self._metadatas[i] for i in keep]
+        self._ids = [self._ids[i] for i in keep]
+        self._positions = {id_: i for i, id_ in enumerate(self._ids)}
+        return True
+
+    def get_by_ids(self, ids: Sequence[str], /) -> List[Document]:
+        """
+        Get chunks by ID.
+
+        Args:
+            ids: Chunk IDs
+
+        Returns:
+            Documents for the IDs that exist
+        """
+        return [self._document(self._positions[id_]) for id_ in ids if id_ in self._positions]
+
+    def _document(self, position: int) -> Document:
+        """Build a Document for a matrix row."""
+        return Document(
+            id=self._ids[position],
+            page_content=self._texts[position],
+            metadata=dict(self._metadatas[position])
+        )
+
+    def _filter_mask(self, filter: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """
+        Build a boolean row mask from a metadata filter.
+
+        Supports equality ({"source": "a.pdf"}) and membership
+        ({"source": {"$in": ["a.pdf", "b.pdf"]}}) conditions.
+
+        Args:
+            filter: Metadata filter or None
+
+        Returns:
+            Boolean mask, or None when there is no filter
+        """
+        if not filter:
+            return None
+
+        def matches(metadata: Dict[str, Any]) -> bool:
+            for key, condition in filter.items():
+                value = metadata.get(key)
+                if isinstance(condition, dict):
+                    if '$in' in condition and value not in condition['$in']:
+                        return False
+                    if '$eq' in condition and value != condition['$eq']:
+                        return False
+                elif value != condition:
+                    return False
+            return True
+
+        return np.fromiter((matches(m) for m in self._metadatas), dtype=bool, count=len(self._metadatas))
+
+    def _top_k(self, scores: np.ndarray, k: int) -> np.ndarray:
+        """Get the indices of the k highest scores, best first."""
+        k = min(k, len(scores))
+        if k <= 0:
+            return np.zeros(0, dtype=np.int64)
+        top = np.argpartition(-scores, k - 1)[:k]
+        return top[np.argsort(-scores[top])]
+
+    def similarity_search_with_score_by_vector(
+            self,
+            embedding: List[float],
+            k: int = 4,
+            filter: Optional[Dict[str, Any]] = None,
+            **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        """
+        Find the chunks most similar to an embedding.
+
+        Args:
+            embedding: Query embedding
+            k: Number of results
+            filter: Optional metadata filter
+
+        Returns:
+            List of (Document, cosine similarity) pairs, best first
+        """
+        if self._vectors is None or len(self._ids) == 0:
+            return []
+
+        query = self._normalize(np.asarray(embedding, dtype=np.float32))
+        scores = self._vectors @ query
+
+        mask = self._filter_mask(filter)
+        if mask is not None:
+            scores = np.where(mask, scores, -np.inf)
+            k = min(k, int(mask.sum()))
+
+        return [(self._document(int(i)), float(scores[i])) for i in self._top_k(scores, k)]
+
+    def similarity_search_by_vector(
+            self,
+            embedding: List[float],
+            k: int = 4,
+            filter: Optional[Dict[str, Any]] = None,
+            **kwargs: Any
+    ) -> List[Document]:
+        """Find the chunks most similar to an embedding."""
+        return [doc for doc, _ in self.similarity_search_with_score_by_vector(embedding, k, filter)]
+
+    def similarity_search_by_vectors(self, embeddings: List[List[float]], k: int = 4) -> List[List[Document]]:
+        """
+        Find the most similar chunks for many embeddings in one matrix product.
+
+        Args:
+            embeddings: Query embeddings
+            k: Number of results per query
+
+        Returns:
+            One list of Documents per query, best first
+        """
+        if self._vectors is None or len(self._ids) == 0:
+            return [[] for _ in embeddings]
+
+        queries = self._normalize(np.asarray(embeddings, dtype=np.float32))
+        scores = queries @ self._vectors.T
+        return [[self._document(int(i)) for i in self._top_k(row, k)] for row in scores]
+
+    def similarity_search_with_score(
+            self,
+            query: str,
+            k: int = 4,
+            filter: Optional[Dict[str, Any]] = None,
+            **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        """Find the chunks most similar to a query, with cosine similarities."""
+        return self.similarity_search_with_score_by_vector(self.embedding.embed_query(query), k, filter)
+
+    def similarity_search(
+            self,
+            query: str,
+            k: int = 4,
+            filter: Optional[Dict[str, Any]] = None,
+            **kwargs: Any
+    ) -> List[Document]:
+        """Find the chunks most similar to a query."""
+        return self.similarity_search_by_vector(self.embedding.embed_query(query), k, filter)
+
+    def max_marginal_relevance_search_by_vector(
+            self,
+            embedding: List[float],
+            k: int = 4,
+            fetch_k: int = 20,
+            lambda_mult: float = 0.5,
+            filter: Optional[Dict[str, Any]] = None,
+            **kwargs: Any
+    ) -> List[Document]:
+        """
+        Find diverse relevant chunks with maximal marginal relevance.
+
+        Args:
+            embedding: Query embedding
+            k: Number of results
+            fetch_k: Number of candidates to choose from
+            lambda_mult: Trade-off between relevance (1) and diversity (0)
+            filter: Optional metadata filter
+
+        Returns:
+            List of Documents
+        """
+        candidates = self.similarity_search_with_score_by_vector(embedding, fetch_k, filter)
+        if not candidates:
+            return []
+
+        candidate_vectors = [self._vectors[self._positions[doc.id]] for doc, _ in candidates]
+        selected = maximal_marginal_relevance(
+            np.asarray(embedding, dtype=np.float32), candidate_vectors, lambda_mult=lambda_mult, k=k
+        )
+        return [candidates[i][0] for i in selected]
+
+    def max_marginal_relevance_search(
+            self,
+            query: str,
+            k: int = 4,
+            fetch_k: int = 20,
+            lambda_mult: float = 0.5,
+            filter: Optional[Dict[str, Any]] = None,
+            **kwargs: Any
+    ) -> List[Document]:
+        """Find diverse relevant chunks for a query."""
+        return self.max_marginal_relevance_search_by_vector(
+            self.embedding.embed_query(query), k, fetch_k, lambda_mult, filter
+        )
+
+    def _select_relevance_score_fn(self) -> Callable[[float], float]:
+        """Scores are already cosine similarities."""
+        return lambda score: score
+
+    @classmethod
+    def from_texts(
+            cls,
+            texts: List[str],
+            embedding: Embeddings,
+            metadatas: Optional[List[Dict[str, Any]]] = None,
+            ids: Optional[List[str]] = None,
+            **kwargs: Any
+    ) -> 'NumpyVectorStore':
+        """
+        Create a store from texts.
+
+        Args:
+            texts: Texts to add
+            embedding: Embedding model instance
+            metadatas: Optional metadata per text
+            ids: Optional IDs per text
+
+        Returns:
+            NumpyVectorStore instance
+        """
+        store = cls(embedding)
+        store.add_texts(texts, metadatas, ids=ids)
+        return store
+
+    @staticmethod
+    def _paths(folder_path: str, name: str) -> Dict[str, Path]:
+        """Get the matrix and metadata file paths."""
+        folder = Path(folder_path)
+        return {'vectors': folder / f"{name}.npy", 'metadata': folder / f"{name}.json"}
+
+    @classmethod
+    def exists(cls, folder_path: str, name: str) -> bool:
+        """Check whether a persisted store exists."""
+        return all(path.exists() for path in cls._paths(folder_path, name).values())
+
+    @classmethod
+    def remove(cls, folder_path: str, name: str) -> None:
+        """Delete a persisted store."""
+        for path in cls._paths(folder_path, name).values():
+            if path.exists():
+                path.unlink()
+
+    def save(self, folder_path: str, name: str) -> None:
+        """
+        Persist the matrix and chunk metadata.
+
+        Args:
+            folder_path: Directory to write to
+            name: Base file name
+        """
+        paths = self._paths(folder_path, name)
+        Path(folder_path).mkdir(parents=True, exist_ok=True)
+
+        dimension = self._vectors.shape[1] if self._vectors is not None else 0
+        vectors = self._vectors if self._vectors is not None else np.zeros((0, dimension), dtype=np.float32)
+
+        # Write to temporary files first so readers never see a partial store
+        with open(str(paths['vectors']) + '.tmp', 'wb') as f:
+            np.save(f, np.ascontiguousarray(vectors, dtype=np.float32))
+        with open(str(paths['metadata']) + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump({'ids': self._ids, 'texts': self._texts, 'metadatas': self._metadatas}, f)
+        os.replace(str(paths['vectors']) + '.tmp', paths['vectors'])
+        os.replace(str(paths['metadata']) + '.tmp', paths['metadata'])
+
+    @classmethod
+    def load(cls, folder_path: str, name: str, embedding: Embeddings, mmap: bool = True) -> 'NumpyVectorStore':
+        """
+        Open a persisted store.
+
+        Args:
+            folder_path: Directory the store was saved to
+            name: Base file name
+            embedding: Embedding model instance
+            mmap: Memory-map the matrix instead of reading it into RAM
+
+        Returns:
+            NumpyVectorStore instance
+        """
+        paths = cls._paths(folder_path, name)
+
+        vectors = np.load(paths['vectors'], mmap_mode='r' if mmap else None)
+        with open(paths['metadata'], 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        return cls(
+            embedding,
+            vectors if len(vectors) else None,
+            data['texts'],
+            data['metadatas'],
+            data['ids']
+        )
@@ -0,0 +1,250 @@
+"""Offset-based recursive text splitter."""
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import accumulate
+from typing import TYPE_CHECKING, Callable, Iterable, List, Optional, Tuple
+
+from langchain_core.documents import Document
+
+if TYPE_CHECKING:
+    from components.embedding_tokenizer import EmbeddingTokenizer
+
+DEFAULT_SEPARATORS = ("\n\n", "\n", " ", "")
+
+Span = Tuple[int, int]
+
+
+def _boundaries(text: str, start: int, end: int, separator: str) -> List[int]:
+    """
+    Cut a span at every occurrence of a separator, keeping the separator at
+    the start of the piece that follows it.
+
+    Returns:
+        Piece boundaries: piece i is text[bounds[i]:bounds[i + 1]]. All
+        pieces are non-empty.
+    """
+    if not separator:
+        return list(range(start, end + 1))
+
+    # str.split scans in C; only the part lengths are kept
+    lengths = [len(part) + len(separator) for part in text[start:end].split(separator)]
+    lengths[0] -= len(separator)
+    bounds = list(accumulate(lengths, initial=start))
+    # A span that starts with the separator has an empty first piece
+    return bounds[1:] if bounds[1] == start else bounds
+
+
+def _strip(text: str, start: int, end: int) -> Optional[Span]:
+    """Narrow a span to exclude surrounding whitespace, or None if nothing is left."""
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return (start, end) if start < end else None
+
+
+def _merge(
+        text: str,
+        bounds: List[int],
+        sizes: List[int],
+        first: int,
+        stop: int,
+        chunk_size: int,
+        chunk_overlap: int,
+        chunks: List[Span]
+) -> None:
+    """
+    Merge pieces first..stop-1 into chunks of at most chunk_size, starting
+    each chunk with up to chunk_overlap of the previous one. Piece i
+    measures sizes[i + 1] - sizes[i].
+    """
+    total = 0
+    for index in range(first, stop):
+        length = sizes[index + 1] - sizes[index]
+        if total + length > chunk_size and first < index:
+            chunk = _strip(text, bounds[first], bounds[index])
+            if chunk is not None:
+                chunks.append(chunk)
+            # Drop pieces from the front until the rest fits as overlap
+            while total > chunk_overlap or (total + length > chunk_size and total > 0):
+                total -= sizes[first + 1] - sizes[first]
+                first += 1
+        total += length
+
+    if first < stop:
+        chunk = _strip(text, bounds[first], bounds[stop])
+        if chunk is not None:
+            chunks.append(chunk)
+
+
+def _split(
+        text: str,
+        start: int,
+        end: int,
+        separators: Tuple[str, ...],
+        chunk_size: int,
+        chunk_overlap: int,
+        chunks: List[Span],
+        position: Optional[Callable[[int], int]] = None
+) -> None:
+    """
+    Recursively split a span of text, appending chunk spans.
+
+    position maps a character offset to the number of tokens before it;
+    without it, sizes are counted in characters.
+    """
+    separator = separators[-1]
+    remaining: Tuple[str, ...] = ()
+    for i, candidate in enumerate(separators):
+        if not candidate:
+            separator = candidate
+            break
+        if text.find(candidate, start, end) != -1:
+            separator = candidate
+            remaining = separators[i + 1:]
+            break
+
+    bounds = _boundaries(text, start, end, separator)
+    sizes = bounds if position is None else [position(bound) for bound in bounds]
+    # Runs of pieces smaller than chunk_size are merged; larger ones are split further
+    first = 0
+    for index in range(len(bounds) - 1):
+        if sizes[index + 1] - sizes[index] < chunk_size:
+            continue
+
+        if first < index:
+            _merge(text, bounds, sizes, first, index, chunk_size, chunk_overlap, chunks)
+        if remaining:
+            _split(text, bounds[index], bounds[index + 1], remaining, chunk_size, chunk_overlap, chunks, position)
+        else:
+            chunks.append((bounds[index], bounds[index + 1]))
+        first = index + 1
+
+    if first < len(bounds) - 1:
+        _merge(text, bounds, sizes, first, len(bounds) - 1, chunk_size, chunk_overlap, chunks)
+
+
+def split_spans(
+        text: str,
+        chunk_size: int,
+        chunk_overlap: int,
+        separators: Tuple[str, ...] = DEFAULT_SEPARATORS,
+        token_starts: Optional[List[int]] = None
+) -> List[Span]:
+    """
+    Compute chunk boundaries in a text.
+
+    Produces the same chunks as RecursiveCharacterTextSplitter with the same
+    settings (separators kept at the start of the following piece, whitespace
+    stripped), as (start, end) offsets instead of strings. Given the token
+    offsets of the text, chunks are sized in tokens instead, like
+    RecursiveCharacterTextSplitter with a token-counting length function.
+
+    Args:
+        text: Text to split
+        chunk_size: Maximum characters (or tokens) per chunk
+        chunk_overlap: Maximum characters (or tokens) shared by consecutive chunks
+        separators: Separators to try, from coarsest to finest
+        token_starts: Sorted character offsets where the text's tokens start
+
+    Returns:
+        Chunk spans in order
+    """
+    position = None
+    size = len(text)
+    if token_starts is not None:
+        position = partial(bisect_left, token_starts)
+        size = len(token_starts)
+
+    # Shorter texts always merge back into one chunk
+    if size < chunk_size:
+        span = _strip(text, 0, len(text))
+        return [span] if span is not None else []
+
+    chunks: List[Span] = []
+    _split(text, 0, len(text), tuple(separators), chunk_size, chunk_overlap, chunks, position)
+    return chunks
+
+
+class OffsetTextSplitter:
+    """
+    Splits documents by computing chunk offsets, then slicing each chunk once.
+
+    Output matches RecursiveCharacterTextSplitter; each chunk's metadata also
+    records start_index and end_index (character offsets into the source
+    page) and document_id (the document's id, or its source when it has
+    none), next to the page number set by the PDF loader.
+
+    With a tokenizer, chunk_size and chunk_overlap count the embedding
+    model's tokens, and all pages of a call are tokenized in one batch.
+    """
+
+    def __init__(
+            self,
+            chunk_size: int = 1000,
+            chunk_overlap: int = 200,
+            workers: int = 1,
+            tokenizer: Optional['EmbeddingTokenizer'] = None
+    ):
+        """
+        Initialize the splitter.
+
+        Args:
+            chunk_size: Maximum characters (tokens with a tokenizer) per chunk
+            chunk_overlap: Maximum characters (tokens) shared by consecutive chunks
+            workers: Processes used to split documents in parallel (character
+                sizing only; batch tokenization is already multi-threaded)
+            tokenizer: Tokenizer to size chunks with
+        """
+        if chunk_overlap > chunk_size:
+            raise ValueError(f"Chunk overlap ({chunk_overlap}) must not exceed chunk size ({chunk_size})")
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.workers = max(workers, 1)
+        self.tokenizer = tokenizer
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _all_spans(self, texts: List[str]) -> List[List[Span]]:
+        """Compute the chunk spans of every text, across the worker pool if configured."""
+        spans = partial(split_spans, chunk_size=self.chunk_size, chunk_overlap=self.chunk_overlap)
+        if self.tokenizer is not None:
+            return [
+                spans(text, token_starts=starts)
+                for text, starts in zip(texts, self.tokenizer.token_starts(texts))
+            ]
+        if self.workers <= 1 or len(texts) <= 1:
+            return [spans(text) for text in texts]
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        # Only offsets travel back from the workers
+        chunksize = max(len(texts) // (4 * self.workers), 1)
+        return list(self._executor.map(spans, texts, chunksize=chunksize))
+
+    def split_documents(self, documents: Iterable[Document]) -> List[Document]:
+        """
+        Split documents into chunks.
+
+        Args:
+            documents: Documents to split; may be a generator
+
+        Returns:
+            Chunk documents in input order
+        """
+        # Read twice below, so a lazily loaded generator must be materialised
+        documents = list(documents)
+        texts = [document.page_content for document in documents]
+        chunks = []
+        for document, text, spans in zip(documents, texts, self._all_spans(texts)):
+            document_id = document.id or document.metadata.get('source')
+            for start, end in spans:
+                metadata = dict(document.metadata, start_index=start, end_index=end, document_id=document_id)
+                chunks.append(Document(page_content=text[start:end], metadata=metadata))
+        return chunks
+
+    def close(self) -> None:
+        """Shut down the worker pool, if one was started."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
@@ -0,0 +1,185 @@
+"""Policy router component."""
+import json
+import os
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+
+class PolicyRouter:
+    """
+    Routes a question to the policy documents it is most likely about.
+
+    Each indexed PDF gets a route holding its title (the file name), the
+    title's keywords and the title's embedding, all computed at index time.
+    A question is routed by keyword overlap with the titles first, then by
+    embedding similarity; when neither is confident enough, no route is
+    returned and the caller searches the whole collection.
+
+    A keyword weighs 1 / the number of titles it appears in, so a word
+    shared by several titles ("leave", "work") is weak evidence for each.
+    A keyword match needs a title scoring at least MIN_KEYWORD_SCORE and
+    no more than max_sources titles touched by the question; an embedding
+    match needs the chosen titles to beat the runner-up by min_margin.
+    """
+
+    FILENAME = 'policy_routes.json'
+    VERSION = 1
+    TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+    # Keyword score a title needs before the search is restricted to it:
+    # one keyword found in no other title, or several shared ones
+    MIN_KEYWORD_SCORE = 1.0
+
+    # Words that appear in many titles and say nothing about the topic
+    GENERIC_WORDS = frozenset(
+        "a an and anti for in of on the to policy policies employee employees management".split()
+    )
+
+    def __init__(
+            self,
+            directory: str,
+            max_sources: int = 2,
+            min_similarity: float = 0.6,
+            min_margin: float = 0.05
+    ):
+        """
+        Initialize the router.
+
+        Args:
+            directory: Directory the routes file is stored in (normally the
+                vector store persist directory)
+            max_sources: Maximum documents a question is routed to; a question
+                matching more titles equally well is searched globally
+            min_similarity: Minimum question-title cosine similarity for an
+                embedding match
+            min_margin: Minimum cosine similarity by which the matched titles
+                must beat the best title left out
+        """
+        self.path = Path(directory) / self.FILENAME
+        self.max_sources = max_sources
+        self.min_similarity = min_similarity
+        self.min_margin = min_margin
+        self.routes: Dict[str, Dict[str, Any]] = {}
+        self._matrix = None
+
+    @classmethod
+    def keywords(cls, text: str) -> List[str]:
+        """
+        Extract topic keywords, folding simple plurals.
+
+        Args:
+            text: Title or question
+
+        Returns:
+            Keywords in order of appearance
+        """
+        keywords = []
+        for term in cls.TOKEN_PATTERN.findall(text.lower()):
+            if len(term) > 4 and term.endswith('s') and not term.endswith('ss'):
+                term = term[:-1]
+            if term not in cls.GENERIC_WORDS:
+                keywords.append(term)
+        return keywords
+
+    def load(self) -> 'PolicyRouter':
+        """
+        Load the routes from disk if present.
+
+        Returns:
+            The router itself
+        """
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == self.VERSION:
+                self.routes = data.get('routes', {})
+                self._matrix = None
+        return self
+
+    def save(self) -> None:
+        """Atomically write the routes to disk."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': self.VERSION, 'routes': self.routes}, f)
+        os.replace(tmp_path, self.path)
+
+    def sync(self, sources: List[str], embedding: Embeddings) -> None:
+        """
+        Make the routes match the indexed sources.
+
+        Routes of removed sources are dropped and new sources have their
+        titles embedded in a single batched call.
+
+        Args:
+            sources: Chunk 'source' values of every indexed file
+            embedding: Embedding model used for queries
+        """
+        wanted = set(sources)
+        for source in list(self.routes):
+            if source not in wanted:
+                del self.routes[source]
+
+        new_sources = sorted(wanted.difference(self.routes))
+        if new_sources:
+            titles = [Path(source).stem for source in new_sources]
+            vectors = embedding.embed_documents(titles)
+            for source, title, vector in zip(new_sources, titles, vectors):
+                self.routes[source] = {
+                    'title': title,
+                    'keywords': sorted(set(self.keywords(title))),
+                    'embedding': [float(x) for x in vector]
+                }
+        self._matrix = None
+
+    def _title_matrix(self) -> np.ndarray:
+        """Normalised title embeddings in route order."""
+        if self._matrix is None:
+            matrix = np.asarray([route['embedding'] for route in self.routes.values()], dtype=np.float32)
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True) if len(matrix) else 1.0
+            self._matrix = matrix / np.maximum(norms, 1e-12)
+        return self._matrix
+
+    def route(self, question: str, query_embedding: Optional[List[float]] = None) -> Optional[List[str]]:
+        """
+        Pick the sources a question should be searched in.
+
+        Args:
+            question: Question string
+            query_embedding: Question embedding, enables the embedding match
+
+        Returns:
+            Sources to restrict the search to, or None to search everything
+        """
+        if not self.routes:
+            return None
+
+        sources = list(self.routes)
+
+        # Keyword match: every title the question shares a keyword with,
+        # provided there are few of them and one is specific enough
+        question_keywords = set(self.keywords(question))
+        shared = [question_keywords.intersection(self.routes[source]['keywords']) for source in sources]
+        frequency = Counter(keyword for keywords in shared for keyword in keywords)
+        scores = [sum(1.0 / frequency[keyword] for keyword in keywords) for keywords in shared]
+        matched = [source for source, score in zip(sources, scores) if score > 0]
+        if matched and max(scores) >= self.MIN_KEYWORD_SCORE and len(matched) <= self.max_sources:
+            return matched
+
+        # Embedding match: titles close enough to the question and clearly
+        # closer than the rest
+        if query_embedding is not None:
+            vector = np.asarray(query_embedding, dtype=np.float32)
+            similarities = self._title_matrix() @ (vector / max(float(np.linalg.norm(vector)), 1e-12))
+            order = np.argsort(-similarities)
+            matched = [i for i in order[:self.max_sources] if similarities[i] >= self.min_similarity]
+            runner_up = similarities[order[len(matched)]] if len(order) > len(matched) else -1.0
+            if matched and similarities[matched[-1]] - runner_up >= self.min_margin:
+                return [sources[i] for i in matched]
+
+        return None
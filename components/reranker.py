@@ -0,0 +1,111 @@
+"""Cross-encoder reranker component."""
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.documents import Document
+
+
+class Reranker:
+    """
+    Reorders retrieved chunks with a local cross-encoder.
+
+    The retriever over-fetches candidates and the cross-encoder scores every
+    (question, chunk) pair in one batched pass, keeping only the best top_k
+    for the prompt. Scores are cached per (question, chunk) in a bounded LRU,
+    so repeated questions skip the model entirely.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        """
+        Initialize the reranker. The model is loaded on first use.
+
+        Args:
+            config: Rerank configuration
+        """
+        self.model_name = config.get('model_name', 'cross-encoder/ms-marco-MiniLM-L-6-v2')
+        self.candidates = config.get('candidates', 20)
+        self.batch_size = config.get('batch_size', 32)
+        self.device = config.get('device', 'cpu')
+        self.cache_size = config.get('cache_size', 10000)
+
+        self._model = None
+        self._cache: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def model(self) -> Any:
+        """Cross-encoder model, loaded on first access."""
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    # Imported here so the pipeline does not load torch unless reranking is enabled
+                    from sentence_transformers import CrossEncoder
+                    self._model = CrossEncoder(self.model_name, device=self.device)
+        return self._model
+
+    @staticmethod
+    def _key(query: str, document: Document) -> Tuple[str, str]:
+        """Get the score cache key for a (query, chunk) pair."""
+        return query, hashlib.sha256(document.page_content.encode('utf-8')).hexdigest()
+
+    def score(self, query: str, documents: List[Document]) -> List[float]:
+        """
+        Score documents against a query, running the model only on uncached pairs.
+
+        Args:
+            query: Query string
+            documents: Candidate documents
+
+        Returns:
+            Relevance scores in document order (higher is more relevant)
+        """
+        keys = [self._key(query, document) for document in documents]
+        scores: List[Optional[float]] = [None] * len(documents)
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    scores[i] = self._cache[key]
+
+        missing = [i for i, score in enumerate(scores) if score is None]
+        with self._lock:
+            self.hits += len(documents) - len(missing)
+            self.misses += len(missing)
+        if missing:
+            predicted = self.model.predict(
+                [(query, documents[i].page_content) for i in missing],
+                batch_size=self.batch_size,
+                show_progress_bar=False
+            )
+            with self._lock:
+                for i, score in zip(missing, predicted):
+                    scores[i] = float(score)
+                    self._cache[keys[i]] = scores[i]
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        return scores
+
+    def rerank(self, query: str, documents: List[Document], top_k: int) -> List[Document]:
+        """
+        Keep the top_k documents by cross-encoder score.
+
+        Args:
+            query: Query string
+            documents: Candidate documents
+            top_k: Number of documents to keep
+
+        Returns:
+            Best documents, most relevant first
+        """
+        if not documents:
+            return []
+
+        scores = self.score(query, documents)
+        order = sorted(range(len(documents)), key=lambda i: scores[i], reverse=True)
+        return [documents[i] for i in order[:top_k]]
@@ -1,27 +1,48 @@
 """Retriever component."""
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional
 from langchain_core.documents import Document
 from langchain_core.vectorstores import VectorStore
 
+from components.bm25_index import BM25Index
+from components.cached_embeddings import embed_queries
+
 
 class Retriever:
     """Handles document retrieval from vector store."""
 
-    def __init__(self, vectorstore: VectorStore, config: Dict[str, Any]):
+    def __init__(
+            self,
+            vectorstore: VectorStore,
+            config: Dict[str, Any],
+            lexical_index: Optional[BM25Index] = None
+    ):
         """
         Initialize the retriever.
 
         Args:
             vectorstore: Vector store instance
             config: Retrieval configuration
+            lexical_index: BM25 index over the same chunks, required for the
+                hybrid search type
+
+        Raises:
+            ValueError: If hybrid search is configured without a lexical index
         """
         self.vectorstore = vectorstore
         self.top_k = config.get('top_k', 4)
         self.search_type = config.get('search_type', 'similarity')
+        self.lexical_index = lexical_index
+        self.hybrid_candidates = max(config.get('hybrid_candidates', 20), self.top_k)
+        self.rrf_k = config.get('rrf_k', 60)
+
+        if self.search_type == 'hybrid' and lexical_index is None:
+            raise ValueError("Hybrid search requires a lexical index")
 
+        # Hybrid search fuses a wider similarity search with BM25
         self.retriever = self.vectorstore.as_retriever(
-            search_type=self.search_type,
-            search_kwargs={'k': self.top_k}
+            search_type='similarity' if self.search_type == 'hybrid' else self.search_type,
+            search_kwargs={'k': self.hybrid_candidates if self.search_type == 'hybrid' else self.top_k}
         )
 
     def retrieve(self, query: str) -> List[Document]:
@@ -35,4 +56,263 @@ class Retriever:
             List of relevant Document objects
         """
         documents = self.retriever.invoke(query)
-        return documents
\ No newline at end of file
+        if self.search_type == 'hybrid':
+            return self._fuse(query, documents)
+        return documents
+
+    @staticmethod
+    def _search_kwargs(sources: Optional[List[str]]) -> Dict[str, Any]:
+        """Build the vector store filter restricting a search to some sources."""
+        if not sources:
+            return {}
+        return {'filter': {'source': {'$in': list(sources)}}}
+
+    @staticmethod
+    def _document_key(document: Document) -> tuple:
+        """Identify a chunk across vector and lexical results."""
+        return document.metadata.get('source'), document.metadata.get('page'), document.page_content
+
+    def _fuse(
+            self,
+            query: str,
+            vector_documents: List[Document],
+            sources: Optional[List[str]] = None
+    ) -> List[Document]:
+        """
+        Combine vector and BM25 rankings with reciprocal rank fusion.
+
+        Each chunk scores the sum of 1 / (rrf_k + rank) over the rankings it
+        appears in, so chunks found by both searches rise to the top without
+        having to calibrate cosine against BM25 scores.
+
+        Args:
+            query: Query string for the lexical search
+            vector_documents: Vector search results, best first
+            sources: Sources the lexical search is restricted to
+
+        Returns:
+            The top_k fused documents
+        """
+        lexical_documents = [
+            document for document, _ in self.lexical_index.search(query, k=self.hybrid_candidates, sources=sources)
+        ]
+
+        scores: Dict[tuple, float] = {}
+        documents: Dict[tuple, Document] = {}
+        for ranking in (vector_documents, lexical_documents):
+            for rank, document in enumerate(ranking, start=1):
+                key = self._document_key(document)
+                scores[key] = scores.get(key, 0.0) + 1.0 / (self.rrf_k + rank)
+                documents.setdefault(key, document)
+
+        ranked = sorted(scores, key=scores.get, reverse=True)
+        return [documents[key] for key in ranked[:self.top_k]]
+
+    def embed_query(self, query: str) -> List[float]:
+        """
+        Embed a query with the vector store's embedding model.
+
+        Args:
+            query: Query string
+
+        Returns:
+            Query embedding vector
+        """
+        return self.vectorstore.embeddings.embed_query(query)
+
+    def retrieve_by_vector(
+            self,
+            embedding: List[float],
+            query: Optional[str] = None,
+            sources: Optional[List[str]] = None
+    ) -> List[Document]:
+        """
+        Retrieve relevant documents for an already embedded query.
+
+        Splitting embedding from search lets callers embed a question once
+        and time the two stages separately.
+
+        Args:
+            embedding: Query embedding vector
+            query: Query string, required for hybrid search
+            sources: Only search chunks whose 'source' metadata is one of these
+
+        Returns:
+            List of relevant Document objects
+
+        Raises:
+            ValueError: If the configured search type cannot search by vector
+        """
+        kwargs = self._search_kwargs(sources)
+        if self.search_type == 'hybrid':
+            documents = self.vectorstore.similarity_search_by_vector(embedding, k=self.hybrid_candidates, **kwargs)
+            return self._fuse(query or '', documents, sources)
+        elif self.search_type == 'similarity':
+            return self.vectorstore.similarity_search_by_vector(embedding, k=self.top_k, **kwargs)
+        elif self.search_type == 'mmr':
+            return self.vectorstore.max_marginal_relevance_search_by_vector(embedding, k=self.top_k, **kwargs)
+        else:
+            raise ValueError(f"Search type does not support vector search: {self.search_type}")
+
+    def best_relevance(self, embedding: List[float], sources: Optional[List[str]] = None) -> Optional[float]:
+        """
+        Score the chunk closest to an embedding, optionally among some sources.
+
+        Scores are the vector store's relevance scores (higher is more
+        relevant, about 0 to 1), so one threshold works for stores that
+        rank by cosine similarity and by L2 distance alike.
+
+        Args:
+            embedding: Query embedding vector
+            sources: Only consider chunks whose 'source' metadata is one of these
+
+        Returns:
+            Relevance of the best chunk, 0.0 if no chunk matches, or None if
+            the vector store cannot score its results
+        """
+        kwargs = self._search_kwargs(sources)
+        try:
+            relevance = self.vectorstore._select_relevance_score_fn()
+        except NotImplementedError:
+            return None
+
+        if hasattr(self.vectorstore, 'similarity_search_with_score_by_vector'):
+            results = self.vectorstore.similarity_search_with_score_by_vector(embedding, k=1, **kwargs)
+        elif hasattr(self.vectorstore, 'similarity_search_by_vector_with_relevance_scores'):
+            # Chroma's by-vector search returns raw distances despite its name
+            results = self.vectorstore.similarity_search_by_vector_with_relevance_scores(embedding, k=1, **kwargs)
+        else:
+            return None
+        return relevance(results[0][1]) if results else 0.0
+
+    def embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """
+        Embed many queries, each distinct query once.
+
+        Queries are embedded as queries, not documents, so the vectors match
+        retrieve() for models that embed the two differently, in one model
+        call where the model allows it (see embed_queries). A cached
+        embedding model looks the whole batch up at once.
+
+        Args:
+            queries: Query strings
+
+        Returns:
+            Query embedding vectors in input order
+        """
+        distinct = list(dict.fromkeys(queries))
+        by_query = dict(zip(distinct, embed_queries(self.vectorstore.embeddings, distinct)))
+        return [by_query[query] for query in queries]
+
+    def retrieve_by_vectors(
+            self,
+            embeddings: List[List[float]],
+            max_workers: int = 8,
+            queries: Optional[List[str]] = None,
+            sources: Optional[List[Optional[List[str]]]] = None
+    ) -> List[List[Document]]:
+        """
+        Retrieve relevant documents for many embedded queries together.
+
+        Stores with a native batch search score all queries at once; for the
+        others, searches run concurrently on a thread pool, which overlaps
+        them for vector stores whose search releases the GIL.
+
+        Args:
+            embeddings: Query embedding vectors
+            max_workers: Maximum concurrent searches
+            queries: Query strings in the same order, required for hybrid search
+            sources: Per-query source restrictions (None entries search everything)
+
+        Returns:
+            One list of relevant Document objects per query, in input order
+        """
+        queries = queries or [None] * len(embeddings)
+        sources = sources or [None] * len(embeddings)
+        filtered = any(sources)
+
+        if (
+                not filtered
+                and self.search_type in ('similarity', 'hybrid')
+                and hasattr(self.vectorstore, 'similarity_search_by_vectors')
+        ):
+            # Stores that can score all queries in one matrix product
+            if self.search_type == 'similarity':
+                return self.vectorstore.similarity_search_by_vectors(embeddings, k=self.top_k)
+            candidates = self.vectorstore.similarity_search_by_vectors(embeddings, k=self.hybrid_candidates)
+            return [self._fuse(query or '', documents) for query, documents in zip(queries, candidates)]
+
+        if len(embeddings) <= 1:
+            return [self.retrieve_by_vector(*args) for args in zip(embeddings, queries, sources)]
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(embeddings)))) as executor:
+            return list(executor.map(self.retrieve_by_vector, embeddings, queries, sources))
+
+    async def aretrieve(self, query: str) -> List[Document]:
+        """
+        Asynchronously retrieve relevant documents for a query.
+
+        Args:
+            query: Query string
+
+        Returns:
+            List of relevant Document objects
+        """
+        documents = await self.retriever.ainvoke(query)
+        if self.search_type == 'hybrid':
+            return self._fuse(query, documents)
+        return documents
+
+    async def aembed_query(self, query: str) -> List[float]:
+        """
+        Asynchronously embed a query with the vector store's embedding model.
+
+        Args:
+            query: Query string
+
+        Returns:
+            Query embedding vector
+        """
+        return await self.vectorstore.embeddings.aembed_query(query)
+
+    async def aretrieve_by_vector(
+            self,
+            embedding: List[float],
+            query: Optional[str] = None,
+            sources: Optional[List[str]] = None
+    ) -> List[Document]:
+        """
+        Asynchronously retrieve relevant documents for an embedded query.
+
+        Args:
+            embedding: Query embedding vector
+            query: Query string, required for hybrid search
+            sources: Only search chunks whose 'source' metadata is one of these
+
+        Returns:
+            List of relevant Document objects
+
+        Raises:
+            ValueError: If the configured search type cannot search by vector
+        """
+        kwargs = self._search_kwargs(sources)
+        if self.search_type == 'hybrid':
+            documents = await self.vectorstore.asimilarity_search_by_vector(
+                embedding, k=self.hybrid_candidates, **kwargs
+            )
+            return self._fuse(query or '', documents, sources)
+        elif self.search_type == 'similarity':
+            return await self.vectorstore.asimilarity_search_by_vector(embedding, k=self.top_k, **kwargs)
+        elif self.search_type == 'mmr':
+            return await self.vectorstore.amax_marginal_relevance_search_by_vector(
+                embedding, k=self.top_k, **kwargs
+            )
+        else:
+            raise ValueError(f"Search type does not support vector search: {self.search_type}")
+
+    def supports_vector_search(self) -> bool:
+        """Check whether queries can be embedded once and searched by vector."""
+        return (
+            self.search_type in ('similarity', 'mmr', 'hybrid')
+            and self.vectorstore.embeddings is not None
+        )
@@ -1,41 +1,102 @@
 """Text splitting component."""
-from typing import List, Dict, Any
+from typing import Iterable, List, Dict, Any, Optional
 from langchain_core.documents import Document
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
+from components.embedding_tokenizer import EmbeddingTokenizer
+from components.offset_splitter import OffsetTextSplitter
+from utils.config_types import SplitterMode
+from utils.metrics import get_metrics
+
 
 class TextSplitter:
     """Handles splitting documents into chunks."""
 
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], embedding_config: Optional[Dict[str, Any]] = None):
         """
         Initialize the text splitter.
 
         Args:
             config: Document processing configuration
+            embedding_config: Embedding configuration; token mode sizes chunks
+                with this model's tokenizer, and the other modes use it to
+                report truncated chunks
+
+        Raises:
+            ValueError: If the mode is unknown, or token mode has no local
+                embedding model to take the tokenizer from
         """
         self.chunk_size = config.get('chunk_size', 1000)
         self.chunk_overlap = config.get('chunk_overlap', 200)
+        self.mode = config.get('splitter_mode', SplitterMode.RECURSIVE).lower()
+        self.embedding_config = embedding_config or {}
+        self._tokenizer: Optional[EmbeddingTokenizer] = None
+        self._tokenizer_loaded = False
 
-        self.splitter = RecursiveCharacterTextSplitter(
-            chunk_size=self.chunk_size,
-            chunk_overlap=self.chunk_overlap,
-            length_function=len,
-            is_separator_regex=False
-        )
+        if self.mode == SplitterMode.TOKEN:
+            self._tokenizer = EmbeddingTokenizer.from_config(self.embedding_config)
+            self._tokenizer_loaded = True
+            # Cap chunks at what the embedding model reads
+            limit = self._tokenizer.max_content_tokens
+            self.chunk_size = min(config.get('token_chunk_size') or limit, limit)
+            self.chunk_overlap = min(config.get('token_chunk_overlap', 50), self.chunk_size // 2)
+            self.splitter = OffsetTextSplitter(
+                chunk_size=self.chunk_size,
+                chunk_overlap=self.chunk_overlap,
+                tokenizer=self._tokenizer
+            )
+        elif self.mode == SplitterMode.OFFSET:
+            # Same chunks, computed as offsets; also records where each chunk came from
+            self.splitter = OffsetTextSplitter(
+                chunk_size=self.chunk_size,
+                chunk_overlap=self.chunk_overlap,
+                workers=config.get('split_workers', 1)
+            )
+        elif self.mode == SplitterMode.RECURSIVE:
+            self.splitter = RecursiveCharacterTextSplitter(
+                chunk_size=self.chunk_size,
+                chunk_overlap=self.chunk_overlap,
+                length_function=len,
+                is_separator_regex=False
+            )
+        else:
+            raise ValueError(f"Unsupported splitter mode: {self.mode}")
 
-    def split_documents(self, documents: List[Document]) -> List[Document]:
+    def split_documents(self, documents: Iterable[Document]) -> List[Document]:
         """
         Split documents into chunks.
 
         Args:
-            documents: List of Document objects to split
+            documents: Document objects to split, as a list or a generator
+                such as DocumentLoader.load_directory
 
         Returns:
             List of split Document objects
         """
+        documents = list(documents)
         if not documents:
             return []
 
-        split_docs = self.splitter.split_documents(documents)
-        return split_docs
\ No newline at end of file
+        metrics = get_metrics()
+        with metrics.timer('rag_split_seconds'):
+            split_docs = self.splitter.split_documents(documents)
+        metrics.inc('rag_chunks_total', len(split_docs))
+        return split_docs
+
+    @property
+    def tokenizer(self) -> Optional[EmbeddingTokenizer]:
+        """
+        Tokenizer of the embedding model, loaded on first use.
+
+        Returns:
+            The tokenizer, or None if the embedding model has none locally
+        """
+        if not self._tokenizer_loaded:
+            self._tokenizer_loaded = True
+            try:
+                self._tokenizer = EmbeddingTokenizer.from_config(self.embedding_config)
+            except ValueError:
+                pass
+            except Exception as e:
+                print(f"Warning: Could not load the embedding tokenizer, not checking chunk lengths: {e}")
+        return self._tokenizer
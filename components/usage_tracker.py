@@ -0,0 +1,53 @@
+"""LLM token usage tracker component."""
+import threading
+from typing import Any, Dict, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import AIMessage
+from langchain_core.messages.ai import UsageMetadata, add_usage
+from langchain_core.outputs import ChatGeneration, LLMResult
+
+
+class UsageTracker(BaseCallbackHandler):
+    """
+    Callback handler that records the token usage of LLM calls.
+
+    Pass a fresh tracker in the callbacks of one request to get that
+    request's input, output and prompt cache token counts. Works for both
+    invoked and streamed calls, as long as the provider reports usage.
+    """
+
+    def __init__(self):
+        """Initialize the tracker."""
+        super().__init__()
+        self._usage: Optional[UsageMetadata] = None
+        self._lock = threading.Lock()
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        """Add the usage reported with a finished LLM call."""
+        for generations in response.generations:
+            for generation in generations:
+                if not isinstance(generation, ChatGeneration) or not isinstance(generation.message, AIMessage):
+                    continue
+                usage = generation.message.usage_metadata
+                if usage:
+                    with self._lock:
+                        self._usage = add_usage(self._usage, usage)
+
+    def summary(self) -> Optional[Dict[str, int]]:
+        """
+        Get the recorded token counts.
+
+        Returns:
+            Dictionary with input_tokens, output_tokens, cache_read_tokens and
+            cache_creation_tokens, or None if the provider reported no usage
+        """
+        if self._usage is None:
+            return None
+        details = self._usage.get('input_token_details') or {}
+        return {
+            'input_tokens': self._usage.get('input_tokens', 0),
+            'output_tokens': self._usage.get('output_tokens', 0),
+            'cache_read_tokens': details.get('cache_read', 0),
+            'cache_creation_tokens': details.get('cache_creation', 0)
+        }
@@ -0,0 +1,61 @@
+"""
+Shared fixtures for tests that build a RAGPipeline without reaching a provider.
+"""
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from components.numpy_store import NumpyVectorStore
+from rag.rag_pipeline import RAGPipeline
+
+POLICY_TEXTS = [
+    "Employees get twenty days of paid leave.",
+    "Gratuity needs five years of service.",
+    "Travel claims are filed within thirty days."
+]
+
+
+@pytest.fixture
+def pipeline_env(monkeypatch, tmp_path):
+    """
+    Configure providers with placeholder keys and keep the index under tmp_path.
+
+    Returns:
+        Function that sets further environment variables, for per-test overrides
+    """
+    env = {
+        'LLM_TYPE': 'anthropic',
+        'ANTHROPIC_API_KEY': 'test-key',
+        'EMBEDDING_TYPE': 'openai',
+        'OPENAI_API_KEY': 'test-key',
+        'SYSTEM_PROMPT': "Answer from the context.",
+        'VECTORSTORE_PERSIST_DIRECTORY': str(tmp_path / 'index'),
+    }
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+
+    def override(**variables):
+        for name, value in variables.items():
+            monkeypatch.setenv(name, str(value))
+
+    return override
+
+
+@pytest.fixture
+def make_pipeline(pipeline_env):
+    """
+    Build pipelines over an in-memory store of a few policy sentences.
+
+    Returns:
+        Function taking an optional LLM, an optional embedding model (a
+        deterministic fake by default) and environment overrides
+    """
+    def make(llm=None, embedding=None, **env):
+        pipeline_env(**env)
+        pipeline = RAGPipeline()
+        if llm is not None:
+            pipeline.llm = llm
+        pipeline.vectorstore = NumpyVectorStore(embedding or DeterministicFakeEmbedding(size=16))
+        pipeline.vectorstore.add_texts(POLICY_TEXTS)
+        return pipeline
+
+    return make
@@ -1,10 +1,20 @@
 """Embedding Factory implementation."""
-from typing import Any, Dict
-from langchain_openai import OpenAIEmbeddings
-from langchain_huggingface import HuggingFaceEmbeddings
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
 from .base_factory import BaseFactory
+from components.cached_embeddings import CachedEmbeddings
+from components.concurrent_embeddings import ConcurrentEmbeddings
 from utils.config_types import EmbeddingModelType
 
+if TYPE_CHECKING:
+    from langchain_huggingface import HuggingFaceEmbeddings
+    from langchain_openai import OpenAIEmbeddings
+
+# torch's intra-op thread count is process-wide; this is its value before any
+# model changed it, restored for models configured with num_threads 0
+_default_torch_threads: Optional[int] = None
+
+
 class EmbeddingFactory(BaseFactory):
     """Factory for creating embedding model instances."""
 
@@ -16,7 +26,8 @@ class EmbeddingFactory(BaseFactory):
             config: Embedding configuration dictionary
 
         Returns:
-            Embedding model instance
+            Embedding model instance, wrapped in a persistent cache when
+            cache_enabled is set
 
         Raises:
             ValueError: If unsupported embedding type is specified
@@ -24,36 +35,181 @@ class EmbeddingFactory(BaseFactory):
         embedding_type = config.get('type', '').lower()
 
         if embedding_type == EmbeddingModelType.OPENAI:
-            return self._create_openai_embedding(config)
+            embedding = self._create_openai_embedding(config)
         elif embedding_type == EmbeddingModelType.HUGGINGFACE:
-            return self._create_huggingface_embedding(config)
+            embedding = self._create_huggingface_embedding(config)
+        elif embedding_type == EmbeddingModelType.ONNX:
+            embedding = self._create_onnx_embedding(config)
         else:
             raise ValueError(f"Unsupported embedding type: {embedding_type}")
 
-    def _create_openai_embedding(self, config: Dict[str, Any]) -> OpenAIEmbeddings:
+        if config.get('cache_enabled'):
+            return self._create_cached_embedding(config, embedding)
+        return embedding
+
+    @staticmethod
+    def cache_namespace(config: Dict[str, Any]) -> str:
+        """
+        Name the vector space an embedding configuration produces.
+
+        Args:
+            config: Embedding configuration
+
+        Returns:
+            Type and model name, plus the settings that change the vectors
+        """
+        namespace = f"{config.get('type')}:{config.get('model_name')}"
+        if config.get('type', '').lower() == EmbeddingModelType.ONNX and config.get('onnx_quantization'):
+            namespace += f":qint8_{config.get('onnx_quantization')}"
+        if config.get('normalize'):
+            namespace += ":normalized"
+        return namespace
+
+    def _create_cached_embedding(self, config: Dict[str, Any], embedding: Any) -> CachedEmbeddings:
+        """
+        Wrap an embedding instance with the persistent embedding cache.
+
+        Args:
+            config: Embedding configuration
+            embedding: Embedding model instance to wrap
+
+        Returns:
+            CachedEmbeddings instance
+        """
+        return CachedEmbeddings(
+            embedding,
+            # Normalised vectors differ, so they get their own namespace
+            model_name=self.cache_namespace(config),
+            cache_dir=config.get('cache_dir'),
+            memory_size=config.get('cache_memory_size', 10000)
+        )
+
+    def _create_openai_embedding(self, config: Dict[str, Any]) -> Any:
         """
         Create an OpenAI embedding instance.
 
+        batch_size sets the texts sent per request (0 keeps the client
+        default of 1000). With max_concurrency above 1, bulk embedding sends
+        that many requests at once.
+
         Args:
             config: OpenAI embedding configuration
 
         Returns:
-            OpenAIEmbeddings instance
+            OpenAIEmbeddings instance, wrapped in ConcurrentEmbeddings when
+            max_concurrency is above 1
         """
-        return OpenAIEmbeddings(
-            model=config.get('model_name')
+        # Provider SDKs are imported only when selected; langchain_huggingface
+        # alone pulls in torch and transformers
+        from langchain_openai import OpenAIEmbeddings
+
+        batch_size = config.get('batch_size') or 1000
+        embedding = OpenAIEmbeddings(
+            model=config.get('model_name'),
+            chunk_size=batch_size
         )
 
-    def _create_huggingface_embedding(self, config: Dict[str, Any]) -> HuggingFaceEmbeddings:
+        if config.get('max_concurrency', 1) > 1:
+            return ConcurrentEmbeddings(embedding, batch_size, config.get('max_concurrency'))
+        return embedding
+
+    def _create_huggingface_embedding(self, config: Dict[str, Any]) -> 'HuggingFaceEmbeddings':
         """
         Create a Hugging Face embedding instance.
 
         Args:
-            config: Hugging Face embedding configuration
+            config: Hugging Face embedding configuration. batch_size 0 keeps
+                the sentence-transformers default of 32, and num_threads 0
+                uses torch's default intra-op thread count. The thread count
+                is process-wide, so it applies to every torch model.
 
         Returns:
             HuggingFaceEmbeddings instance
         """
+        import torch
+        from langchain_huggingface import HuggingFaceEmbeddings
+
+        global _default_torch_threads
+        if _default_torch_threads is None:
+            _default_torch_threads = torch.get_num_threads()
+        torch.set_num_threads(config.get('num_threads') or _default_torch_threads)
+
+        return HuggingFaceEmbeddings(
+            model_name=config.get('model_name'),
+            model_kwargs={'device': config.get('device', 'cpu')},
+            encode_kwargs={
+                'batch_size': config.get('batch_size') or 32,
+                'normalize_embeddings': config.get('normalize', False)
+            }
+        )
+
+    def _create_onnx_embedding(self, config: Dict[str, Any]) -> 'HuggingFaceEmbeddings':
+        """
+        Create a sentence-transformer embedding instance running on ONNX Runtime.
+
+        The configured model is exported to ONNX once (int8-quantized when
+        onnx_quantization is set) and loaded from onnx_export_dir afterwards.
+        Requires the sentence-transformers ONNX extra
+        (pip install "sentence-transformers[onnx]").
+
+        Args:
+            config: Embedding configuration. onnx_quantization is one of
+                arm64, avx2, avx512 or avx512_vnni (empty for float32), and
+                num_threads sets ONNX Runtime's intra-op thread count.
+
+        Returns:
+            HuggingFaceEmbeddings instance backed by ONNX Runtime
+        """
+        from langchain_huggingface import HuggingFaceEmbeddings
+
+        model_path, file_name = self._export_onnx_model(config)
+
+        onnx_kwargs: Dict[str, Any] = {'file_name': file_name, 'provider': 'CPUExecutionProvider'}
+        if config.get('num_threads'):
+            import onnxruntime
+            session_options = onnxruntime.SessionOptions()
+            session_options.intra_op_num_threads = config.get('num_threads')
+            onnx_kwargs['session_options'] = session_options
+
         return HuggingFaceEmbeddings(
-            model_name=config.get('model_name')
-        )
\ No newline at end of file
+            model_name=model_path,
+            model_kwargs={'device': 'cpu', 'backend': 'onnx', 'model_kwargs': onnx_kwargs},
+            encode_kwargs={
+                'batch_size': config.get('batch_size') or 32,
+                'normalize_embeddings': config.get('normalize', False)
+            }
+        )
+
+    @staticmethod
+    def _export_onnx_model(config: Dict[str, Any]) -> Tuple[str, str]:
+        """
+        Export the configured sentence-transformer to ONNX unless already done.
+
+        Args:
+            config: Embedding configuration
+
+        Returns:
+            Local model directory and the ONNX file to load, relative to it
+        """
+        quantization = config.get('onnx_quantization')
+        model_dir = Path(config.get('onnx_export_dir', './indexes/onnx_models')) / (
+            config.get('model_name', '').replace('/', '--')
+        )
+        file_name = f"onnx/model_qint8_{quantization}.onnx" if quantization else "onnx/model.onnx"
+
+        if not (model_dir / file_name).exists():
+            from sentence_transformers import SentenceTransformer
+
+            print(f"Exporting {config.get('model_name')} to ONNX in {model_dir}...")
+            # Loads the hub's ONNX weights, or converts the PyTorch weights
+            model = SentenceTransformer(config.get('model_name'), device='cpu', backend='onnx')
+            model.save(str(model_dir))
+            if not (model_dir / 'onnx' / 'model.onnx').exists():
+                (model_dir / 'onnx').mkdir(parents=True, exist_ok=True)
+                (model_dir / 'model.onnx').replace(model_dir / 'onnx' / 'model.onnx')
+
+            if quantization:
+                from sentence_transformers import export_dynamic_quantized_onnx_model
+                export_dynamic_quantized_onnx_model(model, quantization, str(model_dir))
+
+        return str(model_dir), file_name
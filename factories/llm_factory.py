@@ -1,11 +1,13 @@
 """LLM Factory implementation."""
 import os
-from typing import Any, Dict
-from langchain_openai import ChatOpenAI
-from langchain_anthropic import ChatAnthropic
+from typing import TYPE_CHECKING, Any, Dict
 from .base_factory import BaseFactory
 from utils.config_types import LLMType
 
+if TYPE_CHECKING:
+    from langchain_anthropic import ChatAnthropic
+    from langchain_openai import ChatOpenAI
+
 class LLMFactory(BaseFactory):
     """Factory for creating LLM instances."""
 
@@ -31,7 +33,7 @@ class LLMFactory(BaseFactory):
         else:
             raise ValueError(f"Unsupported LLM type: {llm_type}")
 
-    def _create_openai_llm(self, config: Dict[str, Any]) -> ChatOpenAI:
+    def _create_openai_llm(self, config: Dict[str, Any]) -> 'ChatOpenAI':
         """
         Create an OpenAI LLM instance.
 
@@ -41,13 +43,19 @@ class LLMFactory(BaseFactory):
         Returns:
             ChatOpenAI instance
         """
+        # Provider SDKs are imported only when selected to keep startup fast
+        from langchain_openai import ChatOpenAI
+
         return ChatOpenAI(
             model=config.get('model_name'),
             temperature=config.get('temperature'),
-            max_tokens=config.get('max_tokens')
+            max_tokens=config.get('max_tokens'),
+            base_url=config.get('base_url') or None,
+            # Report token usage, including cached prompt tokens, when streaming
+            stream_usage=True
         )
 
-    def _create_anthropic_llm(self, config: Dict[str, Any]) -> ChatAnthropic:
+    def _create_anthropic_llm(self, config: Dict[str, Any]) -> 'ChatAnthropic':
         """
         Create an Anthropic LLM instance.
 
@@ -57,8 +65,16 @@ class LLMFactory(BaseFactory):
         Returns:
             ChatAnthropic instance
         """
+        from langchain_anthropic import ChatAnthropic
+
+        kwargs = {}
+        if config.get('base_url'):
+            kwargs['base_url'] = config.get('base_url')
+
         return ChatAnthropic(
             model=config.get('model_name'),
             temperature=config.get('temperature'),
-            max_tokens=config.get('max_tokens')
+            max_tokens=config.get('max_tokens'),
+            stream_usage=True,
+            **kwargs
         )
\ No newline at end of file
@@ -1,12 +1,16 @@
 """Vector Store Factory implementation."""
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 from pathlib import Path
-from langchain_community.vectorstores import Chroma
 from langchain_core.documents import Document
 from langchain_core.embeddings import Embeddings
 from .base_factory import BaseFactory
 from utils.config_types import VectorDBType
 
+if TYPE_CHECKING:
+    from langchain_community.vectorstores import Chroma
+    from components.faiss_store import MmapFAISS
+    from components.numpy_store import NumpyVectorStore
+
 class VectorStoreFactory(BaseFactory):
     """Factory for creating vector store instances."""
 
@@ -14,7 +18,8 @@ class VectorStoreFactory(BaseFactory):
             self,
             config: Dict[str, Any],
             embedding: Embeddings,
-            documents: Optional[List[Document]] = None
+            documents: Optional[List[Document]] = None,
+            read_only: bool = False
     ) -> Any:
         """
         Create a vector store instance based on configuration.
@@ -23,6 +28,8 @@ class VectorStoreFactory(BaseFactory):
             config: Vector store configuration dictionary
             embedding: Embedding model instance
             documents: Optional list of documents to add to the vector store
+            read_only: Open the store for querying only, which lets backends
+                memory-map their index
 
         Returns:
             Vector store instance
@@ -34,6 +41,10 @@ class VectorStoreFactory(BaseFactory):
 
         if vectorstore_type == VectorDBType.CHROMA:
             return self._create_chroma_vectorstore(config, embedding, documents)
+        elif vectorstore_type == VectorDBType.FAISS:
+            return self._create_faiss_vectorstore(config, embedding, documents, read_only)
+        elif vectorstore_type == VectorDBType.NUMPY:
+            return self._create_numpy_vectorstore(config, embedding, documents, read_only)
         else:
             raise ValueError(f"Unsupported vector store type: {vectorstore_type}")
 
@@ -42,7 +53,7 @@ class VectorStoreFactory(BaseFactory):
             config: Dict[str, Any],
             embedding: Embeddings,
             documents: Optional[List[Document]] = None
-    ) -> Chroma:
+    ) -> 'Chroma':
         """
         Create a Chroma vector store instance.
 
@@ -54,6 +65,9 @@ class VectorStoreFactory(BaseFactory):
         Returns:
             Chroma instance
         """
+        # Backends are imported only when selected to keep startup fast
+        from langchain_community.vectorstores import Chroma
+
         persist_directory = config.get('persist_directory')
         collection_name = config.get('collection_name')
 
@@ -76,4 +90,125 @@ class VectorStoreFactory(BaseFactory):
                 collection_name=collection_name
             )
 
-        return vectorstore
\ No newline at end of file
+        return vectorstore
+
+    def _create_faiss_vectorstore(
+            self,
+            config: Dict[str, Any],
+            embedding: Embeddings,
+            documents: Optional[List[Document]] = None,
+            read_only: bool = False
+    ) -> 'MmapFAISS':
+        """
+        Create a FAISS vector store instance.
+
+        Args:
+            config: FAISS configuration
+            embedding: Embedding model instance
+            documents: Optional list of documents to add
+            read_only: Memory-map the persisted index
+
+        Returns:
+            MmapFAISS instance
+        """
+        from components.faiss_store import MmapFAISS
+
+        persist_directory = config.get('persist_directory')
+        index_name = config.get('collection_name')
+
+        if MmapFAISS.exists(persist_directory, index_name):
+            vectorstore = MmapFAISS.load(persist_directory, index_name, embedding, config, read_only=read_only)
+        else:
+            vectorstore = MmapFAISS.create_empty(embedding, config)
+
+        if documents:
+            vectorstore.add_documents(documents)
+            vectorstore.save(persist_directory, index_name)
+
+        return vectorstore
+
+    def _create_numpy_vectorstore(
+            self,
+            config: Dict[str, Any],
+            embedding: Embeddings,
+            documents: Optional[List[Document]] = None,
+            read_only: bool = False
+    ) -> 'NumpyVectorStore':
+        """
+        Create an in-process NumPy vector store instance.
+
+        Args:
+            config: NumPy store configuration
+            embedding: Embedding model instance
+            documents: Optional list of documents to add
+            read_only: Memory-map the persisted matrix
+
+        Returns:
+            NumpyVectorStore instance
+        """
+        from components.numpy_store import NumpyVectorStore
+
+        persist_directory = config.get('persist_directory')
+        name = config.get('collection_name')
+
+        if NumpyVectorStore.exists(persist_directory, name):
+            vectorstore = NumpyVectorStore.load(
+                persist_directory, name, embedding,
+                mmap=read_only and config.get('mmap', True)
+            )
+        else:
+            vectorstore = NumpyVectorStore(embedding)
+
+        if documents:
+            vectorstore.add_documents(documents)
+            vectorstore.save(persist_directory, name)
+
+        return vectorstore
+
+    def requires_persist(self, config: Dict[str, Any]) -> bool:
+        """
+        Check whether a vector store must be persisted explicitly after writes.
+
+        Args:
+            config: Vector store configuration dictionary
+
+        Returns:
+            True if persist() must be called for writes to reach disk
+        """
+        return config.get('type', '').lower() in (VectorDBType.FAISS, VectorDBType.NUMPY)
+
+    def persist(self, config: Dict[str, Any], vectorstore: Any) -> None:
+        """
+        Write a vector store to disk if the backend does not do so itself.
+
+        Args:
+            config: Vector store configuration dictionary
+            vectorstore: Vector store instance
+        """
+        if config.get('type', '').lower() in (VectorDBType.FAISS, VectorDBType.NUMPY):
+            vectorstore.save(config.get('persist_directory'), config.get('collection_name'))
+
+    def reset(self, config: Dict[str, Any], embedding: Embeddings) -> Any:
+        """
+        Drop all persisted data and return an empty vector store.
+
+        Args:
+            config: Vector store configuration dictionary
+            embedding: Embedding model instance
+
+        Returns:
+            Empty vector store instance
+        """
+        vectorstore_type = config.get('type', '').lower()
+
+        if vectorstore_type == VectorDBType.FAISS:
+            from components.faiss_store import MmapFAISS
+            MmapFAISS.remove(config.get('persist_directory'), config.get('collection_name'))
+        elif vectorstore_type == VectorDBType.NUMPY:
+            from components.numpy_store import NumpyVectorStore
+            NumpyVectorStore.remove(config.get('persist_directory'), config.get('collection_name'))
+        else:
+            vectorstore = self.create(config, embedding)
+            vectorstore.delete_collection()
+
+        return self.create(config, embedding)
@@ -1,16 +1,20 @@
 """Main CLI entry point for RAG application."""
 import argparse
 import sys
+import time
 from pathlib import Path
 from dotenv import load_dotenv
 
-from rag.rag_pipeline import RAGPipeline
+from utils.batch_io import read_questions, write_results
 
 def index_command(args):
     """Handle index command."""
     try:
+        # Imported here so '--help' and argument errors don't load the ML stack
+        from rag.rag_pipeline import RAGPipeline
+
         pipeline = RAGPipeline(args.config)
-        pipeline.index_documents(args.path)
+        pipeline.index_documents(args.path, full=args.full)
         print("\n✓ Documents indexed successfully!")
     except Exception as e:
         print(f"\n✗ Error indexing documents: {e}", file=sys.stderr)
@@ -20,12 +24,29 @@ def index_command(args):
 def query_command(args):
     """Handle query command."""
     try:
+        from rag.rag_pipeline import RAGPipeline
+
         pipeline = RAGPipeline(args.config)
 
         # Load existing vector store
         pipeline.load_vectorstore()
 
-        if args.interactive:
+        if args.batch:
+            # Batch mode
+            questions = read_questions(args.batch)
+            print(f"Answering {len(questions)} question(s) from {args.batch}...")
+
+            start = time.perf_counter()
+            results = pipeline.batch_query(questions, max_concurrency=args.concurrency)
+            elapsed = time.perf_counter() - start
+
+            write_results(args.output, results)
+            print(f"\n✓ Wrote {len(results)} answer(s) to {args.output} in {elapsed:.2f}s")
+            failed = sum(1 for result in results if result.get('error') is not None)
+            if failed:
+                print(f"✗ {failed} question(s) failed; see the 'error' field in {args.output}", file=sys.stderr)
+
+        elif args.interactive:
             # Interactive mode
             print("\n=== RAG Interactive Query Mode ===")
             print("Type 'exit' or 'quit' to exit\n")
@@ -42,13 +63,18 @@ def query_command(args):
                         continue
 
                     print("\nSearching and generating answer...\n")
-                    result = pipeline.query(question)
-
-                    print(f"Answer: {result['answer']}\n")
+                    source_documents = []
+                    print("Answer: ", end="", flush=True)
+                    for event in pipeline.stream_query(question):
+                        if event['type'] == 'sources':
+                            source_documents = event['source_documents']
+                        elif event['type'] == 'token':
+                            print(event['content'], end="", flush=True)
+                    print("\n")
 
                     if args.show_sources:
                         print("Sources:")
-                        for i, doc in enumerate(result['source_documents'], 1):
+                        for i, doc in enumerate(source_documents, 1):
                             source = doc.metadata.get('source', 'Unknown')
                             page = doc.metadata.get('page', 'N/A')
                             print(f"  [{i}] {source} (Page {page})")
@@ -62,7 +88,7 @@ def query_command(args):
         else:
             # Single query mode
             if not args.question:
-                print("Error: --question is required in non-interactive mode", file=sys.stderr)
+                print("Error: --question or --batch is required in non-interactive mode", file=sys.stderr)
                 sys.exit(1)
 
             result = pipeline.query(args.question)
@@ -81,6 +107,16 @@ def query_command(args):
         print(f"\n✗ Error during query: {e}", file=sys.stderr)
         sys.exit(1)
 
+def serve_command(args):
+    """Handle serve command."""
+    try:
+        from rag.http_server import serve
+
+        serve(args.config, host=args.host, port=args.port, workers=args.workers)
+    except Exception as e:
+        print(f"\n✗ Error running server: {e}", file=sys.stderr)
+        sys.exit(1)
+
 def main_noargs():
     # Load environment variables
     load_dotenv()
@@ -110,6 +146,11 @@ def main():
         type=str,
         help='Path to PDF file or directory containing PDFs'
     )
+    index_parser.add_argument(
+        '--full',
+        action='store_true',
+        help='Rebuild the whole index instead of only new or changed files'
+    )
 
     # Query command
     query_parser = subparsers.add_parser('query', help='Query indexed documents')
@@ -123,12 +164,51 @@ def main():
         action='store_true',
         help='Run in interactive mode'
     )
+    query_parser.add_argument(
+        '-b', '--batch',
+        type=str,
+        metavar='FILE',
+        help='Answer every question in a JSONL, JSON or CSV file'
+    )
+    query_parser.add_argument(
+        '-o', '--output',
+        type=str,
+        default='batch_results.jsonl',
+        help='Output JSONL file for --batch (default: batch_results.jsonl)'
+    )
+    query_parser.add_argument(
+        '-c', '--concurrency',
+        type=int,
+        default=None,
+        help='Maximum concurrent LLM calls for --batch (default: QUERY_MAX_CONCURRENCY)'
+    )
     query_parser.add_argument(
         '-s', '--show-sources',
         action='store_true',
         help='Show source documents'
     )
 
+    # Serve command
+    serve_parser = subparsers.add_parser('serve', help='Serve queries over HTTP')
+    serve_parser.add_argument(
+        '--host',
+        type=str,
+        default=None,
+        help='Address to listen on (default: SERVER_HOST)'
+    )
+    serve_parser.add_argument(
+        '--port',
+        type=int,
+        default=None,
+        help='Port to listen on (default: SERVER_PORT)'
+    )
+    serve_parser.add_argument(
+        '-w', '--workers',
+        type=int,
+        default=None,
+        help='Concurrent pipeline executions (default: SERVER_WORKERS)'
+    )
+
     args = parser.parse_args()
 
     if not args.command:
@@ -139,6 +219,8 @@ def main():
         index_command(args)
     elif args.command == 'query':
         query_command(args)
+    elif args.command == 'serve':
+        serve_command(args)
 
 
 if __name__ == '__main__':
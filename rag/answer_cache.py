@@ -0,0 +1,201 @@
+"""Answer cache for repeated questions."""
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+class AnswerCache:
+    """
+    Caches answers so repeated questions skip retrieval and the LLM.
+
+    Lookups happen in two steps: an exact match on the normalised question,
+    then a nearest-neighbour match on the question embedding above a
+    similarity threshold. Entries expire after a TTL, the least recently
+    used entry is evicted when the cache is full, and everything is dropped
+    when the index changes.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        """
+        Initialize the answer cache.
+
+        Args:
+            config: Answer cache configuration
+        """
+        self.ttl_seconds = config.get('ttl_seconds', 3600)
+        self.max_entries = config.get('max_entries', 1000)
+        self.similarity_threshold = config.get('similarity_threshold', 0.95)
+
+        self._entries: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._index_version = None
+
+        # Normalised embedding matrix for semantic lookups, rebuilt lazily
+        self._matrix = None
+        self._matrix_keys: List[str] = []
+
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def normalize(question: str) -> str:
+        """
+        Normalise a question for exact matching.
+
+        Args:
+            question: Question text
+
+        Returns:
+            Lower-cased question with punctuation removed and whitespace collapsed
+        """
+        question = re.sub(r'[^\w\s]', ' ', question.lower())
+        return ' '.join(question.split())
+
+    def _expired(self, entry: Dict[str, Any], now: float) -> bool:
+        """Check whether an entry is past its TTL."""
+        return self.ttl_seconds > 0 and now - entry['created_at'] > self.ttl_seconds
+
+    def _evict(self, key: str) -> None:
+        """Remove an entry and mark the embedding matrix stale."""
+        del self._entries[key]
+        self._matrix = None
+
+    def validate(self, index_version: Any) -> None:
+        """
+        Drop all entries if the index has changed since they were cached.
+
+        Args:
+            index_version: Any value that changes whenever the index is rebuilt
+        """
+        with self._lock:
+            if index_version != self._index_version:
+                self._entries.clear()
+                self._matrix = None
+                self._index_version = index_version
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._matrix = None
+
+    def get_exact(self, question: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up an answer by normalised question.
+
+        Args:
+            question: Question text
+
+        Returns:
+            Cached entry or None
+        """
+        key = self.normalize(question)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if self._expired(entry, time.time()):
+                self._evict(key)
+                return None
+            self._entries.move_to_end(key)
+            self.exact_hits += 1
+            return entry
+
+    def get_similar(self, embedding: List[float]) -> Optional[Tuple[Dict[str, Any], float]]:
+        """
+        Look up the answer to the most similar cached question.
+
+        Args:
+            embedding: Question embedding
+
+        Returns:
+            Tuple of (cached entry, cosine similarity) if the best match is
+            above the similarity threshold, otherwise None
+        """
+        query = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return None
+        query /= norm
+
+        with self._lock:
+            now = time.time()
+            for key in [k for k, e in self._entries.items() if self._expired(e, now)]:
+                self._evict(key)
+
+            if self._matrix is None:
+                # Entries cached without an embedding only match exactly
+                self._matrix_keys = [k for k, e in self._entries.items() if e['embedding'] is not None]
+                if not self._matrix_keys:
+                    return None
+                self._matrix = np.stack([self._entries[k]['embedding'] for k in self._matrix_keys])
+
+            similarities = self._matrix @ query
+            best = int(np.argmax(similarities))
+            similarity = float(similarities[best])
+
+            if similarity < self.similarity_threshold:
+                return None
+
+            key = self._matrix_keys[best]
+            self._entries.move_to_end(key)
+            self.semantic_hits += 1
+            return self._entries[key], similarity
+
+    def put(self, question: str, embedding: Optional[List[float]], answer: str, source_documents: List[Any]) -> None:
+        """
+        Cache an answer.
+
+        Every put follows a failed lookup, so puts are counted as misses.
+
+        Args:
+            question: Question text
+            embedding: Question embedding, or None to only allow exact matches
+            answer: Generated answer
+            source_documents: Documents the answer was generated from
+        """
+        key = self.normalize(question)
+
+        vector = None
+        if embedding is not None:
+            vector = np.asarray(embedding, dtype=np.float32)
+            norm = np.linalg.norm(vector)
+            vector = vector / norm if norm else None
+
+        with self._lock:
+            if key in self._entries:
+                self._evict(key)
+            self._entries[key] = {
+                'question': question,
+                'answer': answer,
+                'source_documents': source_documents,
+                'embedding': vector,
+                'created_at': time.time()
+            }
+            self._matrix = None
+            self.misses += 1
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        """
+        Get cache hit/miss counters.
+
+        Returns:
+            Dictionary of entries, exact hits, semantic hits, misses and hit rate
+        """
+        hits = self.exact_hits + self.semantic_hits
+        total = hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'exact_hits': self.exact_hits,
+            'semantic_hits': self.semantic_hits,
+            'misses': self.misses,
+            'hit_rate': hits / total if total else None
+        }
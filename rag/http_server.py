@@ -0,0 +1,217 @@
+"""HTTP query service around a long-lived RAG pipeline."""
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from rag.query_service import QueryService, ServiceOverloaded
+from utils.batch_io import result_record, source_records
+from utils.metrics import get_metrics
+
+
+class QueryRequestHandler(BaseHTTPRequestHandler):
+    """
+    Handles the service endpoints.
+
+    POST /query   {"question": "..."} -> JSON answer with sources, timings and usage
+    POST /stream  {"question": "..."} -> newline-delimited JSON events
+                  (sources, token..., done)
+    GET  /health  -> pipeline and worker pool state
+    GET  /metrics -> Prometheus text exposition (empty unless METRICS_ENABLED)
+    """
+
+    server: 'QueryHTTPServer'
+
+    # A question body is a few hundred bytes; anything far larger is refused
+    # before it is read
+    MAX_BODY_BYTES = 64 * 1024
+
+    def _send_json(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+        """Send a complete JSON response."""
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_question(self) -> Optional[str]:
+        """Read the question from a JSON request body, answering 400 or 413 if invalid."""
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            length = -1
+        if length < 0:
+            # rfile.read(-1) would block until the client closes the connection
+            self._send_json(400, {'error': 'Invalid Content-Length'})
+            self.close_connection = True
+            return None
+        if length > self.MAX_BODY_BYTES:
+            self._send_json(413, {'error': f"Request body exceeds {self.MAX_BODY_BYTES} bytes"})
+            self.close_connection = True
+            return None
+
+        try:
+            payload = json.loads(self.rfile.read(length) or b'{}')
+        except (ValueError, UnicodeDecodeError):
+            self._send_json(400, {'error': 'Request body must be JSON'})
+            return None
+
+        question = payload.get('question') if isinstance(payload, dict) else None
+        if not isinstance(question, str) or not question.strip():
+            self._send_json(400, {'error': "Request body must contain a non-empty 'question'"})
+            return None
+        return question.strip()
+
+    def do_GET(self) -> None:
+        """Handle GET requests."""
+        if self.path == '/health':
+            self._send_json(200, self.server.health())
+        elif self.path == '/metrics':
+            body = get_metrics().render_prometheus().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self._send_json(404, {'error': f"Not found: {self.path}"})
+
+    def do_POST(self) -> None:
+        """Handle POST requests."""
+        if self.path not in ('/query', '/stream'):
+            self._send_json(404, {'error': f"Not found: {self.path}"})
+            return
+
+        question = self._read_question()
+        if question is None:
+            return
+
+        try:
+            if self.path == '/query':
+                result = self.server.service.query(question)
+                self._send_json(200, dict(result_record(result), coalesced=result['coalesced']))
+            else:
+                self._stream(self.server.service.stream(question))
+        except ServiceOverloaded as e:
+            self._send_json(503, {'error': str(e)}, headers={'Retry-After': '1'})
+        except TimeoutError:
+            self._send_json(504, {'error': 'Timed out waiting for the answer'})
+        except Exception as e:
+            self._send_json(500, {'error': str(e)})
+
+    def _stream(self, events) -> None:
+        """Write stream events as newline-delimited JSON as they are produced."""
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+
+        try:
+            for event in events:
+                if event['type'] == 'sources':
+                    event = {'type': 'sources', 'sources': source_records(event['source_documents'])}
+                self.wfile.write((json.dumps(event) + "\n").encode('utf-8'))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            # The client went away; the shared execution carries on
+            return
+        except Exception as e:
+            # Headers are already sent, so the error is reported in the stream
+            self.wfile.write((json.dumps({'type': 'error', 'error': str(e)}) + "\n").encode('utf-8'))
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Log requests unless the server was created quiet."""
+        if self.server.log_requests:
+            super().log_message(format, *args)
+
+
+class QueryHTTPServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding the query service."""
+
+    daemon_threads = True
+
+    def __init__(
+            self,
+            address,
+            service: QueryService,
+            health: Optional[Callable[[], Dict[str, Any]]] = None,
+            log_requests: bool = True
+    ):
+        """
+        Initialize the server.
+
+        Args:
+            address: (host, port) to listen on; port 0 picks a free port
+            service: Query service that runs the pipeline
+            health: Returns the pipeline health report for /health
+            log_requests: Whether to log every request to stderr
+        """
+        super().__init__(address, QueryRequestHandler)
+        self.service = service
+        self._health = health
+        self.log_requests = log_requests
+        get_metrics().register_collector('query_service', self._service_samples)
+
+    def _service_samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        """Export the worker pool counters."""
+        stats = self.service.stats()
+        return [
+            ('rag_service_workers', {}, stats['workers']),
+            ('rag_service_pending', {}, stats['pending']),
+            ('rag_service_in_flight', {}, stats['in_flight']),
+            ('rag_service_executions_total', {}, stats['executed']),
+            ('rag_service_coalesced_total', {}, stats['coalesced']),
+            ('rag_service_rejected_total', {}, stats['rejected'])
+        ]
+
+    def health(self) -> Dict[str, Any]:
+        """Combine the pipeline health report with the service counters."""
+        report = self._health() if self._health is not None else {'status': 'ok'}
+        return dict(report, service=self.service.stats())
+
+
+def serve(
+        config_path: str = "config/config.yaml",
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        workers: Optional[int] = None
+) -> None:
+    """
+    Load the pipeline once and serve queries until interrupted.
+
+    Args:
+        config_path: Path to configuration file
+        host: Address to listen on (default: SERVER_HOST)
+        port: Port to listen on (default: SERVER_PORT)
+        workers: Concurrent pipeline executions (default: SERVER_WORKERS)
+    """
+    from rag.pipeline_registry import get_registry
+    from utils.config_loader import ConfigLoader
+
+    server_config = ConfigLoader(config_path).get_server_config()
+    host = host or server_config.get('host', '127.0.0.1')
+    port = port if port is not None else server_config.get('port', 8000)
+
+    # The registry rebuilds the pipeline if the config or the index changes
+    registry = get_registry()
+    print("Loading pipeline...")
+    registry.warmup(config_path)
+
+    service = QueryService(
+        lambda: registry.get(config_path),
+        max_workers=workers or server_config.get('workers', 4),
+        max_pending=server_config.get('max_pending', 64),
+        timeout=server_config.get('request_timeout', 120.0) or None
+    )
+    server = QueryHTTPServer((host, port), service, health=lambda: registry.health(config_path))
+
+    print(f"Serving on http://{host}:{server.server_address[1]} with {service.max_workers} worker(s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down...")
+    finally:
+        server.server_close()
+        service.shutdown()
@@ -0,0 +1,247 @@
+"""Incremental document indexer."""
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from langchain_core.documents import Document
+from langchain_core.vectorstores import VectorStore
+
+from components.bm25_index import BM25Index
+from components.document_loader import DocumentLoader, LoadReport
+from components.embedding_tokenizer import TruncationReport
+from components.index_manifest import IndexManifest
+from components.text_splitter import TextSplitter
+
+
+class DocumentIndexer:
+    """
+    Keeps a vector store in sync with PDF files on disk.
+
+    Only new or changed PDFs are parsed, split and embedded. Chunks of
+    changed or deleted files are removed from the vector store, and files
+    whose size and modification time match the manifest are skipped without
+    being read.
+
+    Ingestion is streamed: load -> split -> embed -> upsert run as a chain of
+    generators over fixed-size chunk batches, so memory stays flat however
+    many PDFs are indexed.
+    """
+
+    def __init__(
+            self,
+            vectorstore: VectorStore,
+            text_splitter: TextSplitter,
+            manifest: IndexManifest,
+            loader_workers: int = 1,
+            batch_size: int = 64,
+            max_pending: Optional[int] = None,
+            persist: Optional[Callable[[], None]] = None,
+            lexical_index: Optional[BM25Index] = None
+    ):
+        """
+        Initialize the indexer.
+
+        Args:
+            vectorstore: Vector store to keep in sync
+            text_splitter: Text splitter used to chunk documents
+            manifest: Loaded index manifest
+            loader_workers: Number of processes used to parse PDFs
+                (0 uses one per CPU)
+            batch_size: Number of chunks embedded and upserted together
+            max_pending: Maximum parsed files waiting to be consumed
+                (defaults to twice the loader workers)
+            persist: Callback that writes the vector store to disk, for
+                backends that do not persist writes themselves. When set, the
+                manifest is only saved after the store has been persisted.
+            lexical_index: Optional BM25 index kept in sync with the vector
+                store and saved together with the manifest
+        """
+        self.vectorstore = vectorstore
+        self.text_splitter = text_splitter
+        self.manifest = manifest
+        self.loader_workers = loader_workers or os.cpu_count() or 1
+        self.batch_size = max(batch_size, 1)
+        self.max_pending = max_pending
+        self.persist = persist
+        self.lexical_index = lexical_index
+        self.last_load_report = None
+        self.last_truncation_report = None
+
+    def index(self, file_path: str) -> Dict[str, int]:
+        """
+        Index a PDF file or every PDF in a directory.
+
+        Args:
+            file_path: Path to PDF file or directory containing PDFs
+
+        Returns:
+            Counts of added, updated, removed, unchanged and failed files, of
+            chunks written and of chunks longer than the embedding model reads
+            (0 if its tokenizer is not available locally)
+
+        Raises:
+            ValueError: If the path is neither a file nor a directory
+        """
+        path = Path(file_path)
+
+        if path.is_file():
+            pdf_files = [path]
+            removed = []
+        elif path.is_dir():
+            pdf_files = sorted(path.glob('*.pdf'))
+            present = {IndexManifest.key(str(pdf)) for pdf in pdf_files}
+            removed = [key for key in self.manifest.tracked_in(file_path) if key not in present]
+        else:
+            raise ValueError(f"Invalid path: {file_path}")
+
+        stats = {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 0, 'failed': 0, 'chunks': 0, 'truncated': 0}
+
+        for key in removed:
+            print(f"Removing deleted file: {key}")
+            self._delete(self.manifest.remove(key))
+            stats['removed'] += 1
+
+        # Work out which files need parsing before starting the pool
+        pending = {}
+        for pdf in pdf_files:
+            pdf_path = str(pdf)
+            stat = os.stat(pdf_path)
+
+            if self.manifest.is_unchanged(pdf_path, stat):
+                stats['unchanged'] += 1
+                continue
+
+            sha256 = IndexManifest.file_sha256(pdf_path)
+            entry = self.manifest.get(pdf_path)
+
+            if entry and entry['sha256'] == sha256:
+                # Touched but not modified; just refresh the stat fields
+                self.manifest.set(pdf_path, stat, sha256, entry['chunk_ids'])
+                stats['unchanged'] += 1
+                continue
+
+            pending[pdf_path] = (stat, sha256, entry)
+
+        self._checkpoint()
+
+        report = LoadReport()
+        truncation = None
+        if pending and self.text_splitter.tokenizer is not None:
+            truncation = TruncationReport(self.text_splitter.tokenizer.max_length)
+        parsed = DocumentLoader.iter_pdfs(list(pending), self.loader_workers, report, self.max_pending)
+        items = self._split_files(parsed, pending, stats, truncation)
+
+        for batch in self._batches(items):
+            documents = [item[1] for item in batch if item[0] == 'chunk']
+            ids = [item[2] for item in batch if item[0] == 'chunk']
+            if documents:
+                self.vectorstore.add_documents(documents, ids=ids)
+                if self.lexical_index is not None:
+                    self.lexical_index.add(documents, ids)
+
+            # Every chunk of a finished file precedes its marker, so files
+            # finished in this batch are now fully stored
+            for item in batch:
+                if item[0] == 'file':
+                    _, pdf_path, stat, sha256, chunk_ids = item
+                    self.manifest.set(pdf_path, stat, sha256, chunk_ids)
+            self._checkpoint()
+
+        if pending:
+            print(report.summary())
+        if truncation is not None and truncation.chunks:
+            print(truncation.summary())
+            stats['truncated'] = truncation.truncated
+        self.last_load_report = report
+        self.last_truncation_report = truncation
+
+        if self.persist is not None:
+            self.persist()
+        self._save()
+
+        return stats
+
+    def _save(self) -> None:
+        """Save the lexical index, then the manifest that vouches for it."""
+        if self.lexical_index is not None:
+            self.lexical_index.save()
+        self.manifest.save()
+
+    def _checkpoint(self) -> None:
+        """Save the manifest if the vector store has already persisted its writes."""
+        if self.persist is None:
+            self._save()
+
+    def _split_files(
+            self,
+            parsed: Iterable[Tuple[str, List[Document], Optional[str]]],
+            pending: Dict[str, Tuple[os.stat_result, str, Optional[Dict[str, Any]]]],
+            stats: Dict[str, int],
+            truncation: Optional[TruncationReport] = None
+    ) -> Iterator[Tuple]:
+        """
+        Split parsed files into a stream of chunks and file-finished markers.
+
+        Args:
+            parsed: Parsed files as yielded by DocumentLoader.iter_pdfs
+            pending: Stat, hash and old manifest entry of each file
+            stats: Statistics updated in place
+            truncation: Report to record the token length of each chunk in
+
+        Yields:
+            ('chunk', document, chunk_id) for each chunk, followed by
+            ('file', file_path, stat, sha256, chunk_ids) once per file
+        """
+        for pdf_path, documents, error in parsed:
+            if error:
+                # Leave the manifest untouched so the file is retried next run
+                print(f"Warning: Failed to load {pdf_path}: {error}")
+                stats['failed'] += 1
+                continue
+
+            print(f"Indexing: {pdf_path}")
+            stat, sha256, entry = pending[pdf_path]
+            chunks = self.text_splitter.split_documents(documents)
+            chunk_ids = IndexManifest.chunk_ids(pdf_path, sha256, len(chunks))
+            if truncation is not None:
+                truncation.record(self.text_splitter.tokenizer.lengths([chunk.page_content for chunk in chunks]))
+
+            if entry:
+                self._delete(entry['chunk_ids'])
+
+            for chunk, chunk_id in zip(chunks, chunk_ids):
+                yield 'chunk', chunk, chunk_id
+
+            stats['updated' if entry else 'added'] += 1
+            stats['chunks'] += len(chunks)
+            yield 'file', pdf_path, stat, sha256, chunk_ids
+
+    def _batches(self, items: Iterable[Tuple]) -> Iterator[List[Tuple]]:
+        """
+        Group a stream of items into batches of at most batch_size chunks.
+
+        Args:
+            items: Items yielded by _split_files
+
+        Yields:
+            Lists of items
+        """
+        batch = []
+        chunk_count = 0
+        for item in items:
+            batch.append(item)
+            if item[0] == 'chunk':
+                chunk_count += 1
+            if chunk_count >= self.batch_size:
+                yield batch
+                batch = []
+                chunk_count = 0
+        if batch:
+            yield batch
+
+    def _delete(self, chunk_ids: List[str]) -> None:
+        """Delete chunks from the vector store and lexical index."""
+        if chunk_ids:
+            self.vectorstore.delete(ids=chunk_ids)
+            if self.lexical_index is not None:
+                self.lexical_index.remove(chunk_ids)
@@ -0,0 +1,164 @@
+"""Process-wide registry of warm RAG pipelines."""
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from rag.rag_pipeline import RAGPipeline
+from utils.config_loader import ConfigLoader
+from utils.fingerprint import config_fingerprint, directory_fingerprint
+
+
+class PipelineRegistry:
+    """
+    Builds RAG pipelines once per process and hands out the shared instance.
+
+    Pipelines are keyed by the effective configuration. A pipeline is only
+    rebuilt when that configuration or the index on disk changes, so the
+    embedding model, LLM client and vector store are loaded once and reused
+    across callers (for example Streamlit sessions and reruns).
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._lock = threading.Lock()
+        self._build_locks: Dict[str, threading.Lock] = {}
+        self._entries: Dict[str, Dict[str, Any]] = {}
+
+    @staticmethod
+    def _describe(config_path: str) -> Dict[str, str]:
+        """
+        Compute the registry key and index fingerprint for a config path.
+
+        Args:
+            config_path: Path to configuration file
+
+        Returns:
+            Dictionary with 'key' and 'index_fingerprint'
+        """
+        config = ConfigLoader(config_path).load_config()
+        persist_directory = config.get('vectorstore', {}).get('persist_directory', '')
+        return {
+            'key': config_fingerprint({'config_path': config_path, 'config': config}),
+            'index_fingerprint': directory_fingerprint(persist_directory)
+        }
+
+    def get(self, config_path: str = "config/config.yaml", warmup: bool = True) -> RAGPipeline:
+        """
+        Get a ready-to-query pipeline, building it on first use.
+
+        Args:
+            config_path: Path to configuration file
+            warmup: Whether to warm up a newly built pipeline before returning it
+
+        Returns:
+            Shared RAGPipeline instance with its vector store loaded
+        """
+        description = self._describe(config_path)
+        key = description['key']
+
+        entry = self._entries.get(key)
+        if entry and entry['index_fingerprint'] == description['index_fingerprint']:
+            return entry['pipeline']
+
+        with self._lock:
+            build_lock = self._build_locks.setdefault(key, threading.Lock())
+
+        # Only one thread builds a given pipeline; the others wait and reuse it
+        with build_lock:
+            entry = self._entries.get(key)
+            if entry and entry['index_fingerprint'] == description['index_fingerprint']:
+                return entry['pipeline']
+
+            start = time.perf_counter()
+            pipeline = RAGPipeline(config_path)
+            pipeline.load_vectorstore()
+            if warmup:
+                pipeline.warmup()
+
+            with self._lock:
+                # A config change for the same path replaces the old pipeline
+                for stale_key in [k for k, e in self._entries.items()
+                                  if e['config_path'] == config_path and k != key]:
+                    del self._entries[stale_key]
+                self._entries[key] = {
+                    'pipeline': pipeline,
+                    'config_path': config_path,
+                    'index_fingerprint': description['index_fingerprint'],
+                    'built_at': time.time(),
+                    'build_seconds': time.perf_counter() - start
+                }
+
+            return pipeline
+
+    def warmup(self, config_path: str = "config/config.yaml") -> Dict[str, Any]:
+        """
+        Build and warm up the pipeline for a config ahead of the first request.
+
+        Args:
+            config_path: Path to configuration file
+
+        Returns:
+            Health report for the warmed pipeline
+        """
+        self.get(config_path, warmup=True)
+        return self.health(config_path)
+
+    def health(self, config_path: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Report the state of registered pipelines.
+
+        Args:
+            config_path: Optional config path to restrict the report to
+
+        Returns:
+            Dictionary with an overall 'status' and one entry per pipeline
+        """
+        with self._lock:
+            entries = list(self._entries.items())
+
+        pipelines = []
+        for key, entry in entries:
+            if config_path is not None and entry['config_path'] != config_path:
+                continue
+            current = self._describe(entry['config_path'])
+            pipelines.append({
+                'key': key[:12],
+                'config_path': entry['config_path'],
+                'built_at': entry['built_at'],
+                'build_seconds': entry['build_seconds'],
+                'stale': (
+                    current['key'] != key
+                    or current['index_fingerprint'] != entry['index_fingerprint']
+                ),
+                'ready': entry['pipeline'].rag_chain is not None
+            })
+
+        status = 'ok' if pipelines and all(p['ready'] for p in pipelines) else 'empty'
+        return {'status': status, 'pipelines': pipelines}
+
+    def clear(self) -> None:
+        """Drop all registered pipelines."""
+        with self._lock:
+            self._entries.clear()
+            self._build_locks.clear()
+
+
+_registry = PipelineRegistry()
+
+
+def get_pipeline(config_path: str = "config/config.yaml") -> RAGPipeline:
+    """
+    Get the process-wide shared pipeline for a configuration.
+
+    Args:
+        config_path: Path to configuration file
+
+    Returns:
+        Shared RAGPipeline instance
+    """
+    return _registry.get(config_path)
+
+
+def get_registry() -> PipelineRegistry:
+    """Get the process-wide pipeline registry."""
+    return _registry
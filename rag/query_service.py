@@ -0,0 +1,229 @@
+"""Concurrent query service with request coalescing."""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from rag.answer_cache import AnswerCache
+from rag.rag_pipeline import RAGPipeline
+
+
+class ServiceOverloaded(Exception):
+    """Raised when a request would exceed the pending request limit."""
+
+
+class _StreamBroadcast:
+    """
+    Stream events from one pipeline execution, replayed to every subscriber.
+
+    Subscribers that join late first receive the events already produced.
+    """
+
+    def __init__(self):
+        self._events: List[Dict[str, Any]] = []
+        self._error: Optional[BaseException] = None
+        self._finished = False
+        self._condition = threading.Condition()
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        """Append an event and wake subscribers."""
+        with self._condition:
+            self._events.append(event)
+            self._condition.notify_all()
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        """Mark the stream complete, optionally with the error that ended it."""
+        with self._condition:
+            self._error = error
+            self._finished = True
+            self._condition.notify_all()
+
+    def subscribe(self, timeout: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over the events from the beginning.
+
+        Args:
+            timeout: Maximum seconds to wait for each event
+
+        Raises:
+            TimeoutError: If no event arrives in time
+        """
+        position = 0
+        while True:
+            with self._condition:
+                if not self._condition.wait_for(
+                        lambda: position < len(self._events) or self._finished, timeout
+                ):
+                    raise TimeoutError("Timed out waiting for the answer stream")
+                events = self._events[position:]
+                finished, error = self._finished, self._error
+            position += len(events)
+            yield from events
+            if finished and position >= len(self._events):
+                if error is not None:
+                    raise error
+                return
+
+
+class QueryService:
+    """
+    Runs pipeline queries for many concurrent callers on a bounded worker pool.
+
+    Identical questions (after AnswerCache.normalize) that arrive while one
+    is already being answered are coalesced: they wait for that execution
+    and share its result instead of running the pipeline again. Requests
+    beyond the worker pool queue up to max_pending; further requests are
+    rejected with ServiceOverloaded.
+    """
+
+    def __init__(
+            self,
+            get_pipeline: Callable[[], RAGPipeline],
+            max_workers: int = 4,
+            max_pending: int = 64,
+            timeout: Optional[float] = 120.0
+    ):
+        """
+        Initialize the service.
+
+        Args:
+            get_pipeline: Returns the pipeline to query, loaded and ready
+                (e.g. PipelineRegistry.get)
+            max_workers: Pipeline executions running at once
+            max_pending: Executions allowed to run or wait for a worker
+            timeout: Seconds a caller waits for its answer (None waits forever)
+        """
+        self.get_pipeline = get_pipeline
+        self.max_workers = max(max_workers, 1)
+        self.max_pending = max(max_pending, self.max_workers)
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='query-worker')
+        # Reentrant: done callbacks run inline when a future is already finished
+        self._lock = threading.RLock()
+        self._queries: Dict[str, Future] = {}
+        self._streams: Dict[str, _StreamBroadcast] = {}
+        self._pending = 0
+        self.executed = 0
+        self.coalesced = 0
+        self.rejected = 0
+
+    def _submit(self, function: Callable[[], Any]) -> Future:
+        """Submit work to the pool, enforcing max_pending. Call with _lock held."""
+        if self._pending >= self.max_pending:
+            self.rejected += 1
+            raise ServiceOverloaded(f"Too many pending requests ({self.max_pending})")
+        self._pending += 1
+        self.executed += 1
+        future = self._executor.submit(function)
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, _: Future) -> None:
+        """Free a pending slot when an execution ends."""
+        with self._lock:
+            self._pending -= 1
+
+    def query(self, question: str) -> Dict[str, Any]:
+        """
+        Answer a question, sharing the execution with identical in-flight ones.
+
+        Args:
+            question: Question to ask
+
+        Returns:
+            Result of RAGPipeline.query, plus 'coalesced' (True if this call
+            reused another caller's execution)
+
+        Raises:
+            ServiceOverloaded: If too many requests are pending
+            TimeoutError: If the answer does not arrive within the timeout
+        """
+        key = AnswerCache.normalize(question)
+
+        with self._lock:
+            future = self._queries.get(key)
+            coalesced = future is not None
+            if coalesced:
+                self.coalesced += 1
+            else:
+                future = self._submit(lambda: self.get_pipeline().query(question))
+                self._queries[key] = future
+                future.add_done_callback(lambda done: self._forget(self._queries, key, done))
+
+        result = future.result(timeout=self.timeout)
+        return dict(result, coalesced=coalesced)
+
+    def stream(self, question: str) -> Iterator[Dict[str, Any]]:
+        """
+        Stream an answer, sharing the execution with identical in-flight streams.
+
+        Args:
+            question: Question to ask
+
+        Returns:
+            Iterator over the events of RAGPipeline.stream_query; the 'done'
+            event also carries 'coalesced'
+
+        Raises:
+            ServiceOverloaded: If too many requests are pending
+        """
+        key = AnswerCache.normalize(question)
+
+        with self._lock:
+            broadcast = self._streams.get(key)
+            coalesced = broadcast is not None
+            if coalesced:
+                self.coalesced += 1
+            else:
+                broadcast = _StreamBroadcast()
+                self._submit(lambda: self._run_stream(key, question, broadcast))
+                self._streams[key] = broadcast
+
+        return self._subscribe(broadcast, coalesced)
+
+    def _subscribe(self, broadcast: _StreamBroadcast, coalesced: bool) -> Iterator[Dict[str, Any]]:
+        """Iterate over a broadcast, tagging the final event."""
+        for event in broadcast.subscribe(self.timeout):
+            yield dict(event, coalesced=coalesced) if event['type'] == 'done' else event
+
+    def _run_stream(self, key: str, question: str, broadcast: _StreamBroadcast) -> None:
+        """Produce the events of one streamed execution."""
+        error = None
+        try:
+            for event in self.get_pipeline().stream_query(question):
+                broadcast.publish(event)
+        except BaseException as e:
+            error = e
+        finally:
+            # New callers start a fresh execution from here on
+            with self._lock:
+                if self._streams.get(key) is broadcast:
+                    del self._streams[key]
+            broadcast.finish(error)
+
+    def _forget(self, in_flight: Dict[str, Any], key: str, value: Any) -> None:
+        """Remove a finished execution from an in-flight table."""
+        with self._lock:
+            if in_flight.get(key) is value:
+                del in_flight[key]
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get service counters.
+
+        Returns:
+            Dictionary with workers, pending, in_flight, executed, coalesced
+            and rejected
+        """
+        with self._lock:
+            return {
+                'workers': self.max_workers,
+                'pending': self._pending,
+                'in_flight': len(self._queries) + len(self._streams),
+                'executed': self.executed,
+                'coalesced': self.coalesced,
+                'rejected': self.rejected
+            }
+
+    def shutdown(self) -> None:
+        """Stop accepting work and wait for running executions."""
+        self._executor.shutdown(wait=True)
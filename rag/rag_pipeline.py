@@ -1,17 +1,33 @@
 """RAG Pipeline implementation."""
-from typing import List, Dict, Any
+import asyncio
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, AsyncIterator, Iterator, Optional, Tuple
 from langchain_core.documents import Document
+from langchain_core.messages import SystemMessage
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from langchain_core.runnables import RunnablePassthrough
 
 from factories.llm_factory import LLMFactory
 from factories.embedding_factory import EmbeddingFactory
 from factories.vectorstore_factory import VectorStoreFactory
-from components.document_loader import DocumentLoader
 from components.text_splitter import TextSplitter
 from components.retriever import Retriever
+from components.index_manifest import IndexManifest
+from components.bm25_index import BM25Index
+from components.embedding_probe import EmbeddingProbe
+from components.reranker import Reranker
+from components.policy_router import PolicyRouter
+from components.context_builder import ContextBuilder
+from components.usage_tracker import UsageTracker
+from components.instrumented_embeddings import InstrumentedEmbeddings
+from components.cached_embeddings import CachedEmbeddings
+from rag.indexer import DocumentIndexer
+from rag.answer_cache import AnswerCache
 from utils.config_loader import ConfigLoader
+from utils.config_types import LLMType
+from utils.metrics import get_metrics
 
 
 class RAGPipeline:
@@ -27,6 +43,10 @@ class RAGPipeline:
         self.config_loader = ConfigLoader(config_path)
         self.config_loader.load_config()
 
+        # Metrics are process-wide; when disabled, recording is a no-op
+        metrics = get_metrics()
+        metrics.configure(self.config_loader.get_metrics_config())
+
         # Initialize factories
         self.llm_factory = LLMFactory()
         self.embedding_factory = EmbeddingFactory()
@@ -35,73 +55,280 @@ class RAGPipeline:
         # Create instances from configuration
         self.llm = self.llm_factory.create(self.config_loader.get_llm_config())
         self.embedding = self.embedding_factory.create(self.config_loader.get_embedding_config())
+        if isinstance(self.embedding, CachedEmbeddings):
+            metrics.register_collector('embedding_cache', self._embedding_cache_samples)
+        if metrics.enabled:
+            self.embedding = InstrumentedEmbeddings(self.embedding, metrics)
 
         # Text splitter
-        self.text_splitter = TextSplitter(self.config_loader.get_document_processing_config())
+        self.text_splitter = TextSplitter(
+            self.config_loader.get_document_processing_config(),
+            self.config_loader.get_embedding_config()
+        )
 
         # Vector store and retriever (initialized when needed)
         self.vectorstore = None
         self.retriever = None
+        self.lexical_index = None
+        self.policy_router = None
+
+        # Answer cache for repeated questions
+        answer_cache_config = self.config_loader.get_answer_cache_config()
+        self.answer_cache = AnswerCache(answer_cache_config) if answer_cache_config.get('enabled') else None
+
+        # Optional cross-encoder stage that reorders over-fetched candidates
+        rerank_config = self.config_loader.get_rerank_config()
+        self.reranker = Reranker(rerank_config) if rerank_config.get('enabled') else None
+        if self.reranker is not None:
+            metrics.register_collector('rerank_cache', self._rerank_cache_samples)
+        self.top_k = self.config_loader.get_retrieval_config().get('top_k', 4)
+
+        # Deduplicates and budgets the retrieved chunks sent to the LLM
+        context_config = self.config_loader.get_context_config()
+        self.context_builder = (
+            ContextBuilder(context_config, self.config_loader.get_llm_config())
+            if context_config.get('enabled') else None
+        )
 
-        # RAG chain
+        # Bound on concurrent aquery/astream_query calls, one semaphore per event loop
+        self.max_concurrency = self.config_loader.get_rag_config().get('max_concurrency', 16)
+        self._semaphores = weakref.WeakKeyDictionary()
+
+        # Prompt and RAG chain
+        self.prompt = None
+        self.answer_chain = None
         self.rag_chain = None
 
-    def index_documents(self, file_path: str) -> None:
+    def index_documents(self, file_path: str, full: bool = False) -> Dict[str, int]:
         """
         Index documents from a PDF file or directory.
 
+        Indexing is incremental: only new or changed PDFs are embedded and
+        chunks of changed or deleted PDFs are removed.
+
         Args:
             file_path: Path to PDF file or directory containing PDFs
+            full: Drop the existing index and re-embed everything
+
+        Returns:
+            Indexing statistics
         """
         print(f"Loading documents from: {file_path}")
 
-        # Load documents
-        from pathlib import Path
-        path = Path(file_path)
-
-        if path.is_file():
-            documents = DocumentLoader.load_pdf(file_path)
-        elif path.is_dir():
-            print(f"Loading PDF from directory: {file_path}")
-            documents = DocumentLoader.load_directory(file_path)
+        vectorstore_config = self.config_loader.get_vectorstore_config()
+        manifest = IndexManifest(vectorstore_config.get('persist_directory')).load()
+        probe = EmbeddingProbe(vectorstore_config.get('persist_directory')).load()
+        # Kept in sync whatever the search type, so switching to hybrid
+        # search later never reads a stale BM25 index
+        lexical_index = BM25Index(vectorstore_config.get('persist_directory')).load()
+
+        reset = full or not manifest.exists or not lexical_index.exists
+        if reset:
+            # Without a manifest the existing chunks cannot be tracked, so
+            # start from an empty index to avoid duplicates. The same goes
+            # for a lexical index that was never built.
+            print("Creating new vector store...")
+            self.vectorstore = self.vectorstore_factory.reset(vectorstore_config, self.embedding)
+            manifest.clear()
+            lexical_index.clear()
         else:
-            raise ValueError(f"Invalid path: {file_path}")
+            # New chunks must land in the same vector space as the old ones
+            self._check_embedding_compatibility(probe)
+            self.vectorstore = self.vectorstore_factory.create(vectorstore_config, self.embedding)
+
+        processing_config = self.config_loader.get_document_processing_config()
+        indexer = DocumentIndexer(
+            self.vectorstore,
+            self.text_splitter,
+            manifest,
+            loader_workers=processing_config.get('loader_workers', 1),
+            batch_size=processing_config.get('ingest_batch_size', 64),
+            max_pending=processing_config.get('ingest_max_pending') or None,
+            persist=(
+                (lambda: self.vectorstore_factory.persist(vectorstore_config, self.vectorstore))
+                if self.vectorstore_factory.requires_persist(vectorstore_config) else None
+            ),
+            lexical_index=lexical_index
+        )
+        stats = indexer.index(file_path)
+        self.lexical_index = lexical_index
+
+        if reset:
+            embedding_config = self.config_loader.get_embedding_config()
+            probe.record(self.embedding, self.embedding_factory.cache_namespace(embedding_config))
+            probe.save()
+
+        if self.config_loader.get_retrieval_config().get('routing_enabled'):
+            # Routes are derived from the manifest, so files indexed before
+            # routing was enabled get one too
+            self.policy_router = self._create_policy_router().load()
+            self.policy_router.sync(
+                [entry.get('source', key) for key, entry in manifest.files.items()],
+                self.embedding
+            )
+            self.policy_router.save()
 
-        #print(f"Loaded {len(documents)} document(s)")
+        # The retriever must be rebuilt on top of the new vector store and
+        # answers generated from the old index are stale
+        self.rag_chain = None
+        if self.answer_cache is not None:
+            self.answer_cache.clear()
 
-        # Split documents
-        print("Splitting documents into chunks...")
-        split_docs = self.text_splitter.split_documents(documents)
-        print(f"Created {len(split_docs)} chunks")
+        get_metrics().log('index', path=file_path, full=full, **stats)
 
-        # Create vector store
-        print("Creating vector store and indexing documents...")
-        self.vectorstore = self.vectorstore_factory.create(
-            self.config_loader.get_vectorstore_config(),
-            self.embedding,
-            split_docs
+        print(
+            f"Added {stats['added']}, updated {stats['updated']}, removed {stats['removed']}, "
+            f"unchanged {stats['unchanged']}, failed {stats['failed']} file(s); "
+            f"wrote {stats['chunks']} chunks"
         )
-
         print("Indexing complete!")
+        return stats
 
     def load_vectorstore(self) -> None:
-        """Load existing vector store from disk."""
+        """
+        Load existing vector store from disk.
+
+        Raises:
+            ValueError: If the configured embedding model is not compatible
+                with the one the index was built with
+        """
         print("Loading existing vector store...")
+        self._check_embedding_compatibility(
+            EmbeddingProbe(self.config_loader.get_vectorstore_config().get('persist_directory')).load()
+        )
         self.vectorstore = self.vectorstore_factory.create(
             self.config_loader.get_vectorstore_config(),
-            self.embedding
+            self.embedding,
+            read_only=True
         )
+        self.lexical_index = None
+        self.policy_router = None
         print("Vector store loaded!")
 
+    def _check_embedding_compatibility(self, probe: EmbeddingProbe) -> None:
+        """
+        Check that the configured embedding model matches the index.
+
+        Indexes built before probes were recorded are not checked.
+
+        Args:
+            probe: Probe recorded when the index was built
+
+        Raises:
+            ValueError: If the model embeds the probe sentences differently
+        """
+        embedding_config = self.config_loader.get_embedding_config()
+        namespace = self.embedding_factory.cache_namespace(embedding_config)
+        similarity = probe.similarity(self.embedding, namespace)
+        if similarity is None or namespace == probe.namespace:
+            return
+
+        min_similarity = embedding_config.get('probe_min_similarity', 0.98)
+        if similarity < min_similarity:
+            raise ValueError(
+                f"Embedding model {namespace} is not compatible with the index built with "
+                f"{probe.namespace} (probe similarity {similarity:.4f} < {min_similarity}). "
+                "Run 'python main.py index --full' to re-embed the documents."
+            )
+        print(f"Embedding model {namespace} is compatible with the index built with "
+              f"{probe.namespace} (probe similarity {similarity:.4f})")
+
+    def _create_policy_router(self) -> PolicyRouter:
+        """Create a policy router from the retrieval configuration."""
+        retrieval_config = self.config_loader.get_retrieval_config()
+        return PolicyRouter(
+            self.config_loader.get_vectorstore_config().get('persist_directory'),
+            max_sources=retrieval_config.get('routing_max_sources', 2),
+            min_similarity=retrieval_config.get('routing_min_similarity', 0.6),
+            min_margin=retrieval_config.get('routing_min_margin', 0.05)
+        )
+
+    def _route(self, question: str, query_embedding: Optional[List[float]]) -> Optional[List[str]]:
+        """
+        Pick the policy documents to restrict a search to, if routing is enabled.
+
+        Args:
+            question: Question to route
+            query_embedding: Question embedding
+
+        Returns:
+            Sources to search, or None for a global search
+        """
+        if query_embedding is None or not self.config_loader.get_retrieval_config().get('routing_enabled'):
+            return None
+        if self.policy_router is None:
+            self.policy_router = self._create_policy_router().load()
+        return self.policy_router.route(question, query_embedding)
+
+    def _routing_missed(
+            self,
+            sources: Optional[List[str]],
+            documents: List[Document],
+            query_embedding: List[float]
+    ) -> bool:
+        """
+        Check whether a routed search should be redone over everything.
+
+        It should when the routed documents returned nothing, or nothing
+        relevant enough, as when a question was routed on a word that its
+        real topic's title does not contain.
+
+        Args:
+            sources: Sources the search was restricted to, or None
+            documents: Documents the routed search returned
+            query_embedding: Question embedding
+
+        Returns:
+            True if the search should be repeated without the restriction
+        """
+        if not sources:
+            return False
+        if not documents:
+            return True
+        min_relevance = self.config_loader.get_retrieval_config().get('routing_min_relevance', 0.2)
+        relevance = self.retriever.best_relevance(query_embedding, sources)
+        return relevance is not None and relevance < min_relevance
+
+    def _uses_lexical_index(self) -> bool:
+        """Check whether the configured search type needs the BM25 index."""
+        return self.config_loader.get_retrieval_config().get('search_type') == 'hybrid'
+
+    def _load_lexical_index(self) -> Optional[BM25Index]:
+        """
+        Get the BM25 index for hybrid search.
+
+        Returns:
+            The lexical index, or None if the search type does not use one
+
+        Raises:
+            ValueError: If hybrid search is configured but no index was built
+        """
+        if not self._uses_lexical_index():
+            return None
+        if self.lexical_index is None:
+            persist_directory = self.config_loader.get_vectorstore_config().get('persist_directory')
+            self.lexical_index = BM25Index(persist_directory).load()
+        if not self.lexical_index.exists:
+            raise ValueError(
+                "Hybrid search needs a lexical index. "
+                "Run 'python main.py index --full' to build it."
+            )
+        return self.lexical_index
+
     def _initialize_rag_chain(self) -> None:
         """Initialize the RAG chain with retriever and LLM."""
         if self.vectorstore is None:
             raise ValueError("Vector store not initialized. Call index_documents() or load_vectorstore() first.")
 
-        # Create retriever
+        # Create retriever, over-fetching candidates when they will be reranked
+        retrieval_config = dict(self.config_loader.get_retrieval_config())
+        if self.reranker is not None:
+            retrieval_config['top_k'] = max(self.reranker.candidates, self.top_k)
+
         self.retriever = Retriever(
             self.vectorstore,
-            self.config_loader.get_retrieval_config()
+            retrieval_config,
+            lexical_index=self._load_lexical_index()
         )
 
         # Create RAG prompt template with system message
@@ -125,47 +352,625 @@ Employee Question: {question}
 
 Please provide a helpful answer based on the context above:"""
 
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", system_prompt),
+        self.prompt = ChatPromptTemplate.from_messages([
+            self._system_message(system_prompt),
             ("human", human_prompt)
         ])
 
-        # Create RAG chain
-        def format_docs(docs: List[Document]) -> str:
-            #print(f"Context: {docs}")
-            return "\n\n".join(doc.page_content for doc in docs)
-
-        self.rag_chain = (
-                {
-                    "context": lambda x: format_docs(self.retriever.retrieve(x["question"])),
-                    "question": lambda x: x["question"]
-                }
-                | prompt
-                | self.llm
-                | StrOutputParser()
+        # The chain only generates; retrieval happens once in query() and the
+        # formatted documents are passed in as "context".
+        self.answer_chain = self.llm | StrOutputParser()
+        self.rag_chain = self.prompt | self.answer_chain
+
+    def _system_message(self, system_prompt: str) -> Any:
+        """
+        Build the system message, marked for provider prompt caching if enabled.
+
+        The system prompt is the same on every request and comes first, so it
+        is the cacheable prefix. Anthropic caches up to an explicit
+        cache_control breakpoint on the system block. OpenAI caches long
+        prompt prefixes automatically, so it needs no marker.
+
+        Args:
+            system_prompt: System prompt text
+
+        Returns:
+            Message or message template for ChatPromptTemplate
+        """
+        llm_config = self.config_loader.get_llm_config()
+        if llm_config.get('prompt_caching') and llm_config.get('type', '').lower() == LLMType.ANTHROPIC:
+            return SystemMessage(content=[
+                {"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}
+            ])
+        return "system", system_prompt
+
+    @staticmethod
+    def format_docs(docs: List[Document]) -> str:
+        """
+        Format retrieved documents into the prompt context.
+
+        Args:
+            docs: Retrieved documents
+
+        Returns:
+            Context string
+        """
+        return "\n\n".join(doc.page_content for doc in docs)
+
+    def _embed_question(self, question: str, timings: Dict[str, float]) -> Optional[List[float]]:
+        """
+        Embed a question once for the answer cache and the vector search.
+
+        Args:
+            question: Question to embed
+            timings: Timing dictionary updated in place
+
+        Returns:
+            Question embedding, or None if the retriever cannot search by vector
+        """
+        if not self.retriever.supports_vector_search():
+            timings['embed'] = 0.0
+            return None
+
+        start = time.perf_counter()
+        query_embedding = self.retriever.embed_query(question)
+        timings['embed'] = time.perf_counter() - start
+        return query_embedding
+
+    def _search(
+            self,
+            question: str,
+            query_embedding: Optional[List[float]],
+            timings: Dict[str, float]
+    ) -> List[Document]:
+        """
+        Search the vector store, recording search time.
+
+        Args:
+            question: Question to retrieve documents for
+            query_embedding: Question embedding from _embed_question
+            timings: Timing dictionary updated in place
+
+        Returns:
+            List of relevant Document objects
+        """
+        start = time.perf_counter()
+        if query_embedding is None:
+            documents = self.retriever.retrieve(question)
+        else:
+            sources = self._route(question, query_embedding)
+            documents = self.retriever.retrieve_by_vector(query_embedding, question, sources)
+            if self._routing_missed(sources, documents, query_embedding):
+                # The routed documents had nothing relevant; search everything
+                documents = self.retriever.retrieve_by_vector(query_embedding, question)
+        timings['search'] = time.perf_counter() - start
+        return documents
+
+    def _retrieve(self, question: str, timings: Dict[str, float]) -> List[Document]:
+        """
+        Retrieve documents for a question, recording embed and search time.
+
+        Args:
+            question: Question to retrieve documents for
+            timings: Timing dictionary updated in place
+
+        Returns:
+            List of relevant Document objects
+        """
+        return self._search(question, self._embed_question(question, timings), timings)
+
+    def _index_version(self) -> Optional[Tuple[int, int]]:
+        """Get a value that changes whenever the index manifest is rewritten."""
+        manifest_path = IndexManifest(self.config_loader.get_vectorstore_config().get('persist_directory')).path
+        try:
+            stat = manifest_path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def warmup(self, question: str = "What is the leave policy?") -> None:
+        """
+        Warm up the pipeline so the first real query does not pay cold start.
+
+        Builds the RAG chain, loads the embedding model and touches the vector
+        store with one retrieval. The LLM is not called.
+
+        Args:
+            question: Probe question used for the warmup retrieval
+        """
+        if self.rag_chain is None:
+            self._initialize_rag_chain()
+
+        self._retrieve(question, {})
+
+    def _lookup_exact(self, question: str) -> Optional[Dict[str, Any]]:
+        """Look up a question in the answer cache by normalised text."""
+        if self.answer_cache is None:
+            return None
+
+        # A rebuilt index (in any process) invalidates cached answers
+        self.answer_cache.validate(self._index_version())
+        entry = self.answer_cache.get_exact(question)
+        if entry is None:
+            return None
+        return {'cache_hit': 'exact', 'answer': entry['answer'],
+                'source_documents': entry['source_documents']}
+
+    def _lookup_similar(self, query_embedding: Optional[List[float]]) -> Optional[Dict[str, Any]]:
+        """Look up the most similar cached question by embedding."""
+        if self.answer_cache is None or query_embedding is None:
+            return None
+
+        match = self.answer_cache.get_similar(query_embedding)
+        if match is None:
+            return None
+        return {'cache_hit': 'semantic', 'answer': match[0]['answer'],
+                'source_documents': match[0]['source_documents']}
+
+    def _build_prompt(
+            self,
+            question: str,
+            relevant_docs: List[Document],
+            query_embedding: Optional[List[float]],
+            timings: Dict[str, float]
+    ) -> Dict[str, Any]:
+        """Rerank the retrieved documents if enabled and build the prompt, recording both times."""
+        if self.reranker is not None:
+            start = time.perf_counter()
+            relevant_docs = self.reranker.rerank(question, relevant_docs, self.top_k)
+            timings['rerank'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        if self.context_builder is not None:
+            context, context_stats = self.context_builder.build(relevant_docs)
+        else:
+            context, context_stats = self.format_docs(relevant_docs), None
+        prompt_value = self.prompt.invoke({
+            "context": context,
+            "question": question
+        })
+        timings['prompt'] = time.perf_counter() - start
+
+        return {
+            'cache_hit': None,
+            'source_documents': relevant_docs,
+            'prompt_value': prompt_value,
+            'query_embedding': query_embedding,
+            'context': context_stats
+        }
+
+    def _prepare(self, question: str, timings: Dict[str, float]) -> Dict[str, Any]:
+        """
+        Run everything before generation: cache lookups, retrieval and prompt.
+
+        Args:
+            question: Question to ask
+            timings: Timing dictionary updated in place
+
+        Returns:
+            Dictionary with cache_hit ('exact', 'semantic' or None) and
+            source_documents; on a cache hit also the cached answer, otherwise
+            the prompt_value and query_embedding for generation
+        """
+        if self.rag_chain is None:
+            self._initialize_rag_chain()
+
+        cached = self._lookup_exact(question)
+        if cached is not None:
+            return cached
+
+        query_embedding = self._embed_question(question, timings)
+
+        cached = self._lookup_similar(query_embedding)
+        if cached is not None:
+            return cached
+
+        relevant_docs = self._search(question, query_embedding, timings)
+        return self._build_prompt(question, relevant_docs, query_embedding, timings)
+
+    async def _aprepare(self, question: str, timings: Dict[str, float]) -> Dict[str, Any]:
+        """
+        Async variant of _prepare using the async embedder and vector store.
+
+        Args:
+            question: Question to ask
+            timings: Timing dictionary updated in place
+
+        Returns:
+            Same dictionary as _prepare
+        """
+        if self.rag_chain is None:
+            self._initialize_rag_chain()
+
+        cached = self._lookup_exact(question)
+        if cached is not None:
+            return cached
+
+        query_embedding = None
+        timings['embed'] = 0.0
+        if self.retriever.supports_vector_search():
+            start = time.perf_counter()
+            query_embedding = await self.retriever.aembed_query(question)
+            timings['embed'] = time.perf_counter() - start
+
+        cached = self._lookup_similar(query_embedding)
+        if cached is not None:
+            return cached
+
+        start = time.perf_counter()
+        if query_embedding is None:
+            relevant_docs = await self.retriever.aretrieve(question)
+        else:
+            sources = self._route(question, query_embedding)
+            relevant_docs = await self.retriever.aretrieve_by_vector(query_embedding, question, sources)
+            if sources and await asyncio.to_thread(self._routing_missed, sources, relevant_docs, query_embedding):
+                relevant_docs = await self.retriever.aretrieve_by_vector(query_embedding, question)
+        timings['search'] = time.perf_counter() - start
+
+        # Reranking and context packing are CPU-bound; keep them off the event loop
+        return await asyncio.to_thread(self._build_prompt, question, relevant_docs, query_embedding, timings)
+
+    def _async_semaphore(self) -> asyncio.Semaphore:
+        """Get the concurrency-limiting semaphore for the running event loop."""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    def _embedding_cache_samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        """Export the embedding cache counters."""
+        embedding = self.embedding.underlying if isinstance(self.embedding, InstrumentedEmbeddings) else self.embedding
+        if not isinstance(embedding, CachedEmbeddings):
+            return []
+        return [
+            ('rag_embedding_cache_lookups_total', {'result': 'memory_hit'}, embedding.memory_hits),
+            ('rag_embedding_cache_lookups_total', {'result': 'disk_hit'}, embedding.disk_hits),
+            ('rag_embedding_cache_lookups_total', {'result': 'miss'}, embedding.misses)
+        ]
+
+    def _rerank_cache_samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        """Export the reranker score cache counters."""
+        return [
+            ('rag_rerank_cache_lookups_total', {'result': 'hit'}, self.reranker.hits),
+            ('rag_rerank_cache_lookups_total', {'result': 'miss'}, self.reranker.misses)
+        ]
+
+    def _record_query(self, operation: str, question: str, result: Dict[str, Any]) -> None:
+        """
+        Export a finished query's stage timings, cache result and token usage.
+
+        Args:
+            operation: Pipeline method that answered (query, stream, batch,
+                aquery or astream)
+            question: Question asked
+            result: Query result or final stream event
+        """
+        metrics = get_metrics()
+        if not metrics.enabled:
+            return
+
+        for stage, seconds in result['timings'].items():
+            metrics.observe('rag_query_stage_seconds', seconds, operation=operation, stage=stage)
+        metrics.inc('rag_queries_total', operation=operation)
+        if self.answer_cache is not None:
+            metrics.inc('rag_answer_cache_lookups_total', result=result['cache_hit'] or 'miss')
+        for kind, tokens in (result.get('usage') or {}).items():
+            metrics.inc('rag_llm_tokens_total', tokens, type=kind[:-len('_tokens')])
+
+        # The question itself is not logged; HR questions can be personal
+        metrics.log(
+            'query',
+            operation=operation,
+            question_chars=len(question),
+            timings=result['timings'],
+            cache_hit=result['cache_hit'],
+            context=result.get('context'),
+            usage=result.get('usage')
         )
 
     def query(self, question: str) -> Dict[str, Any]:
         """
         Query the RAG system.
 
+        Documents are retrieved once and used both as the prompt context and
+        as the returned sources. When the answer cache is enabled, repeated
+        or near-identical questions are answered from it without retrieval
+        or an LLM call.
+
         Args:
             question: Question to ask
 
         Returns:
-            Dictionary containing answer and source documents
+            Dictionary containing answer, source documents, per-stage timings
+            in seconds (embed, search, rerank when enabled, prompt, llm,
+            total), cache_hit ('exact', 'semantic' or None), context
+            packing statistics (tokens, tokens_saved, chunks_dropped; None
+            on a cache hit or with packing disabled) and LLM token usage
+            (input_tokens, output_tokens, cache_read_tokens,
+            cache_creation_tokens; None if no LLM call reported usage)
         """
-        if self.rag_chain is None:
-            self._initialize_rag_chain()
+        query_start = time.perf_counter()
+        timings: Dict[str, float] = {}
+        usage = UsageTracker()
 
-        # Retrieve relevant documents
-        relevant_docs = self.retriever.retrieve(question)
+        prepared = self._prepare(question, timings)
 
-        # Generate answer
-        answer = self.rag_chain.invoke({"question": question})
+        if prepared['cache_hit'] is None:
+            # Generate answer
+            start = time.perf_counter()
+            answer = self.answer_chain.invoke(prepared['prompt_value'], config={'callbacks': [usage]})
+            timings['llm'] = time.perf_counter() - start
 
-        return {
+            if self.answer_cache is not None:
+                self.answer_cache.put(question, prepared['query_embedding'], answer, prepared['source_documents'])
+        else:
+            answer = prepared['answer']
+
+        timings['total'] = time.perf_counter() - query_start
+
+        result = {
             "question": question,
             "answer": answer,
-            "source_documents": relevant_docs
-        }
\ No newline at end of file
+            "source_documents": prepared['source_documents'],
+            "timings": timings,
+            "cache_hit": prepared['cache_hit'],
+            "context": prepared.get('context'),
+            "usage": usage.summary()
+        }
+        self._record_query('query', question, result)
+        return result
+
+    def stream_query(self, question: str) -> Iterator[Dict[str, Any]]:
+        """
+        Query the RAG system, streaming the answer as it is generated.
+
+        Args:
+            question: Question to ask
+
+        Yields:
+            Events as dictionaries, in order:
+            {"type": "sources", "source_documents": [...]} once,
+            {"type": "token", "content": str} for each answer chunk, and
+            {"type": "done", "answer": str, "timings": {...}, "cache_hit": ...,
+            "context": {...}, "usage": {...}} at the end. Timings include
+            first_token, the time until the first answer chunk was available.
+        """
+        query_start = time.perf_counter()
+        timings: Dict[str, float] = {}
+        usage = UsageTracker()
+
+        prepared = self._prepare(question, timings)
+        yield {"type": "sources", "source_documents": prepared['source_documents']}
+
+        if prepared['cache_hit'] is None:
+            start = time.perf_counter()
+            chunks = []
+            for chunk in self.answer_chain.stream(prepared['prompt_value'], config={'callbacks': [usage]}):
+                if not chunk:
+                    continue
+                if not chunks:
+                    timings['first_token'] = time.perf_counter() - query_start
+                chunks.append(chunk)
+                yield {"type": "token", "content": chunk}
+            timings['llm'] = time.perf_counter() - start
+            answer = "".join(chunks)
+
+            if self.answer_cache is not None:
+                self.answer_cache.put(question, prepared['query_embedding'], answer, prepared['source_documents'])
+        else:
+            answer = prepared['answer']
+            timings['first_token'] = time.perf_counter() - query_start
+            yield {"type": "token", "content": answer}
+
+        timings['total'] = time.perf_counter() - query_start
+
+        done = {
+            "type": "done",
+            "answer": answer,
+            "timings": timings,
+            "cache_hit": prepared['cache_hit'],
+            "context": prepared.get('context'),
+            "usage": usage.summary()
+        }
+        self._record_query('stream', question, done)
+        yield done
+
+    def batch_query(self, questions: List[str], max_concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Answer many questions together.
+
+        Each distinct question is embedded once, their vector searches run
+        together, and LLM calls are dispatched on a bounded thread pool.
+
+        Args:
+            questions: Questions to ask
+            max_concurrency: Maximum concurrent searches and LLM calls
+                (defaults to QUERY_MAX_CONCURRENCY)
+
+        Returns:
+            One result per question, in input order, shaped like query().
+            The embed and search timings are the batch time divided evenly
+            across the questions that needed them; total is the time from
+            the start of the batch until that question was answered. A
+            question whose LLM call failed has answer None and the error
+            message under 'error'; the other questions are still answered.
+        """
+        if self.rag_chain is None:
+            self._initialize_rag_chain()
+
+        max_concurrency = max_concurrency or self.max_concurrency
+        batch_start = time.perf_counter()
+        timings: List[Dict[str, float]] = [{} for _ in questions]
+        prepared: List[Optional[Dict[str, Any]]] = [self._lookup_exact(q) for q in questions]
+        pending = [i for i, p in enumerate(prepared) if p is None]
+
+        # Embed every remaining question up front
+        embeddings: Dict[int, List[float]] = {}
+        if pending and self.retriever.supports_vector_search():
+            start = time.perf_counter()
+            vectors = self.retriever.embed_queries([questions[i] for i in pending])
+            elapsed = (time.perf_counter() - start) / len(pending)
+            for i, vector in zip(pending, vectors):
+                embeddings[i] = vector
+                timings[i]['embed'] = elapsed
+                prepared[i] = self._lookup_similar(vector)
+            pending = [i for i in pending if prepared[i] is None]
+
+        # Run the remaining searches together
+        if pending:
+            start = time.perf_counter()
+            if embeddings:
+                sources = [self._route(questions[i], embeddings[i]) for i in pending]
+                document_lists = self.retriever.retrieve_by_vectors(
+                    [embeddings[i] for i in pending], max_concurrency, [questions[i] for i in pending], sources
+                )
+                for n, i in enumerate(pending):
+                    if self._routing_missed(sources[n], document_lists[n], embeddings[i]):
+                        document_lists[n] = self.retriever.retrieve_by_vector(embeddings[i], questions[i])
+            else:
+                document_lists = [self.retriever.retrieve(questions[i]) for i in pending]
+            elapsed = (time.perf_counter() - start) / len(pending)
+            for i, relevant_docs in zip(pending, document_lists):
+                timings[i].setdefault('embed', 0.0)
+                timings[i]['search'] = elapsed
+                prepared[i] = self._build_prompt(questions[i], relevant_docs, embeddings.get(i), timings[i])
+
+        def generate(i: int) -> Dict[str, Any]:
+            question = questions[i]
+            entry = prepared[i]
+            usage = UsageTracker()
+            error = None
+
+            if entry['cache_hit'] is None:
+                start = time.perf_counter()
+                try:
+                    answer = self.answer_chain.invoke(entry['prompt_value'], config={'callbacks': [usage]})
+                except Exception as e:
+                    # One failed or rate-limited question must not discard the rest
+                    answer, error = None, str(e)
+                timings[i]['llm'] = time.perf_counter() - start
+
+                if self.answer_cache is not None and error is None:
+                    self.answer_cache.put(question, entry['query_embedding'], answer, entry['source_documents'])
+            else:
+                answer = entry['answer']
+
+            timings[i]['total'] = time.perf_counter() - batch_start
+            result = {
+                "question": question,
+                "answer": answer,
+                "source_documents": entry['source_documents'],
+                "timings": timings[i],
+                "cache_hit": entry['cache_hit'],
+                "context": entry.get('context'),
+                "usage": usage.summary()
+            }
+            if error is not None:
+                result['error'] = error
+            self._record_query('batch', question, result)
+            return result
+
+        with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as executor:
+            return list(executor.map(generate, range(len(questions))))
+
+    async def aquery(self, question: str) -> Dict[str, Any]:
+        """
+        Asynchronously query the RAG system.
+
+        Embedding, vector search and the LLM call are awaited, so one process
+        can overlap many in-flight questions. At most max_concurrency
+        questions run at once; the rest wait on a semaphore.
+
+        Args:
+            question: Question to ask
+
+        Returns:
+            Same dictionary as query()
+        """
+        async with self._async_semaphore():
+            query_start = time.perf_counter()
+            timings: Dict[str, float] = {}
+            usage = UsageTracker()
+
+            prepared = await self._aprepare(question, timings)
+
+            if prepared['cache_hit'] is None:
+                start = time.perf_counter()
+                answer = await self.answer_chain.ainvoke(prepared['prompt_value'], config={'callbacks': [usage]})
+                timings['llm'] = time.perf_counter() - start
+
+                if self.answer_cache is not None:
+                    self.answer_cache.put(question, prepared['query_embedding'], answer, prepared['source_documents'])
+            else:
+                answer = prepared['answer']
+
+            timings['total'] = time.perf_counter() - query_start
+
+            result = {
+                "question": question,
+                "answer": answer,
+                "source_documents": prepared['source_documents'],
+                "timings": timings,
+                "cache_hit": prepared['cache_hit'],
+                "context": prepared.get('context'),
+                "usage": usage.summary()
+            }
+            self._record_query('aquery', question, result)
+            return result
+
+    async def astream_query(self, question: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Asynchronously query the RAG system, streaming the answer.
+
+        Holds a concurrency slot until the stream is exhausted or closed.
+
+        Args:
+            question: Question to ask
+
+        Yields:
+            Same events as stream_query()
+        """
+        async with self._async_semaphore():
+            query_start = time.perf_counter()
+            timings: Dict[str, float] = {}
+            usage = UsageTracker()
+
+            prepared = await self._aprepare(question, timings)
+            yield {"type": "sources", "source_documents": prepared['source_documents']}
+
+            if prepared['cache_hit'] is None:
+                start = time.perf_counter()
+                chunks = []
+                async for chunk in self.answer_chain.astream(
+                        prepared['prompt_value'], config={'callbacks': [usage]}
+                ):
+                    if not chunk:
+                        continue
+                    if not chunks:
+                        timings['first_token'] = time.perf_counter() - query_start
+                    chunks.append(chunk)
+                    yield {"type": "token", "content": chunk}
+                timings['llm'] = time.perf_counter() - start
+                answer = "".join(chunks)
+
+                if self.answer_cache is not None:
+                    self.answer_cache.put(question, prepared['query_embedding'], answer, prepared['source_documents'])
+            else:
+                answer = prepared['answer']
+                timings['first_token'] = time.perf_counter() - query_start
+                yield {"type": "token", "content": answer}
+
+            timings['total'] = time.perf_counter() - query_start
+
+            done = {
+                "type": "done",
+                "answer": answer,
+                "timings": timings,
+                "cache_hit": prepared['cache_hit'],
+                "context": prepared.get('context'),
+                "usage": usage.summary()
+            }
+            self._record_query('astream', question, done)
+            yield done
@@ -1,7 +1,7 @@
 import os, json
 import streamlit as st
 from PIL import Image
-from rag.rag_pipeline import RAGPipeline
+from rag.pipeline_registry import get_pipeline, get_registry
 from dotenv import load_dotenv
 
 st.set_page_config(page_title="TechnoSphere HR App", layout="wide", initial_sidebar_state="collapsed")
@@ -76,6 +76,16 @@ if 'chat_history' not in st.session_state:
 if 'return_sources' not in st.session_state:
     st.session_state.return_sources = True
 
+# Warm the shared pipeline once per process so the first question is fast.
+# Reruns and other sessions reuse it through the registry.
+if not get_registry().health()['pipelines']:
+    try:
+        with st.spinner("Loading HR assistant..."):
+            get_pipeline()
+    except Exception:
+        # Errors are reported when a question is asked
+        pass
+
 # Header with logo
 logo_path = os.getenv('APP_LOGO_PATH', 'utils/logo/technospehere_logo.png')
 
@@ -184,18 +194,33 @@ query = st.chat_input(placeholder=placeholder)
 
 # Process the question
 if query and query.strip():
-    with st.spinner("🔍 Searching HR documents..."):
-        try:
-            pipeline = RAGPipeline()
-            pipeline.load_vectorstore()
-            result = pipeline.query(query)
-
-            # Add to chat history
-            st.session_state.chat_history.append((query, result['answer']))
-
-            # Rerun to show updated conversation
-            st.rerun()
-
-        except Exception as e:
-            st.error(f"Error: {str(e)}")
-            st.info("💡 Tip: Make sure documents are indexed and API keys are configured in .env file")
+    try:
+        with st.spinner("🔍 Searching HR documents..."):
+            pipeline = get_pipeline()
+            events = pipeline.stream_query(query)
+            # Sources arrive before any answer tokens
+            next(events)
+
+        st.markdown(f"**You:** {query}")
+        st.markdown("**Assistant:**")
+        answer_placeholder = st.empty()
+
+        # Render answer tokens as they arrive
+        answer = ""
+        for event in events:
+            if event['type'] == 'token':
+                answer += event['content']
+                answer_placeholder.markdown(answer + "▌")
+            elif event['type'] == 'done':
+                answer = event['answer']
+        answer_placeholder.markdown(answer)
+
+        # Add to chat history
+        st.session_state.chat_history.append((query, answer))
+
+        # Rerun to show updated conversation
+        st.rerun()
+
+    except Exception as e:
+        st.error(f"Error: {str(e)}")
+        st.info("💡 Tip: Make sure documents are indexed and API keys are configured in .env file")
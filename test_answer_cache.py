@@ -0,0 +1,62 @@
+"""
+Tests for the answer cache used by RAGPipeline.query.
+"""
+import time
+
+from rag.answer_cache import AnswerCache
+
+
+def make_cache(**overrides):
+    config = {'ttl_seconds': 3600, 'max_entries': 10, 'similarity_threshold': 0.9}
+    config.update(overrides)
+    return AnswerCache(config)
+
+
+def test_exact_match_ignores_case_punctuation_and_spacing():
+    cache = make_cache()
+    cache.put("What is the purpose of equal employment opportunity policy?", [1.0, 0.0], "answer", [])
+
+    entry = cache.get_exact("what is the purpose of  equal employment opportunity policy")
+
+    assert entry is not None
+    assert entry['answer'] == "answer"
+
+
+def test_semantic_match_respects_threshold():
+    cache = make_cache()
+    cache.put("gratuity eligibility", [1.0, 0.0], "answer", [])
+
+    assert cache.get_similar([0.99, 0.05]) is not None
+    assert cache.get_similar([0.5, 0.5]) is None
+
+
+def test_entries_expire_after_ttl():
+    cache = make_cache(ttl_seconds=1)
+    cache.put("leave policy", [1.0, 0.0], "answer", [])
+    cache._entries['leave policy']['created_at'] = time.time() - 5
+
+    assert cache.get_exact("leave policy") is None
+    assert cache.get_similar([1.0, 0.0]) is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = make_cache(max_entries=2)
+    cache.put("first", [1.0, 0.0], "1", [])
+    cache.put("second", [0.0, 1.0], "2", [])
+    cache.get_exact("first")
+    cache.put("third", [0.7, 0.7], "3", [])
+
+    assert cache.get_exact("second") is None
+    assert cache.get_exact("first") is not None
+
+
+def test_index_change_invalidates_entries():
+    cache = make_cache()
+    cache.validate((1, 100))
+    cache.put("leave policy", [1.0, 0.0], "answer", [])
+
+    cache.validate((1, 100))
+    assert cache.get_exact("leave policy") is not None
+
+    cache.validate((2, 120))
+    assert cache.get_exact("leave policy") is None
@@ -0,0 +1,66 @@
+"""
+Tests for answering questions concurrently with RAGPipeline.aquery.
+"""
+import asyncio
+import threading
+
+from langchain_core.language_models import FakeListChatModel
+
+IN_FLIGHT = {'current': 0, 'peak': 0}
+
+
+class SlowChatModel(FakeListChatModel):
+    """Answers after a delay, recording how many calls overlap."""
+
+    async def _agenerate(self, *args, **kwargs):
+        IN_FLIGHT['current'] += 1
+        IN_FLIGHT['peak'] = max(IN_FLIGHT['peak'], IN_FLIGHT['current'])
+        try:
+            await asyncio.sleep(0.05)
+            return await super()._agenerate(*args, **kwargs)
+        finally:
+            IN_FLIGHT['current'] -= 1
+
+
+def test_concurrent_queries_respect_the_bound_on_every_event_loop(make_pipeline):
+    pipeline = make_pipeline(SlowChatModel(responses=["Answer"]), QUERY_MAX_CONCURRENCY=3)
+    questions = [f"Question {i} about leave?" for i in range(10)]
+
+    async def ask_all():
+        return await asyncio.gather(*(pipeline.aquery(question) for question in questions))
+
+    # Each asyncio.run starts a new event loop, which gets its own semaphore
+    for _ in range(2):
+        IN_FLIGHT.update(current=0, peak=0)
+        results = asyncio.run(ask_all())
+
+        assert IN_FLIGHT['peak'] == 3
+        assert [result['question'] for result in results] == questions
+        assert all(result['answer'] == "Answer" for result in results)
+
+
+class ThreadRecordingReranker:
+    """Keeps the retrieved order, recording which thread reranked."""
+
+    candidates = 3
+    hits = misses = 0
+
+    def __init__(self):
+        self.threads = []
+
+    def rerank(self, question, documents, top_k):
+        self.threads.append(threading.get_ident())
+        return documents[:top_k]
+
+
+def test_reranking_runs_off_the_event_loop_thread(make_pipeline):
+    pipeline = make_pipeline(FakeListChatModel(responses=["Answer"]))
+    pipeline.reranker = ThreadRecordingReranker()
+
+    async def ask():
+        return threading.get_ident(), await pipeline.aquery("How much leave do I get?")
+
+    loop_thread, result = asyncio.run(ask())
+
+    assert result['answer'] == "Answer"
+    assert pipeline.reranker.threads and loop_thread not in pipeline.reranker.threads
@@ -0,0 +1,36 @@
+"""
+Tests for reading question batches.
+"""
+import json
+from pathlib import Path
+
+import pytest
+
+from utils.batch_io import read_questions
+
+HR_QUESTIONS = Path(__file__).parent / 'benchmarks' / 'hr_questions.json'
+
+
+def test_json_array_of_question_records():
+    with open(HR_QUESTIONS, 'r', encoding='utf-8') as f:
+        expected = [entry['question'] for entry in json.load(f)]
+
+    assert read_questions(str(HR_QUESTIONS)) == expected
+
+
+def test_jsonl_json_and_csv_formats(tmp_path):
+    (tmp_path / 'questions.jsonl').write_text('"How much leave?"\n\n{"question": " When is gratuity paid? "}\n')
+    (tmp_path / 'questions.json').write_text('["How much leave?", {"question": "When is gratuity paid?"}]')
+    (tmp_path / 'questions.csv').write_text('id,question\n1,How much leave?\n2,When is gratuity paid?\n')
+
+    for name in ('questions.jsonl', 'questions.json', 'questions.csv'):
+        assert read_questions(str(tmp_path / name)) == ["How much leave?", "When is gratuity paid?"]
+
+
+def test_invalid_json_batches_are_rejected(tmp_path):
+    (tmp_path / 'object.json').write_text('{"question": "How much leave?"}')
+    (tmp_path / 'numbers.json').write_text('[1, 2]')
+
+    for name in ('object.json', 'numbers.json'):
+        with pytest.raises(ValueError):
+            read_questions(str(tmp_path / name))
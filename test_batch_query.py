@@ -0,0 +1,70 @@
+"""
+Tests for answering many questions with RAGPipeline.batch_query.
+"""
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.language_models import FakeListChatModel
+
+from components.cached_embeddings import CachedEmbeddings
+from utils.batch_io import result_record
+
+
+class QueryAwareEmbedding(DeterministicFakeEmbedding):
+    """Embeds queries differently from documents, counting query calls."""
+
+    query_calls: list = []
+
+    def embed_query(self, text):
+        self.query_calls.append(text)
+        return super().embed_query("query: " + text)
+
+
+class FlakyChatModel(FakeListChatModel):
+    """Fails for questions about gratuity, like a rate-limited request."""
+
+    def _call(self, messages, *args, **kwargs):
+        if "Question: When is gratuity paid?" in messages[-1].content:
+            raise RuntimeError("429 Too Many Requests")
+        return super()._call(messages, *args, **kwargs)
+
+
+def test_batch_embeds_each_distinct_question_once_as_a_query(make_pipeline):
+    embedding = QueryAwareEmbedding(size=16)
+    embedding.query_calls = []
+    pipeline = make_pipeline(FakeListChatModel(responses=["Answer"]), embedding)
+    questions = ["How much leave do I get?", "When is gratuity paid?", "How much leave do I get?"]
+
+    results = pipeline.batch_query(questions)
+
+    assert sorted(embedding.query_calls) == sorted(set(questions))
+    assert [result['question'] for result in results] == questions
+    for question, result in zip(questions, results):
+        single = pipeline.retriever.retrieve(question)
+        assert [d.page_content for d in result['source_documents']] == [d.page_content for d in single]
+
+
+def test_cached_batch_uses_the_query_namespace(make_pipeline, tmp_path):
+    underlying = QueryAwareEmbedding(size=16)
+    underlying.query_calls = []
+    embedding = CachedEmbeddings(underlying, 'fake', str(tmp_path / 'cache'))
+    pipeline = make_pipeline(FakeListChatModel(responses=["Answer"]), embedding)
+
+    pipeline.batch_query(["How much leave do I get?", "When is gratuity paid?"])
+    misses = embedding.misses
+    vector = embedding.embed_query("How much leave do I get?")
+
+    assert embedding.misses == misses
+    assert vector == pytest.approx(underlying.embed_query("How much leave do I get?"), rel=1e-6)
+
+
+def test_failed_question_does_not_discard_the_others(make_pipeline):
+    pipeline = make_pipeline(FlakyChatModel(responses=["Answer"]))
+    questions = ["How much leave do I get?", "When is gratuity paid?", "How are travel claims filed?"]
+
+    results = pipeline.batch_query(questions)
+    records = [result_record(result) for result in results]
+
+    assert [record['answer'] for record in records] == ["Answer", None, "Answer"]
+    assert records[1]['error'] == "429 Too Many Requests"
+    assert records[1]['latency_seconds'] > 0
+    assert 'error' not in records[0] and 'error' not in records[2]
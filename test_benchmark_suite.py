@@ -0,0 +1,56 @@
+"""
+Tests for the benchmark suite's baseline comparison.
+"""
+from benchmarks.suite import compare, median_result
+
+CORPUS = {'files': 20, 'pages': 62, 'chunks': 108}
+
+
+def test_regressions_are_flagged_in_the_worse_direction_only():
+    baseline = {'1x': dict(CORPUS, load_pages_per_second=1000.0, cold_query_ms=100.0, peak_rss_mb=500.0)}
+    results = {'1x': dict(CORPUS, load_pages_per_second=700.0, cold_query_ms=60.0, peak_rss_mb=550.0)}
+
+    rows = {row['metric']: row for row in compare(results, baseline, tolerance=0.2)}
+
+    assert rows['load_pages_per_second']['regression']
+    assert not rows['cold_query_ms']['regression']
+    assert not rows['peak_rss_mb']['regression']
+
+
+def test_small_latency_changes_and_different_corpora_are_not_flagged():
+    baseline = {
+        '1x': dict(CORPUS, warm_query_p50_ms=2.0),
+        '10x': dict(CORPUS, chunks=1080, warm_query_p50_ms=2.0)
+    }
+    results = {
+        '1x': dict(CORPUS, warm_query_p50_ms=2.8),
+        '10x': dict(CORPUS, chunks=1200, warm_query_p50_ms=20.0)
+    }
+
+    rows = compare(results, baseline, tolerance=0.2)
+
+    assert [(row['scale'], row['regression']) for row in rows] == [('1x', False)]
+
+
+def test_noisy_metrics_use_their_own_tolerance():
+    baseline = {'1x': dict(CORPUS, startup_import_ms=800.0, cold_query_ms=150.0)}
+    results = {'1x': dict(CORPUS, startup_import_ms=1300.0, cold_query_ms=200.0)}
+
+    rows = {row['metric']: row for row in compare(results, baseline, tolerance=0.25)}
+
+    assert not rows['startup_import_ms']['regression']
+    assert rows['cold_query_ms']['regression']
+
+
+def test_repeated_runs_are_combined_by_median():
+    runs = [
+        dict(CORPUS, split_chunks_per_second=30000.0, cold_query_ms=150.0),
+        dict(CORPUS, split_chunks_per_second=18000.0, cold_query_ms=400.0),
+        dict(CORPUS, split_chunks_per_second=29000.0, cold_query_ms=160.0),
+    ]
+
+    result = median_result(runs)
+
+    assert result['split_chunks_per_second'] == 29000.0
+    assert result['cold_query_ms'] == 160.0
+    assert result['chunks'] == CORPUS['chunks']
@@ -0,0 +1,72 @@
+"""
+Tests for the BM25 index used by hybrid retrieval.
+"""
+import shutil
+from pathlib import Path
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from components.bm25_index import BM25Index
+from components.index_manifest import IndexManifest
+from rag.rag_pipeline import RAGPipeline
+
+
+def make_index(directory):
+    index = BM25Index(str(directory))
+    index.add(
+        [
+            Document(page_content="Gratuity is paid after five years of service.", metadata={'source': 'gratuity.pdf'}),
+            Document(page_content="Employees accrue paid leave every month.", metadata={'source': 'leave.pdf'}),
+            Document(page_content="The POSH committee handles harassment complaints.", metadata={'source': 'posh.pdf'}),
+        ],
+        ['g', 'l', 'p']
+    )
+    return index
+
+
+def test_exact_terms_rank_first(tmp_path):
+    index = make_index(tmp_path)
+
+    results = index.search("What is the POSH committee?", k=3)
+
+    assert results[0][0].metadata['source'] == 'posh.pdf'
+    assert all(score > 0 for _, score in results)
+
+
+def test_unmatched_query_returns_nothing(tmp_path):
+    assert make_index(tmp_path).search("travel reimbursement", k=3) == []
+
+
+def test_remove_and_reload(tmp_path):
+    index = make_index(tmp_path)
+    index.remove(['g'])
+    index.save()
+
+    loaded = BM25Index(str(tmp_path)).load()
+
+    assert loaded.exists
+    assert len(loaded) == 2
+    assert loaded.search("gratuity", k=3) == []
+
+
+def test_indexing_keeps_bm25_in_sync_without_hybrid_search(pipeline_env, tmp_path):
+    pipeline_env(VECTORSTORE_TYPE='numpy', RETRIEVAL_SEARCH_TYPE='similarity')
+    pdfs = sorted(Path(__file__).parent.joinpath('data').glob('*.pdf'))[:2]
+    corpus = tmp_path / 'corpus'
+    corpus.mkdir()
+    shutil.copy(pdfs[0], corpus)
+
+    pipeline = RAGPipeline()
+    pipeline.embedding = DeterministicFakeEmbedding(size=16)
+    pipeline.index_documents(str(corpus))
+    shutil.copy(pdfs[1], corpus)
+    (corpus / pdfs[0].name).unlink()
+    pipeline.index_documents(str(corpus))
+
+    manifest = IndexManifest(str(tmp_path / 'index')).load()
+    lexical_index = BM25Index(str(tmp_path / 'index')).load()
+    assert lexical_index.exists
+    assert set(lexical_index.documents) == {
+        chunk_id for entry in manifest.files.values() for chunk_id in entry['chunk_ids']
+    }
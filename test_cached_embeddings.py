@@ -0,0 +1,103 @@
+"""
+Tests for the persistent embedding cache.
+"""
+from langchain_core.embeddings import DeterministicFakeEmbedding, Embeddings
+from langchain_openai import OpenAIEmbeddings
+
+from components.cached_embeddings import CachedEmbeddings
+from components.instrumented_embeddings import InstrumentedEmbeddings
+from components.numpy_store import NumpyVectorStore
+from components.retriever import Retriever
+from utils.metrics import Metrics
+
+
+class CountingEmbedding(Embeddings):
+    """Embeds like a deterministic model, recording the texts it is asked for."""
+
+    def __init__(self):
+        self.model = DeterministicFakeEmbedding(size=8)
+        self.documents = []
+        self.queries = []
+
+    def embed_documents(self, texts):
+        self.documents.extend(texts)
+        return self.model.embed_documents(texts)
+
+    def embed_query(self, text):
+        self.queries.append(text)
+        # Models such as E5 embed queries differently from documents
+        return self.model.embed_query("query: " + text)
+
+
+def test_lookups_fall_through_memory_then_disk_then_model(tmp_path):
+    underlying = CountingEmbedding()
+    cache = CachedEmbeddings(underlying, 'fake', str(tmp_path), memory_size=2)
+
+    first = cache.embed_documents(["leave", "gratuity", "travel"])
+    assert underlying.documents == ["leave", "gratuity", "travel"]
+    assert cache.stats()['misses'] == 3
+
+    # Only the two most recent vectors stay in memory
+    assert cache.embed_documents(["gratuity", "travel"]) == first[1:]
+    assert (cache.memory_hits, cache.disk_hits) == (2, 0)
+    assert cache.embed_documents(["leave"]) == first[:1]
+    assert (cache.memory_hits, cache.disk_hits) == (2, 1)
+
+    # A new instance starts with an empty memory and reads from disk
+    reopened = CachedEmbeddings(CountingEmbedding(), 'fake', str(tmp_path))
+    assert reopened.embed_documents(["leave", "gratuity", "travel"]) == first
+    assert (reopened.memory_hits, reopened.disk_hits, reopened.misses) == (0, 3, 0)
+    assert reopened.underlying.documents == []
+    assert underlying.documents == ["leave", "gratuity", "travel"]
+
+
+def test_queries_and_documents_are_cached_separately(tmp_path):
+    underlying = CountingEmbedding()
+    cache = CachedEmbeddings(underlying, 'fake', str(tmp_path))
+
+    document = cache.embed_documents(["annual leave"])[0]
+    query = cache.embed_query("annual leave")
+
+    assert query != document
+    assert underlying.queries == ["annual leave"]
+    assert cache.embed_query("annual leave") == query
+    assert cache.embed_documents(["annual leave"])[0] == document
+    assert underlying.queries == ["annual leave"]
+    assert underlying.documents == ["annual leave"]
+
+
+def test_models_are_cached_separately(tmp_path):
+    first = CachedEmbeddings(CountingEmbedding(), 'model-a', str(tmp_path))
+    first.embed_documents(["annual leave"])
+
+    second_model = CountingEmbedding()
+    CachedEmbeddings(second_model, 'model-b', str(tmp_path)).embed_documents(["annual leave"])
+
+    assert second_model.documents == ["annual leave"]
+
+
+def test_query_misses_are_embedded_in_one_model_call(tmp_path, monkeypatch):
+    calls = []
+    model = DeterministicFakeEmbedding(size=8)
+
+    def embed_documents(self, texts):
+        calls.append(list(texts))
+        return model.embed_documents(texts)
+
+    # OpenAI embeds queries like documents, so a batch of queries is one request
+    monkeypatch.setattr(OpenAIEmbeddings, 'embed_documents', embed_documents)
+    cache = CachedEmbeddings(OpenAIEmbeddings(api_key='test-key'), 'openai', str(tmp_path))
+    cache.embed_query("How much leave?")
+    calls.clear()
+
+    metrics = Metrics()
+    metrics.configure({'enabled': True})
+    embedding = InstrumentedEmbeddings(cache, metrics)
+    retriever = Retriever(NumpyVectorStore(embedding), {'search_type': 'similarity'})
+    questions = ["How much leave?", "When is gratuity paid?", "Who approves travel?", "When is gratuity paid?"]
+
+    vectors = retriever.embed_queries(questions)
+
+    assert calls == [["When is gratuity paid?", "Who approves travel?"]]
+    assert vectors == [cache.embed_query(question) for question in questions]
+    assert cache.misses == 3
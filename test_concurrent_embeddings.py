@@ -0,0 +1,48 @@
+"""
+Tests for embedding large document lists as concurrent batches.
+"""
+import random
+import threading
+import time
+
+from langchain_core.embeddings import DeterministicFakeEmbedding, Embeddings
+
+from components.concurrent_embeddings import ConcurrentEmbeddings
+
+
+class JitteryEmbedding(Embeddings):
+    """Embeds like a deterministic model, with a random delay per request."""
+
+    def __init__(self):
+        self.model = DeterministicFakeEmbedding(size=8)
+        self.batches = []
+        self._lock = threading.Lock()
+
+    def embed_documents(self, texts):
+        with self._lock:
+            self.batches.append(list(texts))
+        time.sleep(random.uniform(0, 0.02))
+        return self.model.embed_documents(texts)
+
+    def embed_query(self, text):
+        return self.model.embed_query(text)
+
+
+def test_vectors_keep_input_order_across_batches():
+    random.seed(7)
+    underlying = JitteryEmbedding()
+    texts = [f"chunk {i}" for i in range(103)]
+
+    vectors = ConcurrentEmbeddings(underlying, batch_size=10, max_concurrency=4).embed_documents(texts)
+
+    assert vectors == underlying.model.embed_documents(texts)
+    assert len(underlying.batches) == 11
+    assert all(len(batch) <= 10 for batch in underlying.batches)
+
+
+def test_single_batch_is_sent_directly():
+    underlying = JitteryEmbedding()
+
+    ConcurrentEmbeddings(underlying, batch_size=10, max_concurrency=4).embed_documents(["a", "b"])
+
+    assert underlying.batches == [["a", "b"]]
@@ -0,0 +1,69 @@
+"""
+Tests for packing retrieved chunks into the prompt context.
+"""
+from langchain_core.documents import Document
+
+from components.context_builder import ContextBuilder
+from utils.config_loader import ConfigLoader
+
+PAGE = {'source': 'leave.pdf', 'page': 0}
+
+
+def make_builder(**overrides):
+    config = {'max_tokens': 0, 'dedup_threshold': 0.9, 'trim_overlap': True, 'min_overlap_chars': 10}
+    config.update(overrides)
+    return ContextBuilder(config, {'type': 'anthropic'})
+
+
+def test_overlap_between_chunks_of_a_page_is_sent_once():
+    first = Document(page_content="Employees get twenty days of paid leave every year.", metadata=PAGE)
+    second = Document(page_content="paid leave every year. Unused leave lapses in March.", metadata=PAGE)
+
+    context, stats = make_builder().build([second, first])
+
+    assert context.count("paid leave every year") == 1
+    assert "Unused leave lapses in March." in context
+    assert stats['tokens_saved'] > 0
+
+
+def test_near_duplicate_chunks_are_dropped():
+    text = "Gratuity is payable after five years of continuous service with the company."
+    docs = [
+        Document(page_content=text, metadata={'source': 'a.pdf', 'page': 0}),
+        Document(page_content=text + " ", metadata={'source': 'b.pdf', 'page': 3}),
+    ]
+
+    context, stats = make_builder().build(docs)
+
+    assert context == text
+    assert stats['chunks_dropped'] == 1
+
+
+def test_context_fits_token_budget():
+    docs = [Document(page_content=f"Chunk {i} " + "word " * 50, metadata={'page': i}) for i in range(5)]
+    builder = make_builder(max_tokens=100)
+
+    context, stats = builder.build(docs)
+
+    assert stats['tokens'] <= 100
+    assert context.startswith("Chunk 0")
+
+
+def test_approximated_budget_leaves_a_safety_margin():
+    docs = [Document(page_content=f"Chunk {i} " + "word " * 50, metadata={'page': i}) for i in range(5)]
+    builder = make_builder(max_tokens=100)
+
+    context, stats = builder.build(docs)
+
+    # Anthropic token counts are approximated from characters
+    assert builder.approximate
+    assert stats['tokens'] <= 100 * ContextBuilder.APPROXIMATE_BUDGET_SHARE
+    assert len(context) <= 100 * ContextBuilder.APPROXIMATE_BUDGET_SHARE * ContextBuilder.CHARS_PER_TOKEN
+
+
+def test_packing_is_off_unless_enabled(monkeypatch):
+    monkeypatch.delenv('CONTEXT_PACKING_ENABLED', raising=False)
+    assert not ConfigLoader().get_context_config()['enabled']
+
+    monkeypatch.setenv('CONTEXT_PACKING_ENABLED', 'true')
+    assert ConfigLoader().get_context_config()['enabled']
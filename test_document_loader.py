@@ -0,0 +1,48 @@
+"""
+Tests for parsing PDFs across a process pool.
+"""
+import os
+import shutil
+from pathlib import Path
+
+from components import document_loader
+from components.document_loader import DocumentLoader, LoadReport
+
+PDFS = sorted(Path(__file__).parent.joinpath('data').glob('*.pdf'))
+PARSE_PDF = document_loader._parse_pdf
+
+
+def crashing_parse(file_path):
+    """Kill the worker on crash.pdf, like a segfault in the PDF parser."""
+    if Path(file_path).name == 'crash.pdf':
+        os._exit(1)
+    return PARSE_PDF(file_path)
+
+
+def test_parallel_parse_matches_in_process_parse():
+    paths = [str(pdf) for pdf in PDFS[:3]]
+
+    serial = {path: documents for path, documents, _ in DocumentLoader.iter_pdfs(paths)}
+    parallel = {path: documents for path, documents, _ in DocumentLoader.iter_pdfs(paths, max_workers=2)}
+
+    assert parallel.keys() == serial.keys()
+    for path in paths:
+        assert [d.page_content for d in parallel[path]] == [d.page_content for d in serial[path]]
+
+
+def test_crashed_worker_fails_its_file_without_aborting_the_load(tmp_path, monkeypatch):
+    monkeypatch.setattr(document_loader, '_parse_pdf', crashing_parse)
+    crash = tmp_path / 'crash.pdf'
+    shutil.copy(PDFS[0], crash)
+    paths = [str(crash)] + [str(pdf) for pdf in PDFS[:4]]
+    report = LoadReport()
+
+    # One file in flight at a time, so the crash takes down no other file
+    results = {path: (documents, error) for path, documents, error in
+               DocumentLoader.iter_pdfs(paths, max_workers=2, report=report, max_pending=1)}
+
+    assert results.keys() == set(paths)
+    assert list(report.failures) == [str(crash)]
+    assert report.failures[str(crash)].startswith('BrokenProcessPool')
+    # Files submitted after the crash go to a fresh pool and parse normally
+    assert all(error is None and documents for documents, error in list(results.values())[1:])
@@ -0,0 +1,52 @@
+"""
+Tests for creating embedding models from configuration.
+"""
+import langchain_huggingface
+import torch
+
+from factories import embedding_factory
+from factories.embedding_factory import EmbeddingFactory
+
+
+class FakeHuggingFaceEmbeddings:
+    """Stands in for the model class so no weights are downloaded."""
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+
+
+def test_zero_threads_restores_the_default_after_another_setting(monkeypatch):
+    monkeypatch.setattr(langchain_huggingface, 'HuggingFaceEmbeddings', FakeHuggingFaceEmbeddings)
+    monkeypatch.setattr(embedding_factory, '_default_torch_threads', None)
+    default = torch.get_num_threads()
+    factory = EmbeddingFactory()
+    config = {'type': 'huggingface', 'model_name': 'sentence-transformers/all-MiniLM-L6-v2'}
+
+    try:
+        factory.create(dict(config, num_threads=default + 3))
+        assert torch.get_num_threads() == default + 3
+
+        factory.create(dict(config, num_threads=0))
+        assert torch.get_num_threads() == default
+    finally:
+        torch.set_num_threads(default)
+
+
+def test_cache_namespace_changes_with_settings_that_change_vectors():
+    base = {'type': 'onnx', 'model_name': 'sentence-transformers/all-MiniLM-L6-v2'}
+
+    namespaces = {
+        EmbeddingFactory.cache_namespace(base),
+        EmbeddingFactory.cache_namespace(dict(base, normalize=True)),
+        EmbeddingFactory.cache_namespace(dict(base, onnx_quantization='avx2')),
+        EmbeddingFactory.cache_namespace(dict(base, onnx_quantization='avx512')),
+        EmbeddingFactory.cache_namespace(dict(base, onnx_quantization='avx2', normalize=True)),
+    }
+
+    assert len(namespaces) == 5
+    # Settings that do not change the vectors keep the namespace
+    assert EmbeddingFactory.cache_namespace(dict(base, batch_size=64, num_threads=4)) == \
+        EmbeddingFactory.cache_namespace(base)
+    # Quantization only applies to ONNX models
+    hf = dict(base, type='huggingface')
+    assert EmbeddingFactory.cache_namespace(dict(hf, onnx_quantization='avx2')) == EmbeddingFactory.cache_namespace(hf)
@@ -0,0 +1,50 @@
+"""
+Tests for detecting embedding models that do not match an index.
+"""
+from typing import List
+
+from langchain_core.embeddings import DeterministicFakeEmbedding, Embeddings
+
+from components.embedding_probe import EmbeddingProbe
+
+
+class PerturbedEmbedding(Embeddings):
+    """Embeds like another model, shifting the first dimension of each vector."""
+
+    def __init__(self, underlying: Embeddings, noise: float):
+        self.underlying = underlying
+        self.noise = noise
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [[vector[0] + self.noise] + vector[1:] for vector in self.underlying.embed_documents(texts)]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+def make_probe(directory):
+    probe = EmbeddingProbe(str(directory))
+    probe.record(DeterministicFakeEmbedding(size=32), 'huggingface:model')
+    probe.save()
+    return EmbeddingProbe(str(directory)).load()
+
+
+def test_missing_probe_is_not_checked(tmp_path):
+    assert EmbeddingProbe(str(tmp_path)).load().similarity(DeterministicFakeEmbedding(size=32), 'onnx:model') is None
+
+
+def test_same_namespace_is_compatible_without_embedding(tmp_path):
+    assert make_probe(tmp_path).similarity(DeterministicFakeEmbedding(size=8), 'huggingface:model') == 1.0
+
+
+def test_similarity_reflects_how_close_the_vectors_are(tmp_path):
+    probe = make_probe(tmp_path)
+    reference = DeterministicFakeEmbedding(size=32)
+
+    assert probe.similarity(reference, 'onnx:model') > 0.9999
+    assert 0.98 < probe.similarity(PerturbedEmbedding(reference, 0.5), 'onnx:model:qint8_avx2') < 1.0
+    assert probe.similarity(PerturbedEmbedding(reference, 30.0), 'onnx:other') < 0.5
+
+
+def test_dimension_mismatch_is_incompatible(tmp_path):
+    assert make_probe(tmp_path).similarity(DeterministicFakeEmbedding(size=16), 'openai:model') == 0.0
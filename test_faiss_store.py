@@ -0,0 +1,65 @@
+"""
+Tests for the persisted FAISS vector store.
+"""
+import faiss
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from components import faiss_store
+from components.faiss_store import MmapFAISS
+
+CONFIG = {'index_type': 'flat'}
+
+
+def save_store(folder):
+    embedding = DeterministicFakeEmbedding(size=16)
+    store = MmapFAISS.create_empty(embedding, CONFIG)
+    store.add_texts(
+        ["leave policy", "gratuity rules", "travel claims"],
+        metadatas=[{'source': 'leave.pdf'}, {'source': 'gratuity.pdf'}, {'source': 'travel.pdf'}]
+    )
+    store.save(str(folder), 'index')
+    return embedding
+
+
+def test_read_only_load_memory_maps_flat_index(tmp_path, monkeypatch):
+    embedding = save_store(tmp_path)
+    flags = []
+    read_index = faiss.read_index
+
+    def recording_read_index(path, *args):
+        flags.append(args[0] if args else 0)
+        return read_index(path, *args)
+
+    monkeypatch.setattr(faiss_store.faiss, 'read_index', recording_read_index)
+
+    mapped = MmapFAISS.load(str(tmp_path), 'index', embedding, CONFIG, read_only=True)
+
+    assert flags == [MmapFAISS.MMAP_FLAGS]
+    assert flags[0] & faiss.IO_FLAG_READ_ONLY
+    if hasattr(faiss, 'IO_FLAG_MMAP_IFC'):
+        assert flags[0] & faiss.IO_FLAG_MMAP_IFC == faiss.IO_FLAG_MMAP_IFC
+    assert mapped.read_only
+
+
+def test_read_only_store_searches_like_writable_store(tmp_path):
+    embedding = save_store(tmp_path)
+
+    mapped = MmapFAISS.load(str(tmp_path), 'index', embedding, CONFIG, read_only=True)
+    writable = MmapFAISS.load(str(tmp_path), 'index', embedding, CONFIG)
+
+    for query in ("gratuity rules", "travel claims"):
+        expected = [d.page_content for d in writable.similarity_search(query, k=3)]
+        assert [d.page_content for d in mapped.similarity_search(query, k=3)] == expected
+    assert not writable.read_only
+
+
+def test_read_only_store_rejects_changes(tmp_path):
+    embedding = save_store(tmp_path)
+    mapped = MmapFAISS.load(str(tmp_path), 'index', embedding, CONFIG, read_only=True)
+
+    with pytest.raises(ValueError):
+        mapped.add_texts(["new chunk"])
+    with pytest.raises(ValueError):
+        mapped.delete([next(iter(mapped.index_to_docstore_id.values()))])
+    assert mapped.index.ntotal == 3
@@ -0,0 +1,168 @@
+"""
+Tests for incremental indexing against the manifest.
+"""
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from components.index_manifest import IndexManifest
+from components.numpy_store import NumpyVectorStore
+from components.text_splitter import TextSplitter
+from rag.indexer import DocumentIndexer
+
+PDFS = sorted(Path(__file__).parent.joinpath('data').glob('*.pdf'))
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    directory = tmp_path / 'corpus'
+    directory.mkdir()
+    for pdf in PDFS[:2]:
+        shutil.copy(pdf, directory / pdf.name)
+    return directory
+
+
+def make_indexer(index_dir, vectorstore=None, **kwargs):
+    if vectorstore is None:
+        vectorstore = NumpyVectorStore(DeterministicFakeEmbedding(size=16))
+    return DocumentIndexer(
+        vectorstore,
+        TextSplitter({'chunk_size': 1000, 'chunk_overlap': 200}),
+        IndexManifest(str(index_dir)).load(),
+        **kwargs
+    )
+
+
+def manifest_ids(manifest):
+    return {key: entry['chunk_ids'] for key, entry in manifest.files.items()}
+
+
+def assert_in_sync(indexer, index_dir):
+    """The store holds exactly the manifest's chunks, and the saved manifest matches."""
+    ids = [chunk_id for entry in indexer.manifest.files.values() for chunk_id in entry['chunk_ids']]
+    assert len(indexer.vectorstore) == len(ids)
+    assert [document.id for document in indexer.vectorstore.get_by_ids(ids)] == ids
+    assert IndexManifest(str(index_dir)).load().files == indexer.manifest.files
+
+
+def test_unchanged_modified_added_and_deleted_files(corpus, tmp_path):
+    index_dir = tmp_path / 'index'
+    indexer = make_indexer(index_dir)
+    first, second = sorted(corpus.glob('*.pdf'))
+
+    stats = indexer.index(str(corpus))
+    assert (stats['added'], stats['chunks']) == (2, len(indexer.vectorstore))
+    assert set(indexer.manifest.files) == {IndexManifest.key(str(first)), IndexManifest.key(str(second))}
+    assert_in_sync(indexer, index_dir)
+    original = manifest_ids(indexer.manifest)
+
+    # Nothing changed: skipped from the stat call alone
+    stats = indexer.index(str(corpus))
+    assert (stats['unchanged'], stats['chunks']) == (2, 0)
+
+    # Touched but identical: the hash matches, so only the stat fields change
+    os.utime(first, ns=(first.stat().st_atime_ns, first.stat().st_mtime_ns + 10 ** 9))
+    stats = indexer.index(str(corpus))
+    assert (stats['unchanged'], stats['updated']) == (2, 0)
+    assert indexer.manifest.get(str(first))['mtime_ns'] == first.stat().st_mtime_ns
+    assert manifest_ids(indexer.manifest) == original
+
+    # Modified: the old chunks are replaced by the new version's
+    shutil.copy(PDFS[2], first)
+    stats = indexer.index(str(corpus))
+    assert stats['updated'] == 1
+    new_ids = indexer.manifest.get(str(first))['chunk_ids']
+    assert not set(new_ids) & set(original[IndexManifest.key(str(first))])
+    assert indexer.vectorstore.get_by_ids(original[IndexManifest.key(str(first))]) == []
+    assert_in_sync(indexer, index_dir)
+
+    # Added
+    added = corpus / PDFS[3].name
+    shutil.copy(PDFS[3], added)
+    stats = indexer.index(str(corpus))
+    assert (stats['added'], stats['unchanged']) == (1, 2)
+    assert_in_sync(indexer, index_dir)
+
+    # Deleted: its chunks leave the store and its entry leaves the manifest
+    removed_ids = indexer.manifest.get(str(second))['chunk_ids']
+    second.unlink()
+    stats = indexer.index(str(corpus))
+    assert stats['removed'] == 1
+    assert indexer.manifest.get(str(second)) is None
+    assert indexer.vectorstore.get_by_ids(removed_ids) == []
+    assert_in_sync(indexer, index_dir)
+
+
+def test_manifest_survives_a_new_indexer(corpus, tmp_path):
+    index_dir = tmp_path / 'index'
+    indexer = make_indexer(index_dir)
+    indexer.index(str(corpus))
+
+    reopened = make_indexer(index_dir, vectorstore=indexer.vectorstore)
+    stats = reopened.index(str(corpus))
+
+    assert (stats['unchanged'], stats['added'], stats['chunks']) == (2, 0, 0)
+    assert manifest_ids(reopened.manifest) == manifest_ids(indexer.manifest)
+
+
+def test_chunk_ids_depend_on_path_and_content():
+    ids = IndexManifest.chunk_ids('data/a.pdf', 'a' * 64, 3)
+
+    assert ids == IndexManifest.chunk_ids('data/a.pdf', 'a' * 64, 3)
+    assert len(set(ids)) == 3
+    assert not set(ids) & set(IndexManifest.chunk_ids('data/b.pdf', 'a' * 64, 3))
+    assert not set(ids) & set(IndexManifest.chunk_ids('data/a.pdf', 'b' * 64, 3))
+
+
+class RecordingStore(NumpyVectorStore):
+    """Records each upserted batch and the manifest saved on disk at that moment."""
+
+    def __init__(self, manifest_dir):
+        super().__init__(DeterministicFakeEmbedding(size=16))
+        self.manifest_dir = manifest_dir
+        self.batches = []
+
+    def add_documents(self, documents, **kwargs):
+        saved = IndexManifest(str(self.manifest_dir)).load()
+        self.batches.append((len(documents), len(saved.files)))
+        return super().add_documents(documents, **kwargs)
+
+
+def test_chunks_are_upserted_in_bounded_batches_with_checkpoints(tmp_path):
+    corpus = tmp_path / 'corpus'
+    corpus.mkdir()
+    for pdf in PDFS[:4]:
+        shutil.copy(pdf, corpus / pdf.name)
+    index_dir = tmp_path / 'index'
+    store = RecordingStore(index_dir)
+    indexer = make_indexer(index_dir, vectorstore=store, batch_size=4)
+
+    stats = indexer.index(str(corpus))
+
+    sizes = [size for size, _ in store.batches]
+    assert sum(sizes) == stats['chunks'] and all(size <= 4 for size in sizes)
+    assert len(sizes) > stats['added']
+    # Files finished in earlier batches are saved before later batches are written
+    saved = [files for _, files in store.batches]
+    assert saved == sorted(saved) and 0 < saved[-1] < stats['added']
+    assert_in_sync(indexer, index_dir)
+
+
+def test_unreadable_pdf_does_not_abort_the_run(corpus, tmp_path):
+    broken = corpus / 'broken.pdf'
+    broken.write_bytes(b'%PDF-1.4 not really a pdf')
+    index_dir = tmp_path / 'index'
+    indexer = make_indexer(index_dir, batch_size=4)
+
+    stats = indexer.index(str(corpus))
+
+    assert (stats['added'], stats['failed']) == (2, 1)
+    assert indexer.manifest.get(str(broken)) is None
+    assert_in_sync(indexer, index_dir)
+
+    # The failed file is retried on the next run; the others are skipped
+    stats = indexer.index(str(corpus))
+    assert (stats['unchanged'], stats['failed']) == (2, 1)
@@ -0,0 +1,53 @@
+"""
+Tests for metrics recording and export.
+"""
+import json
+
+from utils.metrics import DEFAULT_BUCKETS, Metrics
+
+
+def test_disabled_metrics_record_nothing():
+    metrics = Metrics()
+    metrics.inc('rag_queries_total', operation='query')
+    metrics.observe('rag_query_stage_seconds', 0.2, stage='llm')
+    with metrics.timer('rag_split_seconds'):
+        pass
+
+    assert metrics.render_prometheus() == ""
+
+
+def test_prometheus_export_of_counters_and_histograms():
+    metrics = Metrics()
+    metrics.configure({'enabled': True})
+    metrics.inc('rag_llm_tokens_total', 120, type='input')
+    metrics.inc('rag_llm_tokens_total', 30, type='input')
+    metrics.observe('rag_query_stage_seconds', 0.02, stage='search')
+    metrics.observe('rag_query_stage_seconds', 0.3, stage='search')
+    metrics.observe('rag_query_stage_seconds', 120.0, stage='search')
+    metrics.register_collector('cache', lambda: [('rag_rerank_cache_lookups_total', {'result': 'hit'}, 4)])
+
+    lines = metrics.render_prometheus().splitlines()
+
+    assert '# TYPE rag_llm_tokens_total counter' in lines
+    assert 'rag_llm_tokens_total{type="input"} 150' in lines
+    assert '# TYPE rag_query_stage_seconds histogram' in lines
+    assert 'rag_query_stage_seconds_bucket{stage="search",le="0.025"} 1' in lines
+    assert 'rag_query_stage_seconds_bucket{stage="search",le="0.5"} 2' in lines
+    assert f'rag_query_stage_seconds_bucket{{stage="search",le="{int(DEFAULT_BUCKETS[-1])}"}} 2' in lines
+    assert 'rag_query_stage_seconds_bucket{stage="search",le="+Inf"} 3' in lines
+    assert 'rag_query_stage_seconds_count{stage="search"} 3' in lines
+    assert 'rag_rerank_cache_lookups_total{result="hit"} 4' in lines
+
+
+def test_structured_logs_are_json_lines(tmp_path):
+    log_file = tmp_path / 'metrics.jsonl'
+    metrics = Metrics()
+    metrics.configure({'enabled': True, 'log_file': str(log_file)})
+    metrics.log('query', operation='query', timings={'llm': 0.5})
+    metrics.configure({'enabled': False})
+
+    records = [json.loads(line) for line in log_file.read_text().splitlines()]
+
+    assert len(records) == 1
+    assert records[0]['event'] == 'query'
+    assert records[0]['timings'] == {'llm': 0.5}
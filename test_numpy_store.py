@@ -0,0 +1,56 @@
+"""
+Tests for the in-process NumPy vector store.
+"""
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from components.numpy_store import NumpyVectorStore
+
+
+def make_store():
+    store = NumpyVectorStore(DeterministicFakeEmbedding(size=16))
+    store.add_texts(
+        ["leave policy", "gratuity rules", "travel claims"],
+        metadatas=[{'source': 'leave.pdf'}, {'source': 'gratuity.pdf'}, {'source': 'travel.pdf'}],
+        ids=['a', 'b', 'c']
+    )
+    return store
+
+
+def test_exact_text_ranks_first():
+    store = make_store()
+
+    results = store.similarity_search("gratuity rules", k=2)
+
+    assert results[0].page_content == "gratuity rules"
+    assert len(results) == 2
+
+
+def test_batched_search_matches_single_search():
+    store = make_store()
+    vectors = [store.embeddings.embed_query(q) for q in ("leave policy", "travel claims")]
+
+    batched = store.similarity_search_by_vectors(vectors, k=2)
+
+    for vector, docs in zip(vectors, batched):
+        single = store.similarity_search_by_vector(vector, k=2)
+        assert [d.page_content for d in docs] == [d.page_content for d in single]
+
+
+def test_delete_and_metadata_filter():
+    store = make_store()
+    store.delete(['a'])
+
+    results = store.similarity_search("leave policy", k=3, filter={'source': {'$in': ['travel.pdf']}})
+
+    assert len(store) == 2
+    assert [d.metadata['source'] for d in results] == ['travel.pdf']
+
+
+def test_save_and_memory_mapped_load(tmp_path):
+    store = make_store()
+    store.save(str(tmp_path), 'hr')
+
+    loaded = NumpyVectorStore.load(str(tmp_path), 'hr', store.embeddings, mmap=True)
+
+    assert len(loaded) == 3
+    assert loaded.similarity_search("travel claims", k=1)[0].metadata['source'] == 'travel.pdf'
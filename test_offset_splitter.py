@@ -0,0 +1,64 @@
+"""
+Tests for the offset text splitter.
+"""
+import random
+
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from components.offset_splitter import OffsetTextSplitter, split_spans
+from components.text_splitter import TextSplitter
+
+WORDS = ["leave", "policy", "employee", "x" * 40, " ", "  ", "\n", "\n\n", "\n\n\n", "\t", "days."]
+
+
+def test_spans_match_recursive_splitter():
+    rng = random.Random(7)
+    for _ in range(500):
+        chunk_size = rng.choice([5, 20, 50, 200])
+        chunk_overlap = rng.randint(0, chunk_size)
+        text = "".join(rng.choice(WORDS) + rng.choice(["", " "]) for _ in range(rng.randint(0, 150)))
+        expected = RecursiveCharacterTextSplitter(
+            chunk_size=chunk_size, chunk_overlap=chunk_overlap
+        ).split_text(text)
+
+        assert [text[start:end] for start, end in split_spans(text, chunk_size, chunk_overlap)] == expected
+
+
+def test_chunk_metadata_records_offsets_and_document():
+    text = "Annual leave is 20 days.\n\nSick leave is 10 days.\n\nUnused leave lapses at year end."
+    page = Document(page_content=text, metadata={'source': 'data/leave.pdf', 'page': 3})
+
+    chunks = TextSplitter({'chunk_size': 40, 'chunk_overlap': 0, 'splitter_mode': 'offset'}).split_documents([page])
+
+    assert [chunk.page_content for chunk in chunks] == [
+        "Annual leave is 20 days.", "Sick leave is 10 days.", "Unused leave lapses at year end."
+    ]
+    for chunk in chunks:
+        start, end = chunk.metadata['start_index'], chunk.metadata['end_index']
+        assert text[start:end] == chunk.page_content
+        assert chunk.metadata['page'] == 3
+        assert chunk.metadata['document_id'] == 'data/leave.pdf'
+
+
+def test_parallel_split_keeps_document_order():
+    pages = [Document(page_content=f"Page {i}. " * 30, metadata={'page': i}) for i in range(6)]
+    splitter = OffsetTextSplitter(chunk_size=100, chunk_overlap=10, workers=2)
+    try:
+        chunks = splitter.split_documents(pages)
+    finally:
+        splitter.close()
+
+    assert chunks == OffsetTextSplitter(chunk_size=100, chunk_overlap=10).split_documents(pages)
+    assert [chunk.metadata['page'] for chunk in chunks] == sorted(chunk.metadata['page'] for chunk in chunks)
+
+
+def test_generator_input_is_split():
+    pages = [Document(page_content=f"Page {i}. " * 30, metadata={'page': i}) for i in range(3)]
+    expected = TextSplitter({'chunk_size': 100, 'chunk_overlap': 10, 'splitter_mode': 'offset'}).split_documents(pages)
+
+    for mode in ('offset', 'recursive'):
+        splitter = TextSplitter({'chunk_size': 100, 'chunk_overlap': 10, 'splitter_mode': mode})
+        chunks = splitter.split_documents(page for page in pages)
+        assert [chunk.page_content for chunk in chunks] == [chunk.page_content for chunk in expected]
+    assert OffsetTextSplitter(chunk_size=100, chunk_overlap=10).split_documents(page for page in pages) == expected
@@ -0,0 +1,58 @@
+"""
+Tests for sharing warm pipelines across callers.
+"""
+import threading
+
+from rag import pipeline_registry
+from rag.pipeline_registry import PipelineRegistry
+
+
+def test_pipeline_is_reused_until_config_or_index_changes(pipeline_env, tmp_path):
+    pipeline_env(VECTORSTORE_TYPE='numpy')
+    registry = PipelineRegistry()
+
+    first = registry.get(warmup=False)
+    assert registry.get(warmup=False) is first
+
+    # Any file written to the index directory changes its fingerprint
+    index_dir = tmp_path / 'index'
+    index_dir.mkdir(exist_ok=True)
+    (index_dir / 'index_manifest.json').write_text('{}')
+    rebuilt = registry.get(warmup=False)
+    assert rebuilt is not first
+    assert registry.get(warmup=False) is rebuilt
+
+    pipeline_env(RETRIEVAL_TOP_K=7)
+    reconfigured = registry.get(warmup=False)
+    assert reconfigured is not rebuilt
+    assert reconfigured.top_k == 7
+
+    # The pipeline built for the old configuration is dropped
+    pipelines = registry.health()['pipelines']
+    assert len(pipelines) == 1 and not pipelines[0]['stale']
+
+
+def test_concurrent_callers_share_one_build(pipeline_env, monkeypatch):
+    pipeline_env(VECTORSTORE_TYPE='numpy')
+    builds = []
+
+    class CountingPipeline(pipeline_registry.RAGPipeline):
+        def __init__(self, *args, **kwargs):
+            builds.append(self)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(pipeline_registry, 'RAGPipeline', CountingPipeline)
+    registry = PipelineRegistry()
+    results = [None] * 4
+
+    def get(i):
+        results[i] = registry.get(warmup=False)
+
+    threads = [threading.Thread(target=get, args=(i,)) for i in range(len(results))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(builds) == 1
+    assert all(result is builds[0] for result in results)
@@ -0,0 +1,100 @@
+"""
+Tests for routing questions to policy documents.
+"""
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding, Embeddings
+from langchain_core.language_models import FakeListChatModel
+
+from components.policy_router import PolicyRouter
+
+SOURCES = [
+    'data/LEAVE AND ATTENDANCE POLICY.pdf',
+    'data/PROBATION AND CONFIRMATION POLICY.pdf',
+    'data/REMOTE WORK AND HYBRID WORK POLICY.pdf',
+]
+
+
+def make_router(directory):
+    router = PolicyRouter(str(directory), max_sources=2, min_similarity=0.99)
+    router.sync(SOURCES, DeterministicFakeEmbedding(size=16))
+    return router
+
+
+def test_keyword_match_routes_to_titles(tmp_path):
+    router = make_router(tmp_path)
+
+    assert router.route("How many leaves do I get?") == [SOURCES[0]]
+    assert router.route("Does probation affect my leave?") == [SOURCES[0], SOURCES[1]]
+
+
+def test_unmatched_question_searches_everything(tmp_path):
+    assert make_router(tmp_path).route("What is the dress code?", [0.1] * 16) is None
+
+
+def test_sync_drops_removed_sources_and_persists(tmp_path):
+    router = make_router(tmp_path)
+    router.sync(SOURCES[1:], DeterministicFakeEmbedding(size=16))
+    router.save()
+
+    loaded = PolicyRouter(str(tmp_path)).load()
+
+    assert sorted(loaded.routes) == SOURCES[1:]
+    assert loaded.route("How many leaves do I get?") is None
+
+
+class TitleEmbedding(Embeddings):
+    """Embeds each title as a fixed vector."""
+
+    VECTORS = {
+        'LEAVE AND ATTENDANCE POLICY': [1.0, 0.0, 0.0],
+        'PROBATION AND CONFIRMATION POLICY': [0.0, 1.0, 0.0],
+        'REMOTE WORK AND HYBRID WORK POLICY': [0.0, 0.0, 1.0],
+    }
+
+    def embed_documents(self, texts):
+        return [self.VECTORS[text] for text in texts]
+
+    def embed_query(self, text):
+        raise NotImplementedError
+
+
+def test_keyword_shared_by_several_titles_is_ambiguous(tmp_path):
+    router = make_router(tmp_path)
+    router.sync(SOURCES + ['data/MATERNITY LEAVE POLICY.pdf'], DeterministicFakeEmbedding(size=16))
+
+    # "leave" is in two titles, so it is evidence for neither
+    assert router.route("How do I apply for leave?") is None
+    # A specific word settles it; the other title the question names stays in
+    assert router.route("How long is maternity leave?") == [SOURCES[0], 'data/MATERNITY LEAVE POLICY.pdf']
+    # Touching more titles than max_sources searches everything
+    assert router.route("Can I take leave from home during probation?") is None
+
+
+def test_embedding_match_needs_a_margin_over_the_runner_up(tmp_path):
+    router = PolicyRouter(str(tmp_path), max_sources=1, min_similarity=0.6, min_margin=0.05)
+    router.sync(SOURCES, TitleEmbedding())
+
+    assert router.route("Where do I clock in?", [0.9, 0.3, 0.0]) == [SOURCES[0]]
+    # Close to two titles at once: neither is a safe filter
+    assert router.route("Where do I clock in?", [0.7, 0.69, 0.0]) is None
+
+
+def test_weak_routed_results_fall_back_to_a_global_search(make_pipeline):
+    def routed_sources(min_relevance):
+        pipeline = make_pipeline(
+            FakeListChatModel(responses=["Answer"]), RETRIEVAL_ROUTING_ENABLED='true', RETRIEVAL_TOP_K=1,
+            RETRIEVAL_ROUTING_MIN_RELEVANCE=min_relevance
+        )
+        pipeline.vectorstore.add_documents([
+            Document(page_content="Leave accrues monthly.", metadata={'source': SOURCES[0]}),
+            Document(page_content="Probation lasts six months.", metadata={'source': SOURCES[1]}),
+        ])
+        # Route every question to the leave policy, as a misleading keyword would
+        pipeline.policy_router = PolicyRouter('unused')
+        pipeline.policy_router.route = lambda question, embedding: [SOURCES[0]]
+        result = pipeline.query("Probation lasts six months.")
+        return [d.metadata.get('source') for d in result['source_documents']]
+
+    # The best leave chunk scores about 0.27 against the probation question
+    assert routed_sources(0.5) == [SOURCES[1]]
+    assert routed_sources(0.0) == [SOURCES[0]]
@@ -0,0 +1,102 @@
+"""
+Tests for provider prompt caching against a local stub of the Anthropic Messages API.
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+SYSTEM_PROMPT = "You are an HR assistant. " * 200
+
+
+class StubAnthropicHandler(BaseHTTPRequestHandler):
+    """Answers /v1/messages like Anthropic, caching the prompt after the first request."""
+
+    requests = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        first = not self.requests
+        self.requests.append(body)
+        usage = {
+            'input_tokens': 40,
+            'output_tokens': 3,
+            'cache_creation_input_tokens': 1200 if first else 0,
+            'cache_read_input_tokens': 0 if first else 1200,
+        }
+        message = {
+            'id': 'msg_stub', 'type': 'message', 'role': 'assistant', 'model': body['model'],
+            'content': [{'type': 'text', 'text': 'Stub answer'}],
+            'stop_reason': 'end_turn', 'stop_sequence': None, 'usage': usage,
+        }
+
+        if not body.get('stream'):
+            self._send('application/json', json.dumps(message).encode())
+            return
+
+        events = [
+            ('message_start', {'type': 'message_start', 'message': dict(message, content=[], stop_reason=None)}),
+            ('content_block_start', {'type': 'content_block_start', 'index': 0,
+                                     'content_block': {'type': 'text', 'text': ''}}),
+            ('content_block_delta', {'type': 'content_block_delta', 'index': 0,
+                                     'delta': {'type': 'text_delta', 'text': 'Stub answer'}}),
+            ('content_block_stop', {'type': 'content_block_stop', 'index': 0}),
+            # Like the live API, the final delta carries the cumulative usage
+            ('message_delta', {'type': 'message_delta', 'delta': {'stop_reason': 'end_turn', 'stop_sequence': None},
+                               'usage': usage}),
+            ('message_stop', {'type': 'message_stop'}),
+        ]
+        payload = ''.join(f"event: {name}\ndata: {json.dumps(data)}\n\n" for name, data in events)
+        self._send('text/event-stream', payload.encode())
+
+    def _send(self, content_type, payload):
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+@pytest.fixture
+def stub_url():
+    StubAnthropicHandler.requests = []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubAnthropicHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+@pytest.fixture
+def pipeline(stub_url, make_pipeline):
+    return make_pipeline(LLM_MODEL_NAME='claude-stub', LLM_BASE_URL=stub_url, SYSTEM_PROMPT=SYSTEM_PROMPT)
+
+
+def test_system_block_carries_cache_breakpoint(pipeline):
+    pipeline.query("How much leave do I get?")
+
+    system = StubAnthropicHandler.requests[0]['system']
+    assert system[0]['text'] == SYSTEM_PROMPT
+    assert system[0]['cache_control'] == {'type': 'ephemeral'}
+
+
+def test_cache_write_then_read_is_recorded_per_request(pipeline):
+    first = pipeline.query("How much leave do I get?")
+    second = pipeline.query("What about gratuity?")
+
+    assert first['usage']['cache_creation_tokens'] == 1200
+    assert first['usage']['cache_read_tokens'] == 0
+    assert second['usage']['cache_read_tokens'] == 1200
+    assert second['usage']['input_tokens'] > 0
+
+
+def test_streamed_answers_record_usage(pipeline):
+    events = list(pipeline.stream_query("How much leave do I get?"))
+
+    done = events[-1]
+    assert done['answer'] == "Stub answer"
+    assert done['usage']['cache_creation_tokens'] == 1200
@@ -0,0 +1,152 @@
+"""
+Tests for the HTTP query service and its request coalescing.
+"""
+import http.client
+import json
+import threading
+import time
+
+import pytest
+from langchain_core.documents import Document
+
+from rag.http_server import QueryHTTPServer, QueryRequestHandler
+from rag.query_service import QueryService, ServiceOverloaded
+
+
+class SlowPipeline:
+    """Answers after a delay, counting executions."""
+
+    def __init__(self, delay=0.2):
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def query(self, question):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return {
+            'question': question,
+            'answer': f"Answer to {question}",
+            'source_documents': [Document(page_content='text', metadata={'source': 'leave.pdf', 'page': 1})],
+            'timings': {'total': self.delay},
+            'cache_hit': None,
+            'context': None,
+            'usage': None
+        }
+
+    def stream_query(self, question):
+        with self._lock:
+            self.calls += 1
+        yield {'type': 'sources', 'source_documents': []}
+        for word in ('Answer', 'to', question):
+            time.sleep(self.delay / 3)
+            yield {'type': 'token', 'content': word + ' '}
+        yield {'type': 'done', 'answer': f"Answer to {question}", 'timings': {}, 'cache_hit': None,
+               'context': None, 'usage': None}
+
+
+def run_concurrently(function, arguments):
+    results = [None] * len(arguments)
+
+    def target(i):
+        results[i] = function(arguments[i])
+
+    threads = [threading.Thread(target=target, args=(i,)) for i in range(len(arguments))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_identical_in_flight_questions_share_one_execution():
+    pipeline = SlowPipeline()
+    service = QueryService(lambda: pipeline, max_workers=4)
+
+    results = run_concurrently(service.query, ["How many leaves?", "how many leaves", "Who approves WFH?"])
+
+    assert pipeline.calls == 2
+    assert [result['answer'] for result in results[:2]] == ["Answer to How many leaves?"] * 2
+    assert sorted(result['coalesced'] for result in results[:2]) == [False, True]
+    assert service.stats()['in_flight'] == 0
+
+    # Finished executions are not reused
+    service.query("How many leaves?")
+    assert pipeline.calls == 3
+
+
+def test_coalesced_streams_receive_every_event():
+    pipeline = SlowPipeline()
+    service = QueryService(lambda: pipeline, max_workers=2)
+
+    streams = run_concurrently(lambda question: list(service.stream(question)), ["Leave?", "leave"])
+
+    assert pipeline.calls == 1
+    assert [event['type'] for event in streams[0]] == [event['type'] for event in streams[1]]
+    assert ''.join(event['content'] for event in streams[1] if event['type'] == 'token') == "Answer to Leave? "
+
+
+def test_requests_beyond_pending_limit_are_rejected():
+    service = QueryService(lambda: SlowPipeline(delay=0.5), max_workers=1, max_pending=1)
+    first = threading.Thread(target=service.query, args=("first",))
+    first.start()
+    time.sleep(0.05)
+
+    with pytest.raises(ServiceOverloaded):
+        service.query("second")
+    first.join()
+    assert service.stats()['rejected'] == 1
+
+
+def test_http_endpoints():
+    service = QueryService(lambda: SlowPipeline(delay=0.01), max_workers=2)
+    server = QueryHTTPServer(('127.0.0.1', 0), service, log_requests=False)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    def request(method, path, body=None):
+        connection = http.client.HTTPConnection('127.0.0.1', server.server_address[1], timeout=10)
+        connection.request(method, path, body=json.dumps(body) if body is not None else None)
+        response = connection.getresponse()
+        data = response.read().decode('utf-8')
+        connection.close()
+        return response.status, data
+
+    try:
+        status, body = request('POST', '/query', {'question': 'How many leaves?'})
+        assert status == 200
+        assert json.loads(body)['sources'] == [{'source': 'leave.pdf', 'page': 1}]
+
+        status, body = request('POST', '/stream', {'question': 'How many leaves?'})
+        events = [json.loads(line) for line in body.splitlines()]
+        assert status == 200
+        assert [events[0]['type'], events[-1]['type']] == ['sources', 'done']
+
+        assert request('POST', '/query', {'question': ' '})[0] == 400
+        assert request('POST', '/query', {'question': 'x' * QueryRequestHandler.MAX_BODY_BYTES})[0] == 413
+        assert request('GET', '/missing')[0] == 404
+        status, body = request('GET', '/health')
+        assert status == 200 and json.loads(body)['service']['executed'] == 2
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.shutdown()
+
+
+def test_negative_content_length_is_rejected_without_blocking():
+    service = QueryService(lambda: SlowPipeline(delay=0.01), max_workers=1)
+    server = QueryHTTPServer(('127.0.0.1', 0), service, log_requests=False)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    try:
+        connection = http.client.HTTPConnection('127.0.0.1', server.server_address[1], timeout=5)
+        connection.putrequest('POST', '/query')
+        connection.putheader('Content-Length', '-1')
+        connection.endheaders()
+        response = connection.getresponse()
+        assert response.status == 400
+        connection.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.shutdown()
@@ -0,0 +1,41 @@
+"""
+Tests for the cross-encoder reranking stage.
+"""
+from langchain_core.documents import Document
+
+from components.reranker import Reranker
+
+
+class KeywordModel:
+    """Scores a pair by how often the query's last word appears in the chunk."""
+
+    def __init__(self):
+        self.pairs_scored = 0
+
+    def predict(self, pairs, batch_size=32, show_progress_bar=False):
+        self.pairs_scored += len(pairs)
+        return [text.count(query.split()[-1]) for query, text in pairs]
+
+
+def make_reranker():
+    reranker = Reranker({'cache_size': 10})
+    reranker._model = KeywordModel()
+    return reranker
+
+
+def test_keeps_best_top_k_in_score_order():
+    documents = [Document(page_content=text) for text in ("leave", "gratuity gratuity", "gratuity")]
+
+    reranked = make_reranker().rerank("what is gratuity", documents, top_k=2)
+
+    assert [d.page_content for d in reranked] == ["gratuity gratuity", "gratuity"]
+
+
+def test_scores_are_cached_per_query_and_chunk():
+    reranker = make_reranker()
+    documents = [Document(page_content="gratuity"), Document(page_content="leave")]
+
+    reranker.rerank("gratuity", documents, top_k=1)
+    reranker.rerank("gratuity", documents + [Document(page_content="bonus")], top_k=1)
+
+    assert reranker.model.pairs_scored == 3
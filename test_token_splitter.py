@@ -0,0 +1,84 @@
+"""
+Tests for token-based splitting and the truncation report.
+"""
+import json
+import string
+from pathlib import Path
+
+import pytest
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from components.embedding_tokenizer import EmbeddingTokenizer
+from components.index_manifest import IndexManifest
+from components.numpy_store import NumpyVectorStore
+from components.text_splitter import TextSplitter
+from rag.indexer import DocumentIndexer
+
+TEXT = (
+    "Employees accrue annual leave monthly.\n\nUnused leave may be carried forward up to a limit "
+    "approved by the department head.\nSick leave requires a medical certificate after two days. "
+) * 12
+
+
+@pytest.fixture
+def model_dir(tmp_path):
+    """A local model directory with a small WordPiece tokenizer and a 32-token limit."""
+    from tokenizers import Tokenizer, models, normalizers, pre_tokenizers, processors
+    from transformers import PreTrainedTokenizerFast
+
+    chars = sorted(set(string.printable) - set(string.whitespace))
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]"] + chars + ["##" + c for c in chars]
+    vocab += ["employees", "annual", "leave", "may", "be", "up", "to", "a", "limit", "after", "two", "days"]
+    tokenizer = Tokenizer(models.WordPiece({token: i for i, token in enumerate(vocab)}, unk_token="[UNK]"))
+    tokenizer.normalizer = normalizers.BertNormalizer(lowercase=True)
+    tokenizer.pre_tokenizer = pre_tokenizers.BertPreTokenizer()
+    tokenizer.post_processor = processors.TemplateProcessing(
+        single="[CLS] $A [SEP]", special_tokens=[("[CLS]", 2), ("[SEP]", 3)]
+    )
+    PreTrainedTokenizerFast(
+        tokenizer_object=tokenizer, unk_token="[UNK]", cls_token="[CLS]", sep_token="[SEP]", pad_token="[PAD]"
+    ).save_pretrained(tmp_path)
+    (tmp_path / 'sentence_bert_config.json').write_text(json.dumps({'max_seq_length': 32}))
+    return str(tmp_path)
+
+
+def test_token_chunks_fit_the_model_and_match_recursive_splitter(model_dir):
+    embedding_config = {'type': 'huggingface', 'model_name': model_dir}
+    splitter = TextSplitter({'splitter_mode': 'token', 'token_chunk_overlap': 8}, embedding_config)
+    tokenizer = splitter.tokenizer
+
+    chunks = splitter.split_documents([Document(page_content=TEXT, metadata={'page': 0})])
+
+    assert (tokenizer.max_length, splitter.chunk_size) == (32, 30)
+    assert max(tokenizer.lengths([chunk.page_content for chunk in chunks])) <= 32
+    expected = RecursiveCharacterTextSplitter(
+        chunk_size=30, chunk_overlap=8,
+        length_function=lambda text: len(tokenizer.tokenizer(text, add_special_tokens=False)['input_ids'])
+    ).split_text(TEXT)
+    assert [chunk.page_content for chunk in chunks] == expected
+
+
+def test_token_mode_needs_a_local_embedding_model():
+    with pytest.raises(ValueError):
+        TextSplitter({'splitter_mode': 'token'}, {'type': 'openai', 'model_name': 'text-embedding-3-small'})
+
+    assert TextSplitter({}, {'type': 'openai'}).tokenizer is None
+
+
+def test_indexing_reports_truncated_chunks(model_dir, tmp_path):
+    pdf = sorted(Path(__file__).parent.joinpath('data').glob('*.pdf'))[0]
+    splitter = TextSplitter({'chunk_size': 1000, 'chunk_overlap': 200}, {'type': 'huggingface', 'model_name': model_dir})
+    indexer = DocumentIndexer(
+        NumpyVectorStore(DeterministicFakeEmbedding(size=16)),
+        splitter,
+        IndexManifest(str(tmp_path / 'index'))
+    )
+
+    stats = indexer.index(str(pdf))
+
+    report = indexer.last_truncation_report
+    assert report.chunks == stats['chunks']
+    assert 0 < stats['truncated'] == report.truncated <= report.chunks
+    assert report.longest > EmbeddingTokenizer.from_config(splitter.embedding_config).max_length
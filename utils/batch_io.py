@@ -0,0 +1,124 @@
+"""Reading and writing question batches."""
+import csv
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+
+def read_questions(file_path: str) -> List[str]:
+    """
+    Read questions from a JSONL, JSON or CSV file.
+
+    JSONL lines may be plain JSON strings or objects with a "question" field.
+    A JSON file holds an array of the same. CSV files use the "question"
+    column if present, otherwise the first column.
+
+    Args:
+        file_path: Path to a .jsonl, .json or .csv file
+
+    Returns:
+        List of non-empty questions in file order
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        ValueError: If the file type is not supported or a record is not a
+            string or an object
+    """
+    path = Path(file_path)
+
+    if not path.exists():
+        raise FileNotFoundError(f"File not found: {file_path}")
+
+    questions = []
+    suffix = path.suffix.lower()
+
+    if suffix == '.jsonl':
+        with open(path, 'r', encoding='utf-8') as f:
+            records = [json.loads(line) for line in f if line.strip()]
+        questions = [_question(record, file_path) for record in records]
+    elif suffix == '.json':
+        with open(path, 'r', encoding='utf-8') as f:
+            records = json.load(f)
+        if not isinstance(records, list):
+            raise ValueError(f"JSON batch file must contain an array of questions: {file_path}")
+        questions = [_question(record, file_path) for record in records]
+    elif suffix == '.csv':
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            rows = list(csv.reader(f))
+        if rows:
+            header = [column.strip().lower() for column in rows[0]]
+            if 'question' in header:
+                column = header.index('question')
+                rows = rows[1:]
+            else:
+                column = 0
+            questions = [row[column] for row in rows if len(row) > column]
+    else:
+        raise ValueError(f"Batch file must be .jsonl, .json or .csv: {file_path}")
+
+    return [question.strip() for question in questions if question and question.strip()]
+
+
+def _question(record: Any, file_path: str) -> str:
+    """Get the question from a JSON record: a string or an object with a "question" field."""
+    if isinstance(record, str):
+        return record
+    if isinstance(record, dict):
+        question = record.get('question', '')
+        return question if isinstance(question, str) else ''
+    raise ValueError(f"Question records must be strings or objects with a 'question' field: {file_path}")
+
+
+def result_record(result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a query result to a JSON-serialisable record.
+
+    Args:
+        result: Result as returned by RAGPipeline.query or batch_query
+
+    Returns:
+        Record with the answer, source locations, timings and token usage,
+        plus the error of a question that could not be answered
+    """
+    record = {
+        'question': result['question'],
+        'answer': result['answer'],
+        'sources': source_records(result['source_documents']),
+        'latency_seconds': result['timings'].get('total'),
+        'timings': result['timings'],
+        'cache_hit': result.get('cache_hit'),
+        'context_tokens_saved': (result.get('context') or {}).get('tokens_saved'),
+        'usage': result.get('usage')
+    }
+    if result.get('error') is not None:
+        record['error'] = result['error']
+    return record
+
+
+def source_records(documents: List[Any]) -> List[Dict[str, Any]]:
+    """
+    Get the source file and page of retrieved documents.
+
+    Args:
+        documents: Retrieved Document objects
+
+    Returns:
+        One {'source', 'page'} dictionary per document
+    """
+    return [{'source': doc.metadata.get('source'), 'page': doc.metadata.get('page')} for doc in documents]
+
+
+def write_results(file_path: str, results: List[Dict[str, Any]]) -> None:
+    """
+    Write query results to a JSONL file, one result per line.
+
+    Args:
+        file_path: Path to the output file
+        results: Results as returned by RAGPipeline.batch_query
+    """
+    path = Path(file_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(path, 'w', encoding='utf-8') as f:
+        for result in results:
+            f.write(json.dumps(result_record(result)) + "\n")
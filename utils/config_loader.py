@@ -27,27 +27,94 @@ class ConfigLoader:
                 'type': os.getenv('LLM_TYPE', 'anthropic'),
                 'model_name': os.getenv('LLM_MODEL_NAME', 'claude-haiku-4-5-20251001'),
                 'temperature': float(os.getenv('LLM_TEMPERATURE', '0.7')),
-                'max_tokens': int(os.getenv('LLM_MAX_TOKENS', '500'))
+                'max_tokens': int(os.getenv('LLM_MAX_TOKENS', '500')),
+                'base_url': os.getenv('LLM_BASE_URL', ''),
+                'prompt_caching': os.getenv('LLM_PROMPT_CACHING', 'true').lower() == 'true'
             },
             'embedding': {
                 'type': os.getenv('EMBEDDING_TYPE', 'huggingface'),
-                'model_name': os.getenv('EMBEDDING_MODEL_NAME', 'sentence-transformers/all-MiniLM-L6-v2')
+                'model_name': os.getenv('EMBEDDING_MODEL_NAME', 'sentence-transformers/all-MiniLM-L6-v2'),
+                'batch_size': int(os.getenv('EMBEDDING_BATCH_SIZE', '0')),
+                'num_threads': int(os.getenv('EMBEDDING_NUM_THREADS', '0')),
+                'device': os.getenv('EMBEDDING_DEVICE', 'cpu'),
+                'normalize': os.getenv('EMBEDDING_NORMALIZE', 'false').lower() == 'true',
+                'max_concurrency': int(os.getenv('EMBEDDING_MAX_CONCURRENCY', '1')),
+                'onnx_quantization': os.getenv('EMBEDDING_ONNX_QUANTIZATION', ''),
+                'onnx_export_dir': os.getenv('EMBEDDING_ONNX_EXPORT_DIR', './indexes/onnx_models'),
+                'probe_min_similarity': float(os.getenv('EMBEDDING_PROBE_MIN_SIMILARITY', '0.98')),
+                'cache_enabled': os.getenv('EMBEDDING_CACHE_ENABLED', 'false').lower() == 'true',
+                'cache_dir': os.getenv('EMBEDDING_CACHE_DIR', './indexes/embedding_cache'),
+                'cache_memory_size': int(os.getenv('EMBEDDING_CACHE_MEMORY_SIZE', '10000'))
             },
             'vectorstore': {
                 'type': os.getenv('VECTORSTORE_TYPE', 'chroma'),
                 'persist_directory': os.getenv('VECTORSTORE_PERSIST_DIRECTORY', './indexes/chroma_db'),
-                'collection_name': os.getenv('VECTORSTORE_COLLECTION_NAME', 'rag_documents')
+                'collection_name': os.getenv('VECTORSTORE_COLLECTION_NAME', 'rag_documents'),
+                'index_type': os.getenv('VECTORSTORE_INDEX_TYPE', 'flat'),
+                'mmap': os.getenv('VECTORSTORE_MMAP', 'true').lower() == 'true',
+                'ivf_nlist': int(os.getenv('VECTORSTORE_IVF_NLIST', '100')),
+                'ivf_nprobe': int(os.getenv('VECTORSTORE_IVF_NPROBE', '10')),
+                'hnsw_m': int(os.getenv('VECTORSTORE_HNSW_M', '32')),
+                'hnsw_ef_construction': int(os.getenv('VECTORSTORE_HNSW_EF_CONSTRUCTION', '200')),
+                'hnsw_ef_search': int(os.getenv('VECTORSTORE_HNSW_EF_SEARCH', '64'))
             },
             'document_processing': {
                 'chunk_size': int(os.getenv('DOCUMENT_CHUNK_SIZE', '1000')),
-                'chunk_overlap': int(os.getenv('DOCUMENT_CHUNK_OVERLAP', '200'))
+                'chunk_overlap': int(os.getenv('DOCUMENT_CHUNK_OVERLAP', '200')),
+                'splitter_mode': os.getenv('DOCUMENT_SPLITTER_MODE', 'recursive'),
+                'split_workers': int(os.getenv('DOCUMENT_SPLIT_WORKERS', '1')),
+                'token_chunk_size': int(os.getenv('DOCUMENT_TOKEN_CHUNK_SIZE', '0')),
+                'token_chunk_overlap': int(os.getenv('DOCUMENT_TOKEN_CHUNK_OVERLAP', '50')),
+                'loader_workers': int(os.getenv('DOCUMENT_LOADER_WORKERS', '1')),
+                'ingest_batch_size': int(os.getenv('DOCUMENT_INGEST_BATCH_SIZE', '64')),
+                'ingest_max_pending': int(os.getenv('DOCUMENT_INGEST_MAX_PENDING', '0'))
             },
             'retrieval': {
                 'top_k': int(os.getenv('RETRIEVAL_TOP_K', '4')),
-                'search_type': os.getenv('RETRIEVAL_SEARCH_TYPE', 'similarity')
+                'search_type': os.getenv('RETRIEVAL_SEARCH_TYPE', 'similarity'),
+                'hybrid_candidates': int(os.getenv('RETRIEVAL_HYBRID_CANDIDATES', '20')),
+                'rrf_k': int(os.getenv('RETRIEVAL_RRF_K', '60')),
+                'routing_enabled': os.getenv('RETRIEVAL_ROUTING_ENABLED', 'false').lower() == 'true',
+                'routing_max_sources': int(os.getenv('RETRIEVAL_ROUTING_MAX_SOURCES', '2')),
+                'routing_min_similarity': float(os.getenv('RETRIEVAL_ROUTING_MIN_SIMILARITY', '0.6')),
+                'routing_min_margin': float(os.getenv('RETRIEVAL_ROUTING_MIN_MARGIN', '0.05')),
+                'routing_min_relevance': float(os.getenv('RETRIEVAL_ROUTING_MIN_RELEVANCE', '0.2'))
             },
             'rag': {
-                'system_prompt': os.getenv('SYSTEM_PROMPT', '')
+                'system_prompt': os.getenv('SYSTEM_PROMPT', ''),
+                'max_concurrency': int(os.getenv('QUERY_MAX_CONCURRENCY', '16'))
+            },
+            'answer_cache': {
+                'enabled': os.getenv('ANSWER_CACHE_ENABLED', 'false').lower() == 'true',
+                'ttl_seconds': int(os.getenv('ANSWER_CACHE_TTL_SECONDS', '3600')),
+                'max_entries': int(os.getenv('ANSWER_CACHE_MAX_ENTRIES', '1000')),
+                'similarity_threshold': float(os.getenv('ANSWER_CACHE_SIMILARITY_THRESHOLD', '0.95'))
+            },
+            'context': {
+                'enabled': os.getenv('CONTEXT_PACKING_ENABLED', 'false').lower() == 'true',
+                'max_tokens': int(os.getenv('CONTEXT_MAX_TOKENS', '3000')),
+                'dedup_threshold': float(os.getenv('CONTEXT_DEDUP_THRESHOLD', '0.9')),
+                'trim_overlap': os.getenv('CONTEXT_TRIM_OVERLAP', 'true').lower() == 'true',
+                'min_overlap_chars': int(os.getenv('CONTEXT_MIN_OVERLAP_CHARS', '20'))
+            },
+            'rerank': {
+                'enabled': os.getenv('RERANK_ENABLED', 'false').lower() == 'true',
+                'model_name': os.getenv('RERANK_MODEL', 'cross-encoder/ms-marco-MiniLM-L-6-v2'),
+                'candidates': int(os.getenv('RERANK_CANDIDATES', '20')),
+                'batch_size': int(os.getenv('RERANK_BATCH_SIZE', '32')),
+                'device': os.getenv('RERANK_DEVICE', 'cpu'),
+                'cache_size': int(os.getenv('RERANK_CACHE_SIZE', '10000'))
+            },
+            'server': {
+                'host': os.getenv('SERVER_HOST', '127.0.0.1'),
+                'port': int(os.getenv('SERVER_PORT', '8000')),
+                'workers': int(os.getenv('SERVER_WORKERS', '4')),
+                'max_pending': int(os.getenv('SERVER_MAX_PENDING', '64')),
+                'request_timeout': float(os.getenv('SERVER_REQUEST_TIMEOUT', '120'))
+            },
+            'metrics': {
+                'enabled': os.getenv('METRICS_ENABLED', 'false').lower() == 'true',
+                'log_file': os.getenv('METRICS_LOG_FILE', '')
             }
         }
 
@@ -87,4 +154,24 @@ class ConfigLoader:
 
     def get_rag_config(self) -> Dict[str, Any]:
         """Get RAG configuration including system prompt."""
-        return self.config.get('rag', {})
\ No newline at end of file
+        return self.config.get('rag', {})
+
+    def get_answer_cache_config(self) -> Dict[str, Any]:
+        """Get answer cache configuration."""
+        return self.config.get('answer_cache', {})
+
+    def get_context_config(self) -> Dict[str, Any]:
+        """Get context packing configuration."""
+        return self.config.get('context', {})
+
+    def get_rerank_config(self) -> Dict[str, Any]:
+        """Get reranker configuration."""
+        return self.config.get('rerank', {})
+
+    def get_server_config(self) -> Dict[str, Any]:
+        """Get HTTP server configuration."""
+        return self.config.get('server', {})
+
+    def get_metrics_config(self) -> Dict[str, Any]:
+        """Get metrics configuration."""
+        return self.config.get('metrics', {})
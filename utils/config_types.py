@@ -10,9 +10,16 @@ class EmbeddingModelType(str, Enum):
     OPENAI = "openai"
     OPENAI_LARGE = "openai-large"
     HUGGINGFACE = "huggingface"
+    ONNX = "onnx"
 
 class VectorDBType(str, Enum):
     FAISS = "faiss"
     PINECONE = "pinecone"
     MILVUS = "milvus"
-    CHROMA = "chroma"
\ No newline at end of file
+    CHROMA = "chroma"
+    NUMPY = "numpy"
+
+class SplitterMode(str, Enum):
+    RECURSIVE = "recursive"
+    OFFSET = "offset"
+    TOKEN = "token"
\ No newline at end of file
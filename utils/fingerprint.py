@@ -0,0 +1,53 @@
+"""Fingerprint helpers for detecting configuration and index changes."""
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict
+
+
+def config_fingerprint(config: Dict[str, Any]) -> str:
+    """
+    Compute a stable fingerprint of a configuration dictionary.
+
+    Args:
+        config: Configuration dictionary
+
+    Returns:
+        Hex digest that changes whenever any configuration value changes
+    """
+    payload = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def directory_fingerprint(directory_path: str) -> str:
+    """
+    Compute a cheap fingerprint of a directory from file stats only.
+
+    File contents are not read, so this is safe to call on every request.
+
+    Args:
+        directory_path: Path to the directory
+
+    Returns:
+        Hex digest of the relative paths, sizes and modification times of
+        all files, or an empty string if the directory does not exist
+    """
+    path = Path(directory_path)
+
+    if not path.is_dir():
+        return ''
+
+    entries = []
+    for root, _, files in os.walk(path):
+        for name in files:
+            file_path = os.path.join(root, name)
+            try:
+                stat = os.stat(file_path)
+            except FileNotFoundError:
+                continue
+            relative = os.path.relpath(file_path, path)
+            entries.append(f"{relative}:{stat.st_size}:{stat.st_mtime_ns}")
+
+    entries.sort()
+    return hashlib.sha256("\n".join(entries).encode('utf-8')).hexdigest()
@@ -0,0 +1,246 @@
+"""Process-wide metrics: histograms, counters and structured JSON logs."""
+import bisect
+import json
+import math
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional, TextIO, Tuple
+
+# Latency buckets in seconds, from a cached embedding lookup to a slow LLM call
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Help text of the metrics recorded by the pipeline
+METRIC_HELP = {
+    'rag_query_stage_seconds': 'Time spent in each query stage',
+    'rag_queries_total': 'Queries answered',
+    'rag_answer_cache_lookups_total': 'Answer cache lookups by result',
+    'rag_llm_tokens_total': 'LLM tokens by kind, as reported by the provider',
+    'rag_embedding_seconds': 'Time spent in embedding calls',
+    'rag_embedding_texts_total': 'Texts embedded',
+    'rag_document_load_seconds': 'Time spent parsing each PDF',
+    'rag_document_pages_total': 'PDF pages parsed',
+    'rag_split_seconds': 'Time spent splitting documents into chunks',
+    'rag_chunks_total': 'Chunks produced by the text splitter',
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+Sample = Tuple[str, Dict[str, str], float]
+
+
+class Metrics:
+    """
+    Collects latency histograms and counters and writes structured logs.
+
+    Everything is a no-op until the instance is enabled, so instrumented
+    code costs one attribute check when metrics are off. Metrics are
+    exported in the Prometheus text format; values owned by other
+    components (cache hit counters, service queue depth) are read at export
+    time through registered collectors.
+    """
+
+    def __init__(self):
+        """Initialize disabled metrics."""
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, List[float]]] = {}
+        self._collectors: Dict[str, Callable[[], List[Sample]]] = {}
+        self._log: Optional[TextIO] = None
+        self._log_lock = threading.Lock()
+
+    def configure(self, config: Dict[str, Any]) -> None:
+        """
+        Apply the metrics configuration.
+
+        Args:
+            config: Metrics configuration. log_file is a path to append JSON
+                log lines to, '-' for stderr, or empty for no logs.
+        """
+        self.enabled = config.get('enabled', False)
+        log_file = config.get('log_file', '') if self.enabled else ''
+
+        with self._log_lock:
+            if self._log is not None and self._log is not sys.stderr:
+                self._log.close()
+            if not log_file:
+                self._log = None
+            elif log_file == '-':
+                self._log = sys.stderr
+            else:
+                self._log = open(log_file, 'a', encoding='utf-8', buffering=1)
+
+    @staticmethod
+    def _labels(labels: Dict[str, Any]) -> Labels:
+        return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+    def inc(self, name: str, value: float = 1.0, **labels: Any) -> None:
+        """
+        Increase a counter.
+
+        Args:
+            name: Counter name, declared in METRIC_HELP
+            value: Amount to add
+            **labels: Label values
+        """
+        if not self.enabled:
+            return
+        key = self._labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """
+        Record a value in a histogram.
+
+        Args:
+            name: Histogram name, declared in METRIC_HELP
+            value: Observed value in seconds
+            **labels: Label values
+        """
+        if not self.enabled:
+            return
+        key = self._labels(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            # Per-bucket counts, then sum and count
+            buckets = series.get(key)
+            if buckets is None:
+                buckets = series[key] = [0.0] * (len(DEFAULT_BUCKETS) + 2)
+            index = bisect.bisect_left(DEFAULT_BUCKETS, value)
+            if index < len(DEFAULT_BUCKETS):
+                buckets[index] += 1
+            buckets[-2] += value
+            buckets[-1] += 1
+
+    def timer(self, name: str, **labels: Any) -> ContextManager[None]:
+        """
+        Time a block into a histogram.
+
+        Args:
+            name: Histogram name, declared in METRIC_HELP
+            **labels: Label values
+
+        Returns:
+            Context manager; a shared no-op when metrics are disabled
+        """
+        if not self.enabled:
+            return nullcontext()
+        return self._timed(name, labels)
+
+    @contextmanager
+    def _timed(self, name: str, labels: Dict[str, Any]) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def log(self, event: str, **fields: Any) -> None:
+        """
+        Write a structured JSON log line.
+
+        Args:
+            event: Event name
+            **fields: JSON-serialisable event fields
+        """
+        if not self.enabled or self._log is None:
+            return
+        line = json.dumps(dict(ts=time.time(), event=event, **fields), default=str)
+        with self._log_lock:
+            if self._log is not None:
+                self._log.write(line + "\n")
+
+    def register_collector(self, name: str, collector: Callable[[], List[Sample]]) -> None:
+        """
+        Register a function whose samples are added to every export.
+
+        Args:
+            name: Collector name; registering the same name again replaces it
+            collector: Returns (metric name, labels, value) samples
+        """
+        with self._lock:
+            self._collectors[name] = collector
+
+    @staticmethod
+    def _format_labels(labels: Any) -> str:
+        pairs = labels.items() if isinstance(labels, dict) else labels
+        if not pairs:
+            return ''
+        escaped = [
+            '{}="{}"'.format(key, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+            for key, value in pairs
+        ]
+        return '{' + ','.join(escaped) + '}'
+
+    @staticmethod
+    def _format_value(value: float) -> str:
+        if math.isinf(value):
+            return '+Inf' if value > 0 else '-Inf'
+        return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+    def render_prometheus(self) -> str:
+        """
+        Export all metrics in the Prometheus text exposition format.
+
+        Returns:
+            Exposition text, empty when metrics are disabled
+        """
+        if not self.enabled:
+            return ""
+
+        with self._lock:
+            counters = {name: dict(series) for name, series in self._counters.items()}
+            histograms = {name: {key: list(values) for key, values in series.items()}
+                          for name, series in self._histograms.items()}
+            collectors = list(self._collectors.values())
+
+        lines: List[str] = []
+        for name, series in sorted(counters.items()):
+            lines.append(f"# HELP {name} {METRIC_HELP.get(name, name)}")
+            lines.append(f"# TYPE {name} counter")
+            for labels, value in sorted(series.items()):
+                lines.append(f"{name}{self._format_labels(labels)} {self._format_value(value)}")
+
+        for name, series in sorted(histograms.items()):
+            lines.append(f"# HELP {name} {METRIC_HELP.get(name, name)}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, values in sorted(series.items()):
+                cumulative = 0.0
+                for bound, count in zip(DEFAULT_BUCKETS, values):
+                    cumulative += count
+                    bucket_labels = labels + (('le', self._format_value(bound)),)
+                    lines.append(f"{name}_bucket{self._format_labels(bucket_labels)} {self._format_value(cumulative)}")
+                # +Inf counts every observation, including those above the last bound
+                bucket_labels = labels + (('le', '+Inf'),)
+                lines.append(f"{name}_bucket{self._format_labels(bucket_labels)} {self._format_value(values[-1])}")
+                lines.append(f"{name}_sum{self._format_labels(labels)} {self._format_value(values[-2])}")
+                lines.append(f"{name}_count{self._format_labels(labels)} {self._format_value(values[-1])}")
+
+        collected: Dict[str, List[Tuple[Dict[str, str], float]]] = {}
+        for collector in collectors:
+            for name, labels, value in collector():
+                collected.setdefault(name, []).append((labels, value))
+        for name, samples in sorted(collected.items()):
+            lines.append(f"# TYPE {name} {'counter' if name.endswith('_total') else 'gauge'}")
+            for labels, value in samples:
+                lines.append(f"{name}{self._format_labels(labels)} {self._format_value(value)}")
+
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Drop all recorded values and collectors."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self._collectors.clear()
+
+
+_metrics = Metrics()
+
+
+def get_metrics() -> Metrics:
+    """Get the process-wide metrics instance."""
+    return _metrics